@@ -0,0 +1,69 @@
+import timeit
+import numpy as np
+
+from lsst.ts.ofc.OptCtrl import OptCtrl
+
+
+def calcQmatByLoop(ccMat, senM, qWgt):
+    """Calculate the Q matrix by looping over the field points.
+
+    This is the reference implementation before the vectorization.
+
+    Parameters
+    ----------
+    ccMat : numpy.ndarray
+        C.T * C matrix.
+    senM : numpy.ndarray
+        Sensitivity matrix M.
+    qWgt : numpy.ndarray
+        Weighting ratio for the image quality Q matrix calculation.
+
+    Returns
+    -------
+    numpy.ndarray
+        Q matrix used in cost functin.
+    """
+
+    qMat = 0
+    for aMat, wgt in zip(senM, qWgt):
+        qMat += wgt * aMat.T.dot(ccMat).dot(aMat)
+
+    return qMat
+
+
+def main(numOfFieldList=(35, 100, 300, 1000), numOfZk=19, numOfDof=50,
+         numOfRepeat=20):
+
+    optCtrl = OptCtrl()
+    rng = np.random.RandomState(seed=1)
+
+    print("%8s %14s %14s %8s" % ("field", "loop (ms)", "batched (ms)",
+                                 "speedup"))
+    for numOfField in numOfFieldList:
+
+        senM = rng.normal(size=(numOfField, numOfZk, numOfDof))
+        ccMat = np.diag(rng.uniform(size=numOfZk))
+        qWgt = rng.uniform(size=numOfField)
+        qWgt /= np.sum(qWgt)
+
+        qMatByLoop = calcQmatByLoop(ccMat, senM, qWgt)
+        qMat = optCtrl._calcQmat(ccMat, senM, qWgt)
+        if (not np.allclose(qMat, qMatByLoop)):
+            raise RuntimeError("Batched Q matrix is different from the loop.")
+
+        timeByLoop = min(timeit.repeat(
+            lambda: calcQmatByLoop(ccMat, senM, qWgt), number=1,
+            repeat=numOfRepeat))
+        timeBatched = min(timeit.repeat(
+            lambda: optCtrl._calcQmat(ccMat, senM, qWgt), number=1,
+            repeat=numOfRepeat))
+
+        print("%8d %14.3f %14.3f %8.1f" % (numOfField, timeByLoop * 1e3,
+                                           timeBatched * 1e3,
+                                           timeByLoop / timeBatched))
+
+
+if __name__ == "__main__":
+
+    # Compare the looped and batched Q matrix calculation
+    main()
@@ -0,0 +1,63 @@
+import os
+import timeit
+
+from lsst.ts.ofc.Utility import InstName, getModulePath
+from lsst.ts.ofc.DataShare import DataShare
+from lsst.ts.ofc.OptStateEstiDataDecorator import OptStateEstiDataDecorator
+from lsst.ts.ofc.OptCtrlDataDecorator import OptCtrlDataDecorator
+from lsst.ts.ofc.OfcDataSnapshot import OfcDataSnapshot
+
+
+def getMixedData(instName=InstName.LSST):
+    """Get the decorated stack of data used in the baseline algorithm.
+
+    Parameters
+    ----------
+    instName : enum 'InstName', optional
+        Instrument name. (the default is InstName.LSST.)
+
+    Returns
+    -------
+    OptCtrlDataDecorator
+        Decorated stack of DataShare.
+    """
+
+    dataShare = DataShare()
+    configDir = os.path.join(getModulePath(), "configData")
+    dataShare.config(configDir, instName=instName)
+
+    optStateEstiData = OptStateEstiDataDecorator(dataShare)
+    optStateEstiData.configOptStateEstiData()
+
+    mixedData = OptCtrlDataDecorator(optStateEstiData)
+    mixedData.configOptCtrlData()
+
+    return mixedData
+
+
+def main(funcNameList=("getZn3Idx", "getDofIdx", "getSenM", "getQwgt",
+                       "getAuthority"), numOfCall=100000, numOfRepeat=5):
+
+    mixedData = getMixedData()
+    snapshot = OfcDataSnapshot(mixedData)
+
+    print("%22s %18s %18s %8s" % ("function", "stack (ns/call)",
+                                  "snapshot (ns/call)", "speedup"))
+    for funcName in funcNameList:
+
+        timeOfStack = min(timeit.repeat(
+            "data.%s()" % funcName, globals={"data": mixedData},
+            number=numOfCall, repeat=numOfRepeat))
+        timeOfSnapshot = min(timeit.repeat(
+            "data.%s()" % funcName, globals={"data": snapshot},
+            number=numOfCall, repeat=numOfRepeat))
+
+        print("%22s %18.1f %18.1f %8.1f" % (
+            funcName, timeOfStack / numOfCall * 1e9,
+            timeOfSnapshot / numOfCall * 1e9, timeOfStack / timeOfSnapshot))
+
+
+if __name__ == "__main__":
+
+    # Compare the function dispatch of decorated stack and snapshot
+    main()
@@ -0,0 +1,449 @@
+import os
+import sys
+import json
+import time
+import timeit
+import argparse
+import platform
+import subprocess
+import numpy as np
+
+from lsst.ts.wep.Utility import FilterType
+
+from lsst.ts.ofc.Utility import InstName, getModulePath
+from lsst.ts.ofc.DataShare import DataShare
+from lsst.ts.ofc.OptStateEstiDataDecorator import OptStateEstiDataDecorator
+from lsst.ts.ofc.OptCtrlDataDecorator import OptCtrlDataDecorator
+from lsst.ts.ofc.OptStateEsti import OptStateEsti
+from lsst.ts.ofc.OptCtrl import OptCtrl
+from lsst.ts.ofc.ZTAAC import ZTAAC
+from lsst.ts.ofc.CamRot import CamRot
+from lsst.ts.ofc.IterDataReader import IterDataReader
+
+# Wavefront sensors and their wavefront error file of each instrument
+WFS_OF_INST = {
+    InstName.LSST: (["R44_S00", "R04_S20", "R00_S22", "R40_S02"],
+                    "lsst_wfs_error_iter0.z4c"),
+    InstName.COMCAM: (["R22_S00", "R22_S01", "R22_S02", "R22_S10",
+                       "R22_S11", "R22_S12", "R22_S20", "R22_S21",
+                       "R22_S22"],
+                      "comcam_wfs_error_iter0.z4c")}
+
+# Synthetic scales of (field #, zk #, dof #)
+SYNTHETIC_SCALES = ((35, 19, 50), (100, 19, 50), (300, 28, 100),
+                    (1000, 37, 200))
+
+
+class SyntheticOfcData(object):
+
+    def __init__(self, numOfField, numOfZk, numOfDof, xRef="x00", seed=0):
+        """Initialization of synthetic OFC data class.
+
+        This provides the functions of decorated DataShare used by
+        OptStateEsti and OptCtrl with the random data of any scale.
+
+        Parameters
+        ----------
+        numOfField : int
+            Number of field.
+        numOfZk : int
+            Number of zk.
+        numOfDof : int
+            Number of degree of freedom (DOF).
+        xRef : str, optional
+            X reference. (the default is "x00".)
+        seed : int, optional
+            Random seed. (the default is 0.)
+        """
+
+        rng = np.random.RandomState(seed=seed)
+
+        self.xRef = xRef
+        self._senM = rng.normal(size=(numOfField, numOfZk, numOfDof))
+        self._y2c = 1e-3 * rng.normal(size=(numOfField, numOfZk))
+        self._qWgt = np.ones(numOfField) / numOfField
+        self._pssnAlpha = rng.uniform(1e-3, 1e-2, size=numOfZk)
+        self._authority = rng.uniform(1, 100, size=numOfDof)
+        self._zn3Idx = np.arange(numOfZk)
+        self._dofIdx = np.arange(numOfDof)
+
+    def getInstDir(self):
+        """Get the name of synthetic instrument directory."""
+
+        return "synthetic_%d_%d_%d" % self._senM.shape
+
+    def getZn3Idx(self):
+        """Get the index array of zk."""
+
+        return self._zn3Idx
+
+    def getDofIdx(self):
+        """Get the index array of DOF."""
+
+        return self._dofIdx
+
+    def getSenM(self):
+        """Get the sensitivity matrix M."""
+
+        return self._senM
+
+    def getIntrinsicZk(self, filterType, fieldIdx):
+        """Get the intrinsic zk, which is zero."""
+
+        return np.zeros((len(fieldIdx), len(self._zn3Idx)))
+
+    def getY2Corr(self, fieldIdx):
+        """Get the y2 correction array."""
+
+        return self._y2c[fieldIdx]
+
+    def getEffWave(self, filterType):
+        """Get the effective wavelength in um."""
+
+        return 0.5
+
+    def getQwgt(self):
+        """Get the uniform weighting ratio of image quality."""
+
+        return self._qWgt
+
+    def getNumOfFieldInQwgt(self):
+        """Get the number of field in the weighting ratio."""
+
+        return len(self._qWgt)
+
+    def getPssnAlpha(self):
+        """Get the PSSN alpha."""
+
+        return self._pssnAlpha
+
+    def getAuthority(self):
+        """Get the authority of subsystems."""
+
+        return self._authority
+
+    def getPenality(self):
+        """Get the penality of subsystems."""
+
+        return {"M1M3Act": 5.9, "M2Act": 5.9, "Motion": 1e-3}
+
+    def getXref(self):
+        """Get the X reference."""
+
+        return self.xRef
+
+
+def buildZTAAC(instName):
+    """Build the configured ZTAAC instance with the state 0 from file.
+
+    Parameters
+    ----------
+    instName : enum 'InstName'
+        Instrument name.
+
+    Returns
+    -------
+    ZTAAC
+        Configured ZTAAC instance.
+    """
+
+    dataShare = DataShare()
+    configDir = os.path.join(getModulePath(), "configData")
+    dataShare.config(configDir, instName=instName)
+
+    optStateEstiData = OptStateEstiDataDecorator(dataShare)
+    optStateEstiData.configOptStateEstiData()
+
+    mixedData = OptCtrlDataDecorator(optStateEstiData)
+    mixedData.configOptCtrlData(configFileName="optiPSSN_x00.ctrl")
+
+    ztaac = ZTAAC(OptStateEsti(), OptCtrl(), mixedData)
+    ztaac.config(filterType=FilterType.REF, defaultGain=0.7,
+                 fwhmThresholdInArcsec=0.2)
+    ztaac.setState0FromFile(state0InDofFileName="state0inDof.txt")
+    ztaac.setStateToState0()
+
+    return ztaac
+
+
+def timeFunc(func, numOfRepeat):
+    """Time the function.
+
+    The number of calls in each repeat is chosen to take about 0.05 sec.
+
+    Parameters
+    ----------
+    func : function
+        Function without the argument.
+    numOfRepeat : int
+        Number of repeats.
+
+    Returns
+    -------
+    dict
+        Best time per call in ms and the number of calls in each repeat.
+    """
+
+    timer = timeit.Timer(func)
+    numOfCall, _ = timer.autorange()
+    numOfCall = max(1, numOfCall // 4)
+
+    timeOfCalls = min(timer.repeat(repeat=numOfRepeat, number=numOfCall))
+
+    return {"msPerCall": timeOfCalls / numOfCall * 1e3,
+            "numOfCall": numOfCall}
+
+
+def benchInst(instName, numOfRepeat):
+    """Benchmark the stages of visit pipeline of instrument.
+
+    Parameters
+    ----------
+    instName : enum 'InstName'
+        Instrument name.
+    numOfRepeat : int
+        Number of repeats.
+
+    Returns
+    -------
+    dict
+        Timing of each stage.
+    """
+
+    configDir = os.path.join(getModulePath(), "configData")
+    ztaac = buildZTAAC(instName)
+    data = ztaac.dataShare
+
+    sensorNameList, wfFileName = WFS_OF_INST[instName]
+    wfFilePath = os.path.join(getModulePath(), "tests", "testData",
+                              wfFileName)
+    wfErr = ztaac.getWfFromFile(wfFilePath, sensorNameList)
+    fieldIdx = data.getFieldIdx(sensorNameList)
+
+    # The PSSN is on the fields of image quality weighting ratio
+    if (instName == InstName.LSST):
+        pssnIdList = IterDataReader("").getPssnSensorIdList()
+        pssnSensorNameList = data.mapSensorIdToName(pssnIdList)[0]
+    else:
+        pssnSensorNameList = sensorNameList
+    pssn = 0.9 * np.ones(len(pssnSensorNameList))
+
+    optSt = ztaac.optStateEsti.estiOptState(data, FilterType.REF, wfErr,
+                                            fieldIdx)
+
+    camRot = CamRot()
+    camRot.setRotAng(45)
+    uk = ztaac.optCtrl.estiUkWithGain(data, FilterType.REF, optSt)
+
+    def configDataShare():
+        DataShare().config(configDir, instName=instName)
+
+    dataShare = DataShare()
+    dataShare.config(configDir, instName=instName)
+    optCtrlData = OptCtrlDataDecorator(OptStateEstiDataDecorator(dataShare))
+
+    def configOptCtrlData():
+        optCtrlData.configOptCtrlData()
+
+    def estiOptState():
+        ztaac.optStateEsti.estiOptState(data, FilterType.REF, wfErr,
+                                        fieldIdx)
+
+    def visit():
+        ztaac.setGainByPSSN(pssn, pssnSensorNameList)
+        ukOfVisit = ztaac.estiUkWithGain(wfErr, sensorNameList)
+        ztaac.aggState(ztaac.rotUk(camRot, ukOfVisit))
+
+    results = dict()
+    results["DataShare.config"] = timeFunc(configDataShare, numOfRepeat)
+    results["OptCtrlDataDecorator.configOptCtrlData"] = timeFunc(
+        configOptCtrlData, numOfRepeat)
+    results["OptStateEsti.estiOptState"] = timeFunc(estiOptState,
+                                                    numOfRepeat)
+
+    xRefOrig = data.xRef
+    for xRef in ("0", "x0", "x00"):
+        data.xRef = xRef
+        results["OptCtrl.estiUkWithoutGain[%s]" % xRef] = timeFunc(
+            lambda: ztaac.optCtrl.estiUkWithoutGain(data, FilterType.REF,
+                                                    optSt), numOfRepeat)
+    data.xRef = xRefOrig
+
+    results["ZTAAC.rotUk"] = timeFunc(lambda: ztaac.rotUk(camRot, uk),
+                                      numOfRepeat)
+    results["ZTAAC.setGainByPSSN"] = timeFunc(
+        lambda: ztaac.setGainByPSSN(pssn, pssnSensorNameList), numOfRepeat)
+    results["visit"] = timeFunc(visit, numOfRepeat)
+
+    return results
+
+
+def benchSyntheticScale(numOfField, numOfZk, numOfDof, numOfRepeat):
+    """Benchmark the estimator and control on the synthetic data.
+
+    Parameters
+    ----------
+    numOfField : int
+        Number of field.
+    numOfZk : int
+        Number of zk.
+    numOfDof : int
+        Number of degree of freedom (DOF).
+    numOfRepeat : int
+        Number of repeats.
+
+    Returns
+    -------
+    dict
+        Timing of each stage.
+    """
+
+    data = SyntheticOfcData(numOfField, numOfZk, numOfDof)
+
+    # Enough wavefront sensors to estimate all the DOF
+    numOfWfs = min(numOfField, numOfDof // numOfZk + 2)
+    fieldIdx = np.arange(numOfWfs)
+    wfErr = np.random.RandomState(seed=1).normal(size=(numOfWfs, numOfZk))
+
+    optStateEsti = OptStateEsti()
+    optCtrl = OptCtrl()
+    optCtrl.setState0(np.zeros(numOfDof))
+    optCtrl.initStateToState0()
+    optCtrl.setGain(0.7)
+
+    optSt = optStateEsti.estiOptState(data, FilterType.REF, wfErr, fieldIdx)
+
+    def compileCtrl():
+        optCtrl.clearCompiledCtrlCache()
+        optCtrl.getCompiledCtrl(data, FilterType.REF)
+
+    results = dict()
+    results["OptStateEsti.estiOptState"] = timeFunc(
+        lambda: optStateEsti.estiOptState(data, FilterType.REF, wfErr,
+                                          fieldIdx), numOfRepeat)
+    results["OptCtrl.compileCtrl"] = timeFunc(compileCtrl, numOfRepeat)
+    results["OptCtrl.estiUkWithoutGain[x00]"] = timeFunc(
+        lambda: optCtrl.estiUkWithoutGain(data, FilterType.REF, optSt),
+        numOfRepeat)
+
+    return results
+
+
+def getMeta():
+    """Get the metadata of benchmark run.
+
+    Returns
+    -------
+    dict
+        Metadata.
+    """
+
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=getModulePath(), stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+
+    return {"commit": commit, "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine()}
+
+
+def compareResults(results, baseResults, threshold):
+    """Compare the results with the base results.
+
+    Parameters
+    ----------
+    results : dict
+        Timing of each benchmark.
+    baseResults : dict
+        Timing of each benchmark in the base run.
+    threshold : float
+        Ratio of time to report the regression.
+
+    Returns
+    -------
+    list[str]
+        Names of regressed benchmarks.
+    """
+
+    regressions = []
+
+    print("%-56s %10s %10s %8s" % ("benchmark", "base (ms)", "new (ms)",
+                                   "ratio"))
+    for name in sorted(results):
+        if (name not in baseResults):
+            continue
+
+        timeBase = baseResults[name]["msPerCall"]
+        timeNew = results[name]["msPerCall"]
+        ratio = timeNew / timeBase
+
+        mark = ""
+        if (ratio > threshold):
+            regressions.append(name)
+            mark = " <-- regression"
+
+        print("%-56s %10.4f %10.4f %8.2f%s" % (name, timeBase, timeNew, ratio,
+                                               mark))
+
+    return regressions
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark the latency of OFC visit pipeline.")
+    parser.add_argument("--output", default=None,
+                        help="JSON file to write the results.")
+    parser.add_argument("--compare", default=None,
+                        help="JSON file of base results to compare with.")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Ratio of time to report the regression.")
+    parser.add_argument("--numOfRepeat", type=int, default=5,
+                        help="Number of repeats of each benchmark.")
+    parser.add_argument("--scale", action="append", default=None,
+                        help="Synthetic scale as 'field,zk,dof'. This can "
+                             "be repeated.")
+    args = parser.parse_args()
+
+    if (args.scale is None):
+        scales = SYNTHETIC_SCALES
+    else:
+        scales = [tuple(map(int, scale.split(","))) for scale in args.scale]
+
+    results = dict()
+    for instName in (InstName.LSST, InstName.COMCAM):
+        for name, timing in benchInst(instName, args.numOfRepeat).items():
+            results["%s/%s" % (instName.name.lower(), name)] = timing
+
+    for numOfField, numOfZk, numOfDof in scales:
+        timings = benchSyntheticScale(numOfField, numOfZk, numOfDof,
+                                      args.numOfRepeat)
+        for name, timing in timings.items():
+            results["synthetic_%d_%d_%d/%s" % (numOfField, numOfZk, numOfDof,
+                                               name)] = timing
+
+    for name in sorted(results):
+        print("%-56s %10.4f ms" % (name, results[name]["msPerCall"]))
+
+    if (args.output is not None):
+        with open(args.output, "w") as file:
+            json.dump({"meta": getMeta(), "results": results}, file,
+                      indent=2, sort_keys=True)
+
+    if (args.compare is not None):
+        with open(args.compare, "r") as file:
+            baseResults = json.load(file)["results"]
+
+        print()
+        regressions = compareResults(results, baseResults, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+
+    # Benchmark the OFC visit pipeline
+    main()
@@ -1,11 +1,34 @@
 import numpy as np
-from scipy.linalg import block_diag
 
 from lsst.ts.ofc.Utility import DofGroup
+from lsst.ts.ofc.LruCache import LruCache
 
 
 class CamRot(object):
 
+    # Order of DOF groups in the full DOF vector
+    DOF_GROUP_ORDER = (DofGroup.M2HexPos, DofGroup.CamHexPos,
+                       DofGroup.M1M3Bend, DofGroup.M2Bend)
+
+    # Number of DOF of hexapod position and mirror bending mode
+    NUM_OF_HEX_POS = 5
+    NUM_OF_BEND_MODE = 20
+
+    # Start index of 2x2 rotation blocks in the hexapod position (z, x, y,
+    # rx, ry). The other items are not rotated.
+    HEX_ROT_BLOCK_IDX = (1, 3)
+
+    # Start index of 2x2 rotation blocks in the mirror bending mode. The
+    # bending modes 3 and 12 are not rotated.
+    MIR_ROT_BLOCK_IDX = (0, 3, 5, 7, 9, 12, 14, 16, 18)
+
+    # Resolution of the rotation angle used as the key of cached rotation
+    # matrix of DOF
+    ROT_ANG_RESOLUTION_IN_DEG = 1e-8
+
+    # Maximum number of rotation matrices of DOF in the cache
+    NUM_OF_DOF_ROT_MAT = 32
+
     def __init__(self, rotAngInDeg=0):
         """Initialization of camera rotation class.
 
@@ -17,6 +40,8 @@ class CamRot(object):
 
         self.rotAngInDeg = rotAngInDeg
 
+        self._dofRotMatCache = LruCache(maxSize=self.NUM_OF_DOF_ROT_MAT)
+
     def setRotAng(self, rotAngInDeg):
         """Set the rotation angle in degree.
 
@@ -31,9 +56,25 @@ class CamRot(object):
             Camera rotation angle should be in [-90, 90].
         """
 
-        if (np.abs(rotAngInDeg) <= 90):
-            self.rotAngInDeg = rotAngInDeg
-        else:
+        self._checkRotAng(rotAngInDeg)
+        self.rotAngInDeg = rotAngInDeg
+
+    def _checkRotAng(self, rotAngInDeg):
+        """Check the rotation angle is in [-90, 90] degree.
+
+        Parameters
+        ----------
+        rotAngInDeg : float or numpy.ndarray
+            Rotation angle(s) in degree.
+
+        Raises
+        ------
+        ValueError
+            Camera rotation angle should be in [-90, 90].
+        """
+
+        # The NaN is not in the range
+        if not np.all(np.abs(rotAngInDeg) <= 90):
             raise ValueError("Camera rotation angle should be in [-90, 90].")
 
     def getRotAng(self):
@@ -47,6 +88,189 @@ class CamRot(object):
 
         return self.rotAngInDeg
 
+    def getDofRotMat(self, m2TiltXYinArcsec=(0, 0),
+                     m1m3TiltXYinArcsec=(0, 0)):
+        """Get the rotation matrix of full degree of freedom (DOF).
+
+        The full DOF is (M2 hexapod position, camera hexapod position, M1M3
+        bending mode, M2 bending mode). The rotated DOF is rotMat.dot(dof),
+        which is the same as the rotation of each group by rotGroupDof().
+        The matrices are cached by the rotation angles of groups quantized
+        by ROT_ANG_RESOLUTION_IN_DEG. The returned matrix is read-only.
+
+        Parameters
+        ----------
+        m2TiltXYinArcsec : tuple, optional
+            Tilt angle of M2 hexapod compared with camera hexapod (M2-camera)
+            in arcsec. This is used by the M2 hexapod position and M2
+            bending mode. (the default is (0, 0).)
+        m1m3TiltXYinArcsec : tuple, optional
+            Tilt angle of M1M3 compared with camera hexapod in arcsec. This
+            is used by the M1M3 bending mode. (the default is (0, 0).)
+
+        Returns
+        -------
+        numpy.ndarray
+            Rotation matrix of full DOF.
+
+        Raises
+        ------
+        ValueError
+            Order of DofGroup and DOF are different.
+        """
+
+        m2RotAngInDeg = self._mapRotAngByTiltXY(
+            self.rotAngInDeg, tuple(ti/3600.0 for ti in m2TiltXYinArcsec))
+        m1m3RotAngInDeg = self._mapRotAngByTiltXY(
+            self.rotAngInDeg, tuple(ti/3600.0 for ti in m1m3TiltXYinArcsec))
+
+        key = tuple(int(np.round(rotAngInDeg/self.ROT_ANG_RESOLUTION_IN_DEG))
+                    for rotAngInDeg in (m2RotAngInDeg, self.rotAngInDeg,
+                                        m1m3RotAngInDeg))
+
+        rotMat = self._dofRotMatCache.get(key)
+        if (rotMat is None):
+            rotMat = self._calcDofRotMat(
+                *(keyItem*self.ROT_ANG_RESOLUTION_IN_DEG for keyItem in key))
+            rotMat.setflags(write=False)
+            self._dofRotMatCache.put(key, rotMat)
+
+        return rotMat
+
+    def getDofRotMats(self, rotAngsInDeg, m2TiltXYinArcsec=(0, 0),
+                      m1m3TiltXYinArcsec=(0, 0)):
+        """Get the rotation matrices of full degree of freedom (DOF) for an
+        array of rotation angles.
+
+        The rotation angle of this class is not used and not changed. The
+        matrices are not cached.
+
+        Parameters
+        ----------
+        rotAngsInDeg : numpy.ndarray or list
+            Rotation angles in degree. The shape is (nAngles,).
+        m2TiltXYinArcsec : numpy.ndarray or tuple, optional
+            Tilt angle of M2 hexapod compared with camera hexapod (M2-camera)
+            in arcsec. The shape is (2,) or (nAngles, 2). (the default is
+            (0, 0).)
+        m1m3TiltXYinArcsec : numpy.ndarray or tuple, optional
+            Tilt angle of M1M3 compared with camera hexapod in arcsec. The
+            shape is (2,) or (nAngles, 2). (the default is (0, 0).)
+
+        Returns
+        -------
+        numpy.ndarray
+            Rotation matrices of full DOF. The shape is (nAngles, nDof,
+            nDof).
+
+        Raises
+        ------
+        ValueError
+            Camera rotation angle should be in [-90, 90].
+        """
+
+        rotAngsInDeg = np.asarray(rotAngsInDeg, dtype=float).ravel()
+        self._checkRotAng(rotAngsInDeg)
+
+        m2TiltXYinDeg = np.asarray(m2TiltXYinArcsec, dtype=float) / 3600.0
+        m1m3TiltXYinDeg = np.asarray(m1m3TiltXYinArcsec, dtype=float) / 3600.0
+
+        m2RotAngsInDeg = self._mapRotAngByTiltXY(
+            rotAngsInDeg, (m2TiltXYinDeg[..., 0], m2TiltXYinDeg[..., 1]))
+        m1m3RotAngsInDeg = self._mapRotAngByTiltXY(
+            rotAngsInDeg, (m1m3TiltXYinDeg[..., 0], m1m3TiltXYinDeg[..., 1]))
+
+        return self._calcDofRotMat(m2RotAngsInDeg, rotAngsInDeg,
+                                   m1m3RotAngsInDeg)
+
+    def rotDofBatch(self, rotAngsInDeg, dof, m2TiltXYinArcsec=(0, 0),
+                    m1m3TiltXYinArcsec=(0, 0)):
+        """Rotate a batch of degree of freedom (DOF) vectors by an array of
+        rotation angles.
+
+        Parameters
+        ----------
+        rotAngsInDeg : numpy.ndarray or list
+            Rotation angles in degree. The shape is (nAngles,).
+        dof : numpy.ndarray
+            Full DOF. The shape is (nDof,) to rotate the same DOF by each
+            angle or (nAngles, nDof) to rotate each DOF by its own angle.
+        m2TiltXYinArcsec : numpy.ndarray or tuple, optional
+            Tilt angle of M2 hexapod compared with camera hexapod (M2-camera)
+            in arcsec. The shape is (2,) or (nAngles, 2). (the default is
+            (0, 0).)
+        m1m3TiltXYinArcsec : numpy.ndarray or tuple, optional
+            Tilt angle of M1M3 compared with camera hexapod in arcsec. The
+            shape is (2,) or (nAngles, 2). (the default is (0, 0).)
+
+        Returns
+        -------
+        numpy.ndarray
+            Rotated DOF. The shape is (nAngles, nDof).
+        """
+
+        rotMats = self.getDofRotMats(rotAngsInDeg,
+                                     m2TiltXYinArcsec=m2TiltXYinArcsec,
+                                     m1m3TiltXYinArcsec=m1m3TiltXYinArcsec)
+
+        if (np.ndim(dof) == 1):
+            return np.einsum("nij,j->ni", rotMats, dof)
+        else:
+            return np.einsum("nij,nj->ni", rotMats, dof)
+
+    def clearDofRotMatCache(self):
+        """Clear the cached rotation matrices of full degree of freedom."""
+
+        self._dofRotMatCache.clear()
+
+    def _calcDofRotMat(self, m2RotAngInDeg, camRotAngInDeg, m1m3RotAngInDeg):
+        """Calculate the rotation matrix of full degree of freedom (DOF).
+
+        The rotation angles can be the arrays of the same shape, and the
+        matrices are stacked in the leading axes.
+
+        Parameters
+        ----------
+        m2RotAngInDeg : float or numpy.ndarray
+            Rotation angle of M2 hexapod position and M2 bending mode in
+            degree.
+        camRotAngInDeg : float or numpy.ndarray
+            Rotation angle of camera hexapod position in degree.
+        m1m3RotAngInDeg : float or numpy.ndarray
+            Rotation angle of M1M3 bending mode in degree.
+
+        Returns
+        -------
+        numpy.ndarray
+            Rotation matrix of full DOF.
+
+        Raises
+        ------
+        ValueError
+            Order of DofGroup and DOF are different.
+        """
+
+        if (tuple(DofGroup) != self.DOF_GROUP_ORDER):
+            raise ValueError("Order of DofGroup and DOF are different.")
+
+        groupRotMats = (self._getHexRotMat(m2RotAngInDeg),
+                        self._getHexRotMat(camRotAngInDeg),
+                        self._getMirRotMat(m1m3RotAngInDeg),
+                        self._getMirRotMat(m2RotAngInDeg))
+
+        numOfDof = 2 * (self.NUM_OF_HEX_POS + self.NUM_OF_BEND_MODE)
+        leadShape = np.broadcast_shapes(*(np.shape(groupRotMat)[:-2]
+                                          for groupRotMat in groupRotMats))
+        rotMat = np.zeros(leadShape + (numOfDof, numOfDof))
+
+        startIdx = 0
+        for groupRotMat in groupRotMats:
+            endIdx = startIdx + groupRotMat.shape[-1]
+            rotMat[..., startIdx:endIdx, startIdx:endIdx] = groupRotMat
+            startIdx = endIdx
+
+        return rotMat
+
     def rotGroupDof(self, dofGroup, stateInDof, tiltXYinArcsec=(0, 0)):
         """Rotate the degree of freedom of specific group.
 
@@ -121,14 +345,15 @@ class CamRot(object):
 
         Parameters
         ----------
-        rotAngInDeg : float
+        rotAngInDeg : float or numpy.ndarray
             Rotation angle in degree.
         tiltXYinDeg : tuple
-            Tilt angle (x, y) in degree.
+            Tilt angle (x, y) in degree. The items can be the arrays that
+            broadcast with the rotation angle.
 
         Returns
         -------
-        float
+        float or numpy.ndarray
             Mapped rotation angle in degree.
         """
 
@@ -155,29 +380,43 @@ class CamRot(object):
             Hexapod rotation matrix.
         """
 
-        rotMat = self._calcMirRotMat(rotAngInDeg)
+        return self._calcBlockRotMat(rotAngInDeg, self.NUM_OF_HEX_POS,
+                                     self.HEX_ROT_BLOCK_IDX)
 
-        return block_diag(1, rotMat, rotMat)
-
-    def _calcMirRotMat(self, rotAngInDeg):
-        """Calculate the mirror rotation matrix.
+    def _calcBlockRotMat(self, rotAngInDeg, numOfItem, rotBlockIdx):
+        """Calculate the block diagonal rotation matrix.
 
         Parameters
         ----------
-        rotAngInDeg : float
-            Rotation angle in degree.
+        rotAngInDeg : float or numpy.ndarray
+            Rotation angle in degree. The matrices of an array of angles are
+            stacked in the leading axes.
+        numOfItem : int
+            Number of items to rotate.
+        rotBlockIdx : tuple[int]
+            Start index of 2x2 rotation blocks. The other diagonal elements
+            are 1.
 
         Returns
         -------
         numpy.ndarray
-            Rotation matrix.
+            Block diagonal rotation matrix.
         """
 
         theta = np.deg2rad(rotAngInDeg)
-        c, s = np.cos(theta), np.sin(theta)
-        R = np.array(((c, -s), (s, c)))
+        c = np.cos(theta)[..., np.newaxis]
+        s = np.sin(theta)[..., np.newaxis]
 
-        return R
+        rotMat = np.zeros(np.shape(theta) + (numOfItem, numOfItem))
+        rotMat[..., np.arange(numOfItem), np.arange(numOfItem)] = 1
+
+        idx = np.array(rotBlockIdx)
+        rotMat[..., idx, idx] = c
+        rotMat[..., idx, idx+1] = -s
+        rotMat[..., idx+1, idx] = s
+        rotMat[..., idx+1, idx+1] = c
+
+        return rotMat
 
     def _rotBendingMode(self, bendingMode, tiltXYinDeg):
         """Rotate the bending mode (degree of freedom, DOF) based on the rotation
@@ -217,10 +456,8 @@ class CamRot(object):
             Mirror rotation matrix.
         """
 
-        rotMat = self._calcMirRotMat(rotAngInDeg)
-
-        return block_diag(rotMat, 1, rotMat, rotMat, rotMat, rotMat,
-                          1, rotMat, rotMat, rotMat, rotMat)
+        return self._calcBlockRotMat(rotAngInDeg, self.NUM_OF_BEND_MODE,
+                                     self.MIR_ROT_BLOCK_IDX)
 
 
 if __name__ == "__main__":
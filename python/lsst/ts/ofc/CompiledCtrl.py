@@ -0,0 +1,103 @@
+import numpy as np
+from scipy.linalg import cho_solve
+
+
+class CompiledCtrl(object):
+
+    def __init__(self, matH, qMat, choFactorOfInvF, aTccMat, qy2, rho):
+        """Initialization of compiled control class.
+
+        This class holds the matrices of control law that only depend on the
+        configuration (filter, index arrays of zk and DOF, authority, and
+        penality), so that they can be reused between the visits.
+
+        Cost function: J = x.T * Q * x + rho * u.T * H * u.
+
+        Parameters
+        ----------
+        matH : numpy.ndarray
+            Matrix H used in the cost function.
+        qMat : numpy.ndarray
+            Q matrix used in cost functin.
+        choFactorOfInvF : tuple
+            Cholesky factorization of inv(F) = Q + rho**2 * H, which is
+            returned by scipy.linalg.cho_factor().
+        aTccMat : numpy.ndarray
+            A.T * C.T * C of each field point in the image quality weighting
+            ratio. The arrangement is (field #, dof #, zn #).
+        qy2 : numpy.ndarray
+            sum_{wi * A.T * C.T * C * y2k}, which is the part of Qx without
+            the optical state.
+        rho : float
+            Penality of motion.
+        """
+
+        self.matH = matH
+        self.qMat = qMat
+        self.choFactorOfInvF = choFactorOfInvF
+        self.aTccMat = aTccMat
+        self.qy2 = qy2.reshape(-1, 1)
+        self.rho = rho
+
+        for mat in (self.matH, self.qMat, self.choFactorOfInvF[0],
+                    self.aTccMat, self.qy2):
+            mat.setflags(write=False)
+
+    def calcQx(self, optSt):
+        """Calculate the Qx.
+
+        Qx = sum_{wi * A.T * C.T * C * (A * yk + y2k)} = Q * yk + qy2.
+
+        Parameters
+        ----------
+        optSt : numpy.ndarray
+            Optical state in the basis of degree of freedom (DOF).
+
+        Returns
+        -------
+        numpy.ndarray
+            qx array.
+        """
+
+        optSt = np.array(optSt, dtype=float).reshape(-1, 1)
+
+        return self.qMat.dot(optSt) + self.qy2
+
+    def solve(self, qx):
+        """Apply the F matrix on the qx array.
+
+        F is not inverted explicitly. The linear system of inv(F) is solved
+        by the Cholesky factorization instead.
+
+        Parameters
+        ----------
+        qx : numpy.ndarray
+            qx array. This can be a matrix to solve multiple columns.
+
+        Returns
+        -------
+        numpy.ndarray
+            F * qx.
+        """
+
+        return cho_solve(self.choFactorOfInvF, qx)
+
+    def getMatF(self):
+        """Get the F matrix.
+
+        This is for the inspection only. The control law uses solve()
+        instead.
+
+        Returns
+        -------
+        numpy.ndarray
+            F matrix.
+        """
+
+        numOfDof = self.qMat.shape[0]
+
+        return self.solve(np.eye(numOfDof))
+
+
+if __name__ == "__main__":
+    pass
@@ -24,6 +24,30 @@ class DataShare(object):
         self._idxDofFile = ParamReader()
         self._sensorIdToNameFile = ParamReader()
 
+        # Maps of sensor Id, sensor name, and field index
+        self._sensorIdToName = dict()
+        self._sensorNameToId = dict()
+        self._sensorNameToFieldIdx = dict()
+
+        # Lookup arrays of the maps for the numpy arrays of input
+        self._sensorNameByIdArray = np.array([], dtype=str)
+        self._sortedSensorNameArray = np.array([], dtype=str)
+        self._sensorIdOfSortedName = np.array([], dtype=int)
+        self._sortedMappedSensorNameArray = np.array([], dtype=str)
+        self._fieldIdxOfSortedName = np.array([], dtype=int)
+
+        # Cache of the full sensitivity matrix M and its subset on the
+        # current zn3Idx and dofIdx
+        self._senM = None
+        self._senMsubset = None
+        self._senMsubsetKey = None
+
+        # Memory-map mode to open the binary file of sensitivity matrix M
+        self._senMmmapMode = None
+
+        # File names used in the configuration for the reload
+        self._configFileNames = dict()
+
     def config(self, configDir, instName=InstName.LSST,
                zkAndDofIdxArraySetFileName="zkAndDofIdxArraySet.txt",
                mappingFileName="sensorNameToFieldIdx.txt",
@@ -56,6 +80,11 @@ class DataShare(object):
         self.configDir = configDir
         self.instName = instName
 
+        self._configFileNames = dict(
+            zkAndDofIdxArraySetFileName=zkAndDofIdxArraySetFileName,
+            mappingFileName=mappingFileName, idxDofFileName=idxDofFileName,
+            sensorIdToNameFileName=sensorIdToNameFileName)
+
         zkAndDofIdxArraySetFilePath = os.path.join(configDir,
                                                    zkAndDofIdxArraySetFileName)
         self._zkAndDofIdxArraySetFile = ParamReader(
@@ -74,8 +103,154 @@ class DataShare(object):
 
         senMfilePath = self._getSenMfilePath(reMatchStr=r"\AsenM\S+")
         self._senMfile = ParamReader(filePath=senMfilePath)
+        self._clearSenMcache()
 
         self._readZn3AndDofIdxArray()
+        self._setSensorMaps()
+
+    def reload(self):
+        """Reload the configuration files.
+
+        The cached sensitivity matrix M and sensor maps are rebuilt. The
+        current index arrays of zn and DOF are kept. Nothing is done if the
+        configuration has not been done.
+        """
+
+        if (not self._configFileNames):
+            return
+
+        zn3Idx = self.zn3Idx
+        dofIdx = self.dofIdx
+
+        self.config(self.configDir, instName=self.instName,
+                    **self._configFileNames)
+        self.setZkAndDofIdxArrays(zn3Idx, dofIdx)
+
+    def _setSensorMaps(self):
+        """Set the maps of sensor Id, sensor name, and field index.
+
+        If the key repeats in the mapping file, the first one is used.
+        """
+
+        self._sensorIdToName = dict()
+        self._sensorNameToId = dict()
+        content = self._sensorIdToNameFile.getTxtContent()
+        for sensorId, sensorName in self._readMapFromContent(content):
+            sensorId = int(sensorId)
+            self._sensorIdToName.setdefault(sensorId, sensorName)
+            self._sensorNameToId.setdefault(sensorName, sensorId)
+
+        self._sensorNameToFieldIdx = dict()
+        content = self._mappingFile.getTxtContent()
+        for sensorName, fieldIdx in self._readMapFromContent(content):
+            self._sensorNameToFieldIdx.setdefault(sensorName, int(fieldIdx))
+
+        # Lookup array indexed by the sensor Id. The empty string means there
+        # is no such sensor Id.
+        numOfSensorId = max(self._sensorIdToName.keys(), default=-1) + 1
+        self._sensorNameByIdArray = np.zeros(numOfSensorId, dtype=object)
+        self._sensorNameByIdArray[:] = ""
+        for sensorId, sensorName in self._sensorIdToName.items():
+            self._sensorNameByIdArray[sensorId] = sensorName
+        self._sensorNameByIdArray = self._sensorNameByIdArray.astype(str)
+
+        # Sorted arrays of sensor name for the binary search
+        self._sortedSensorNameArray, self._sensorIdOfSortedName = \
+            self._getSortedKeyAndValue(self._sensorNameToId)
+        self._sortedMappedSensorNameArray, self._fieldIdxOfSortedName = \
+            self._getSortedKeyAndValue(self._sensorNameToFieldIdx)
+
+    def _readMapFromContent(self, content):
+        """Read the map of two columns from the content.
+
+        Parameters
+        ----------
+        content : str
+            File content.
+
+        Returns
+        -------
+        list[tuple]
+            List of (key, value) in the file.
+        """
+
+        keyValueList = []
+        for line in content.splitlines():
+            line = line.strip()
+
+            # Skip the comment or empty line
+            if line.startswith("#") or (len(line) == 0):
+                continue
+
+            key, value = line.split()[0:2]
+            keyValueList.append((key, value))
+
+        return keyValueList
+
+    def _getSortedKeyAndValue(self, aMap):
+        """Get the sorted key array and related value array of map.
+
+        Parameters
+        ----------
+        aMap : dict
+            Map from the string to integer.
+
+        Returns
+        -------
+        numpy.ndarray[str]
+            Sorted key array.
+        numpy.ndarray[int]
+            Value array in the order of sorted key array.
+        """
+
+        keys = np.array(list(aMap.keys()), dtype=str)
+        values = np.array(list(aMap.values()), dtype=int)
+
+        idxSorted = np.argsort(keys)
+
+        return keys[idxSorted], values[idxSorted]
+
+    def _searchSortedKey(self, sortedKeys, keys):
+        """Search the position of keys in the sorted key array.
+
+        Parameters
+        ----------
+        sortedKeys : numpy.ndarray[str]
+            Sorted key array.
+        keys : numpy.ndarray[str]
+            Keys to search.
+
+        Returns
+        -------
+        numpy.ndarray[int]
+            Position of keys in the sorted key array.
+
+        Raises
+        ------
+        ValueError
+            Can not find the key.
+        """
+
+        if (len(sortedKeys) == 0):
+            pos = np.zeros(keys.shape, dtype=int)
+            isFound = np.zeros(keys.shape, dtype=bool)
+        else:
+            pos = np.searchsorted(sortedKeys, keys)
+            pos = np.minimum(pos, len(sortedKeys) - 1)
+            isFound = (sortedKeys[pos] == keys)
+
+        if (not np.all(isFound)):
+            raise ValueError("Can not find the key of %s."
+                             % keys[~isFound].tolist())
+
+        return pos
+
+    def _clearSenMcache(self):
+        """Clear the cache of sensitivity matrix M."""
+
+        self._senM = None
+        self._senMsubset = None
+        self._senMsubsetKey = None
 
     def _readZn3AndDofIdxArray(self):
         """Read the Z3-Zn and DOF index arrays.
@@ -168,10 +343,41 @@ class DataShare(object):
 
         return self.configDir
 
+    def setSenMmmapMode(self, mmapMode):
+        """Set the memory-map mode to open the sensitivity matrix M.
+
+        The memory map is only used if the binary companion file made by
+        MatBinConverter is up to date. The processes that map the same file
+        share one page-cached copy of M.
+
+        Parameters
+        ----------
+        mmapMode : str or None
+            Memory-map mode of numpy.load() (e.g. "r"). Use None to read the
+            whole matrix into memory.
+        """
+
+        self._senMmmapMode = mmapMode
+        self._clearSenMcache()
+
+    def getSenMmmapMode(self):
+        """Get the memory-map mode to open the sensitivity matrix M.
+
+        Returns
+        -------
+        str or None
+            Memory-map mode of numpy.load().
+        """
+
+        return self._senMmmapMode
+
     def getSenM(self):
         """Get the sensitivity matrix M.
 
-        The arrangement of M is (field #, zn #, dof #).
+        The arrangement of M is (field #, zn #, dof #). The returned matrix
+        is read-only and shared between the calls until the index arrays of
+        zn and DOF are changed. It is a view of the full matrix if the index
+        arrays are contiguous.
 
         Returns
         -------
@@ -179,17 +385,76 @@ class DataShare(object):
             Sensitivity matrix M.
         """
 
-        # Get the shape of sensitivity matrix M
-        filePath = self._senMfile.getFilePath()
-        fileName = os.path.basename(filePath)
-        shape = self._getSenMshape(fileName)
+        senMsubsetKey = (self.zn3Idx.tobytes(), self.dofIdx.tobytes())
+        if (self._senMsubset is None) or \
+           (self._senMsubsetKey != senMsubsetKey):
+
+            senM = self._getFullSenM()
+
+            zn3Sel = self._getSliceIfContiguous(self.zn3Idx)
+            dofSel = self._getSliceIfContiguous(self.dofIdx)
+            if isinstance(zn3Sel, slice) or isinstance(dofSel, slice):
+                senMsubset = senM[:, zn3Sel, dofSel]
+            else:
+                senMsubset = senM[np.ix_(np.arange(senM.shape[0]), zn3Sel,
+                                         dofSel)]
+            senMsubset.setflags(write=False)
 
-        # Set the sensitivity matrix M
-        senM = self._senMfile.getMatContent()
-        senM = senM.reshape(shape)
-        senM = senM[np.ix_(np.arange(shape[0]), self.zn3Idx, self.dofIdx)]
+            self._senMsubset = senMsubset
+            self._senMsubsetKey = senMsubsetKey
 
-        return senM
+        return self._senMsubset
+
+    def _getFullSenM(self):
+        """Get the full sensitivity matrix M of all zn and DOF.
+
+        The file is only parsed at the first call.
+
+        Returns
+        -------
+        numpy.ndarray
+            Full sensitivity matrix M.
+        """
+
+        if (self._senM is None):
+
+            # Get the shape of sensitivity matrix M
+            filePath = self._senMfile.getFilePath()
+            fileName = os.path.basename(filePath)
+            shape = self._getSenMshape(fileName)
+
+            # Set the sensitivity matrix M. The memory-mapped matrix is
+            # viewed as the normal array to keep the numpy operations
+            # returning the normal arrays.
+            senM = self._senMfile.getMatContent(mmapMode=self._senMmmapMode)
+            senM = np.asarray(senM).reshape(shape)
+            senM.setflags(write=False)
+
+            self._senM = senM
+
+        return self._senM
+
+    def _getSliceIfContiguous(self, idx):
+        """Get the slice of index array if it is contiguous.
+
+        The slice selects a view instead of a copy of the array.
+
+        Parameters
+        ----------
+        idx : numpy.ndarray
+            Index array.
+
+        Returns
+        -------
+        slice or numpy.ndarray
+            Slice if the index array is contiguous and increasing. Otherwise,
+            the index array itself.
+        """
+
+        if (len(idx) > 0) and np.all(np.diff(idx) == 1):
+            return slice(int(idx[0]), int(idx[-1]) + 1)
+        else:
+            return idx
 
     def _getSenMshape(self, senMFileName):
         """Get the shape of sensitivity matrix M.
@@ -267,11 +532,40 @@ class DataShare(object):
         fieldIdx = []
         if (self._inputIsList(sensorNameList)):
             for sensorName in sensorNameList:
-                field = self._mappingFile.getSetting(sensorName)
-                fieldIdx.append(int(field))
+                try:
+                    fieldIdx.append(self._sensorNameToFieldIdx[sensorName])
+                except KeyError:
+                    raise ValueError("Can not find the field index of '%s'."
+                                     % sensorName)
 
         return fieldIdx
 
+    def getFieldIdxArray(self, sensorNameArray):
+        """Get the array of field index based on the array of abbreviated
+        sensor name (e.g. R22_S11) and mapping file.
+
+        Parameters
+        ----------
+        sensorNameArray : numpy.ndarray[str] or list[str]
+            Array of abbreviated sensor name.
+
+        Returns
+        -------
+        numpy.ndarray[int]
+            Field index array.
+
+        Raises
+        ------
+        ValueError
+            Can not find the field index of sensor name.
+        """
+
+        sensorNameArray = np.asarray(sensorNameArray, dtype=str)
+        pos = self._searchSortedKey(self._sortedMappedSensorNameArray,
+                                    sensorNameArray)
+
+        return self._fieldIdxOfSortedName[pos]
+
     def _inputIsList(self, input):
         """Check the type of input is list or not.
 
@@ -357,6 +651,10 @@ class DataShare(object):
         self.zn3Idx = np.array(zn3Idx, dtype=int)
         self.dofIdx = np.array(dofIdx, dtype=int)
 
+        # The subset of sensitivity matrix M depends on the index arrays
+        self._senMsubset = None
+        self._senMsubsetKey = None
+
     def setZkAndDofInGroups(self, zkToUse=np.ones(19, dtype=int),
                             m2HexPos=np.ones(5, dtype=int),
                             camHexPos=np.ones(5, dtype=int),
@@ -509,13 +807,40 @@ class DataShare(object):
         sensorNameList = []
         for sensorId in sensorIdList:
             try:
-                sensorName = self._sensorIdToNameFile.getSetting(str(sensorId))
+                sensorName = self._sensorIdToName.get(int(sensorId))
+            except (ValueError, TypeError):
+                sensorName = None
+
+            if (sensorName is not None):
                 sensorNameList.append(sensorName)
-            except ValueError:
-                pass
 
         return sensorNameList, len(sensorNameList)
 
+    def mapSensorIdArrayToName(self, sensorIdArray):
+        """Map the array of sensor Id to sensor name.
+
+        If no sensor name is found for a specific Id, there will be no returned
+        value.
+
+        Parameters
+        ----------
+        sensorIdArray : numpy.ndarray[int] or list[int]
+            Array of sensor Id.
+
+        Returns
+        -------
+        numpy.ndarray[str]
+            Array of abbreviated sensor names.
+        """
+
+        sensorIdArray = np.asarray(sensorIdArray, dtype=int).ravel()
+
+        numOfSensorId = len(self._sensorNameByIdArray)
+        isInRange = (sensorIdArray >= 0) & (sensorIdArray < numOfSensorId)
+        sensorNameArray = self._sensorNameByIdArray[sensorIdArray[isInRange]]
+
+        return sensorNameArray[sensorNameArray != ""]
+
     def mapSensorNameToId(self, sensorNameList):
         """Map the array of sensor name to sensor Id.
 
@@ -528,33 +853,36 @@ class DataShare(object):
         -------
         list[int]
             List of sensor Id.
+
+        Raises
+        ------
+        ValueError
+            Can not find the sensor Id of input sensor name.
         """
 
         sensorIdList = []
         if self._inputIsList(sensorNameList):
-
-            content = self._sensorIdToNameFile.getTxtContent()
-
             for sensorName in sensorNameList:
-                sensorIdList.append(self._mapSensorNameToIdFromContent(
-                                                     content, sensorName))
+                try:
+                    sensorIdList.append(self._sensorNameToId[sensorName])
+                except KeyError:
+                    raise ValueError("Can not find the sensor Id of '%s'."
+                                     % sensorName)
 
         return sensorIdList
 
-    def _mapSensorNameToIdFromContent(self, content, sensorName):
-        """Map the sensor name to Id based on the mapping content.
+    def mapSensorNameArrayToId(self, sensorNameArray):
+        """Map the array of sensor name to sensor Id.
 
         Parameters
         ----------
-        content : str
-            File content.
-        sensorName : str
-            Abbreviated sensor name.
+        sensorNameArray : numpy.ndarray[str] or list[str]
+            Array of abbreviated sensor names.
 
         Returns
         -------
-        int
-            Sensor Id.
+        numpy.ndarray[int]
+            Array of sensor Id.
 
         Raises
         ------
@@ -562,25 +890,11 @@ class DataShare(object):
             Can not find the sensor Id of input sensor name.
         """
 
-        sensorId = None
-        for line in content.splitlines():
-            line = line.strip()
-
-            # Skip the comment or empty line
-            if line.startswith("#") or (len(line) == 0):
-                continue
-
-            sensorIdInFile, sensorNameInFile = line.split()
-
-            if (sensorNameInFile == sensorName):
-                sensorId = int(sensorIdInFile)
-                break
-
-        if (sensorId is None):
-            raise ValueError("Can not find the sensor Id of '%s'."
-                             % sensorName)
+        sensorNameArray = np.asarray(sensorNameArray, dtype=str)
+        pos = self._searchSortedKey(self._sortedSensorNameArray,
+                                    sensorNameArray)
 
-        return sensorId
+        return self._sensorIdOfSortedName[pos]
 
 
 if __name__ == "__main__":
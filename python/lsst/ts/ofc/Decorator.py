@@ -27,6 +27,15 @@ class Decorator(object):
 
         return getattr(self.__decoratedObj, attributeName)
 
+    def reload(self):
+        """Reload the configuration files of decorated object.
+
+        The child class should reload its own configuration files after
+        calling this function.
+        """
+
+        self.__decoratedObj.reload()
+
 
 if __name__ == "__main__":
     pass
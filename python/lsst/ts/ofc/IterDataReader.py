@@ -1,6 +1,8 @@
 import os
 import re
 import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 
 class IterDataReader(object):
@@ -17,6 +19,10 @@ class IterDataReader(object):
 
         self.dataDir = dataDir
 
+        # Index of iteration number to the file paths in the iteration
+        # directory. This is built at the first use.
+        self._iterFilesIdx = None
+
     def setDataDir(self, dataDir):
         """Set the simulation data directory.
 
@@ -27,6 +33,44 @@ class IterDataReader(object):
         """
 
         self.dataDir = dataDir
+        self._iterFilesIdx = None
+
+    def _getIterFilesIdx(self):
+        """Get the index of iteration number to the file paths in the
+        iteration directory.
+
+        The iteration directories ("iter%d") are listed once and reused.
+
+        Returns
+        -------
+        dict
+            File paths of each iteration number.
+        """
+
+        if (self._iterFilesIdx is None):
+
+            iterFilesIdx = dict()
+            for dirName in os.listdir(self.dataDir):
+                m = re.match(r"\Aiter(\d+)\Z", dirName)
+                dirPath = os.path.join(self.dataDir, dirName)
+                if (m is not None) and os.path.isdir(dirPath):
+                    iterFilesIdx[int(m.group(1))] = self._getDirFiles(dirPath)
+
+            self._iterFilesIdx = iterFilesIdx
+
+        return self._iterFilesIdx
+
+    def getIterNumList(self):
+        """Get the list of iteration numbers in the simulation data
+        directory.
+
+        Returns
+        -------
+        list[int]
+            Sorted iteration numbers.
+        """
+
+        return sorted(self._getIterFilesIdx().keys())
 
     def _getIterDir(self, iterNum):
         """Get the directory of specific iteration data.
@@ -80,7 +124,11 @@ class IterDataReader(object):
             List of file paths.
         """
 
-        return self._getDirFiles(self._getIterDir(iterNum))
+        iterFilesIdx = self._getIterFilesIdx()
+        if (int(iterNum) in iterFilesIdx):
+            return iterFilesIdx[int(iterNum)]
+        else:
+            return self._getDirFiles(self._getIterDir(iterNum))
 
     def _getMatchFilePath(self, reMatchStr, filePaths):
         """Get the matched file path.
@@ -123,6 +171,9 @@ class IterDataReader(object):
     def _getMatchFilePathInIter(self, reMatchStr, iterNum):
         """Get the matched file path in specific iteration number.
 
+        The iteration directory is listed again if the file is not in the
+        index, so the files written after the indexing can be found.
+
         Parameters
         ----------
         reMatchStr : str
@@ -137,7 +188,17 @@ class IterDataReader(object):
         """
 
         filePaths = self._getIterFiles(iterNum)
-        matchFilePath = self._getMatchFilePath(reMatchStr, filePaths)
+        try:
+            matchFilePath = self._getMatchFilePath(reMatchStr, filePaths)
+
+        except RuntimeError:
+            iterDir = self._getIterDir(iterNum)
+            if (not os.path.isdir(iterDir)):
+                raise
+
+            filePaths = self._getDirFiles(iterDir)
+            self._getIterFilesIdx()[int(iterNum)] = filePaths
+            matchFilePath = self._getMatchFilePath(reMatchStr, filePaths)
 
         return matchFilePath
 
@@ -228,6 +289,75 @@ class IterDataReader(object):
 
         return dof
 
+    def readIteration(self, iterNum):
+        """Read the wavefront error, PSSN, and degree of freedom (DOF) in
+        specific iteration number.
+
+        PSSN: Normalized point source sensitivity.
+
+        Parameters
+        ----------
+        iterNum : int
+            Iteration number.
+
+        Returns
+        -------
+        tuple
+            Wavefront error, PSSN, and DOF.
+        """
+
+        return (self.getWfsErr(iterNum), self.getPssn(iterNum),
+                self.getDof(iterNum))
+
+    def iterIterations(self, start=0, stop=None, numOfPrefetch=2):
+        """Iterate the data of iterations.
+
+        The next iterations are read by the background threads while the
+        caller is processing the current one.
+
+        Parameters
+        ----------
+        start : int, optional
+            First iteration number. (the default is 0.)
+        stop : int, optional
+            Iteration number to stop before. All the iterations from the
+            start in the simulation data directory are used if it is None.
+            (the default is None.)
+        numOfPrefetch : int, optional
+            Number of iterations to read in advance. The data is read
+            synchronously if it is 0. (the default is 2.)
+
+        Yields
+        ------
+        tuple
+            Wavefront error, PSSN, and degree of freedom (DOF) of each
+            iteration.
+        """
+
+        if (stop is None):
+            stop = max(self.getIterNumList(), default=start - 1) + 1
+
+        # Build the index before reading in the threads
+        self._getIterFilesIdx()
+
+        iterNums = iter(range(int(start), int(stop)))
+
+        if (numOfPrefetch < 1):
+            for iterNum in iterNums:
+                yield self.readIteration(iterNum)
+            return
+
+        with ThreadPoolExecutor(max_workers=int(numOfPrefetch)) as executor:
+
+            futures = deque()
+            for iterNum in iterNums:
+                futures.append(executor.submit(self.readIteration, iterNum))
+                if (len(futures) > numOfPrefetch):
+                    yield futures.popleft().result()
+
+            while futures:
+                yield futures.popleft().result()
+
     def getWfsSensorIdList(self):
         """Get the corner wavefront sensor Id list.
 
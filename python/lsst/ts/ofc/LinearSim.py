@@ -0,0 +1,335 @@
+import numpy as np
+
+
+class LinearSim(object):
+
+    # Number of zk (z4 to z22) in the wavefront error
+    NUM_OF_ZK = 19
+
+    def __init__(self, ztaac, sensorNameList, numOfLoop=1, seeds=None):
+        """Initialization of linear closed-loop simulator class.
+
+        The wavefront errors are simulated by the sensitivity matrix, which
+        is the linear model of telescope: y = A * (x_p + x) + y_intrinsic +
+        y2c + noise. x_p is the perturbation in the basis of degree of
+        freedom (DOF), and x is the state of closed loop. The independent
+        loops are stacked and advanced together. Each loop has its own
+        perturbation, noise, gain, and penality. The state of ZTAAC is not
+        changed.
+
+        Parameters
+        ----------
+        ztaac : ZTAAC
+            Configured ZTAAC instance. Its state is the initial state of
+            loops.
+        sensorNameList : list[str]
+            List of abbreviated names of wavefront sensors.
+        numOfLoop : int, optional
+            Number of independent loops. (the default is 1.)
+        seeds : list[int], optional
+            Seed of random number generator of each loop. (the default is
+            None.)
+
+        Raises
+        ------
+        ValueError
+            Number of seeds is not the number of loops.
+        """
+
+        self.ztaac = ztaac
+        self.sensorNameList = list(sensorNameList)
+        self.numOfLoop = int(numOfLoop)
+
+        if (seeds is None):
+            seeds = [None] * self.numOfLoop
+        elif (len(seeds) != self.numOfLoop):
+            raise ValueError("Number of seeds is not the number of loops.")
+        self._rngs = [np.random.default_rng(seed) for seed in seeds]
+
+        numOfState = self.ztaac.optCtrl.getNumOfState0()
+        self.perturbInDof = np.zeros((self.numOfLoop, numOfState))
+        self.noiseRmsInUm = np.zeros(self.numOfLoop)
+        self.gains = np.ones(self.numOfLoop) * self.ztaac.getGainInUse()
+        self.penalities = [None] * self.numOfLoop
+
+        self.stateInDof = np.zeros((self.numOfLoop, numOfState))
+        self.reset()
+
+    def reset(self):
+        """Reset the state of loops to the state of ZTAAC."""
+
+        stateIdx = np.arange(self.ztaac.optCtrl.getNumOfState0())
+        self.stateInDof = np.tile(self.ztaac.optCtrl.getState(stateIdx),
+                                  (self.numOfLoop, 1))
+
+    def setPerturbation(self, perturbInDof):
+        """Set the perturbation of telescope in the basis of degree of
+        freedom (DOF).
+
+        Parameters
+        ----------
+        perturbInDof : numpy.ndarray
+            Perturbation of all the elements of state 0. The arrangement is
+            (state #,) for all the loops or (loop #, state #).
+        """
+
+        self.perturbInDof = self._broadcastToLoops(perturbInDof,
+                                                   self.perturbInDof.shape)
+
+    def setNoise(self, noiseRmsInUm):
+        """Set the rms of Gaussian noise of wavefront error.
+
+        Parameters
+        ----------
+        noiseRmsInUm : float or numpy.ndarray
+            Noise rms in um of all the loops or each loop.
+        """
+
+        self.noiseRmsInUm = self._broadcastToLoops(noiseRmsInUm,
+                                                   (self.numOfLoop,))
+
+    def setGains(self, gains):
+        """Set the gain value of loops.
+
+        Parameters
+        ----------
+        gains : float or numpy.ndarray
+            Gain value of all the loops or each loop.
+
+        Raises
+        ------
+        ValueError
+            Gain is not in the range of [0, 1].
+        """
+
+        gains = self._broadcastToLoops(gains, (self.numOfLoop,))
+        if np.any(gains < 0) or np.any(gains > 1):
+            raise ValueError("Gain is not in the range of [0, 1].")
+
+        self.gains = gains
+
+    def setPenalities(self, penalities):
+        """Set the penality of subsystems of loops.
+
+        Parameters
+        ----------
+        penalities : list[dict]
+            Penality of each loop. See OptCtrlDataDecorator.setPenality() for
+            the keys. The penality of ZTAAC is used if the item is None.
+
+        Raises
+        ------
+        ValueError
+            Number of penalities is not the number of loops.
+        """
+
+        if (len(penalities) != self.numOfLoop):
+            raise ValueError("Number of penalities is not the number of "
+                             "loops.")
+
+        self.penalities = list(penalities)
+
+    def _broadcastToLoops(self, value, shape):
+        """Broadcast the value to the loops.
+
+        Parameters
+        ----------
+        value : float or numpy.ndarray
+            Value of all the loops or each loop.
+        shape : tuple
+            Shape of value of loops.
+
+        Returns
+        -------
+        numpy.ndarray
+            Value of loops.
+        """
+
+        return np.array(np.broadcast_to(np.asarray(value, dtype=float),
+                                        shape))
+
+    def getOptState(self):
+        """Get the true optical state of loops in the basis of degree of
+        freedom (DOF).
+
+        Returns
+        -------
+        numpy.ndarray
+            Optical state in use. The arrangement is (loop #, dof #).
+        """
+
+        dofIdx = self.ztaac.dataShare.getDofIdx()
+
+        return self.perturbInDof[:, dofIdx] + self.stateInDof[:, dofIdx]
+
+    def getWfErr(self):
+        """Get the simulated wavefront error of current state.
+
+        Returns
+        -------
+        numpy.ndarray
+            Wavefront error in um. The arrangement is (loop #, sensor #,
+            zk #).
+        """
+
+        dataShare = self.ztaac.dataShare
+        filterType = self.ztaac.getFilter()
+
+        fieldIdx = dataShare.getFieldIdx(self.sensorNameList)
+        zn3Idx = dataShare.getZn3Idx()
+        senM = dataShare.getSenM()[fieldIdx]
+
+        wfErrInUse = np.einsum("fzd,ld->lfz", senM, self.getOptState())
+        wfErrInUse += dataShare.getIntrinsicZk(filterType, fieldIdx)
+        wfErrInUse += dataShare.getY2Corr(fieldIdx)
+
+        for wfErrOfLoop, rng, noiseRms in zip(wfErrInUse, self._rngs,
+                                              self.noiseRmsInUm):
+            if (noiseRms > 0):
+                wfErrOfLoop += rng.normal(scale=noiseRms,
+                                          size=wfErrOfLoop.shape)
+
+        wfErr = np.zeros((self.numOfLoop, len(fieldIdx), self.NUM_OF_ZK))
+        wfErr[:, :, zn3Idx] = wfErrInUse
+
+        return wfErr
+
+    def calcGqPssn(self):
+        """Calculate the normalized point source sensitivity (PSSN) of
+        current state by the Gaussian quadrature of field points.
+
+        See OptCtrl.calcGqPssn() for the approximation of PSSN.
+
+        Returns
+        -------
+        numpy.ndarray
+            PSSN of each loop.
+        """
+
+        return self.ztaac.optCtrl.calcGqPssn(self.ztaac.dataShare,
+                                             self.ztaac.getFilter(),
+                                             self.getOptState())
+
+    def step(self):
+        """Advance all the loops by one iteration.
+
+        The simulated wavefront errors are fed through the optical state
+        estimator and optimal control of ZTAAC. The calculated uk is
+        aggregated in the state of each loop.
+
+        Returns
+        -------
+        numpy.ndarray
+            Calculated uk with gain. The arrangement is (loop #, dof #).
+        """
+
+        dataShare = self.ztaac.dataShare
+        filterType = self.ztaac.getFilter()
+        dofIdx = dataShare.getDofIdx()
+
+        wfErr = self.getWfErr()
+        fieldIdx = dataShare.getFieldIdx(self.sensorNameList)
+        optSt = self.ztaac.optStateEsti.estiOptStateBatch(
+            dataShare, filterType, wfErr, fieldIdx)
+
+        uk = np.zeros((self.numOfLoop, len(dofIdx)))
+        for penality, loopIdx in self._getLoopIdxOfPenality().items():
+            uk[loopIdx] = self._estiUkWithPenality(
+                dict(penality) if penality else None, filterType,
+                optSt[loopIdx], self.stateInDof[loopIdx])
+
+        uk *= self.gains.reshape(-1, 1)
+        self.stateInDof[:, dofIdx] += uk
+
+        return uk
+
+    def _getLoopIdxOfPenality(self):
+        """Get the loop indexes of each penality.
+
+        Returns
+        -------
+        dict
+            Loop indexes of each penality. The key is the sorted items of
+            penality or None for the penality of ZTAAC.
+        """
+
+        loopIdxOfPenality = dict()
+        for loopIdx, penality in enumerate(self.penalities):
+            key = tuple(sorted(penality.items())) if penality else None
+            loopIdxOfPenality.setdefault(key, []).append(loopIdx)
+
+        return loopIdxOfPenality
+
+    def _estiUkWithPenality(self, penality, filterType, optSt, stateInDof):
+        """Estimate uk without gain by the penality.
+
+        The penality of ZTAAC is restored after the estimation.
+
+        Parameters
+        ----------
+        penality : dict or None
+            Penality of subsystems. The penality of ZTAAC is used if it is
+            None.
+        filterType : enum 'FilterType'
+            Active filter type.
+        optSt : numpy.ndarray
+            Optical states in the basis of DOF. The arrangement is (loop #,
+            dof #).
+        stateInDof : numpy.ndarray
+            States in DOF of all the elements of state 0. The arrangement is
+            (loop #, state #).
+
+        Returns
+        -------
+        numpy.ndarray
+            Calculated uk without gain. The arrangement is (loop #, dof #).
+        """
+
+        dataShare = self.ztaac.dataShare
+        optCtrl = self.ztaac.optCtrl
+
+        if (penality is None):
+            return optCtrl.estiUkWithoutGainBatch(dataShare, filterType,
+                                                  optSt, stateInDof=stateInDof)
+
+        penalityOrig = dataShare.getPenality()
+        try:
+            dataShare.setPenality(penality)
+            uk = optCtrl.estiUkWithoutGainBatch(dataShare, filterType, optSt,
+                                                stateInDof=stateInDof)
+        finally:
+            dataShare.setPenality(penalityOrig)
+
+        return uk
+
+    def run(self, numOfIter):
+        """Run the closed loops.
+
+        Parameters
+        ----------
+        numOfIter : int
+            Number of iterations.
+
+        Returns
+        -------
+        dict
+            Simulation result with the arrays of "uk" (iteration #, loop #,
+            dof #), "stateInDof" (iteration #, loop #, state #) after each
+            iteration, and "pssn" (iteration #, loop #) before each
+            iteration.
+        """
+
+        ukList = []
+        stateList = []
+        pssnList = []
+        for iterNum in range(int(numOfIter)):
+            pssnList.append(self.calcGqPssn())
+            ukList.append(self.step())
+            stateList.append(self.stateInDof.copy())
+
+        return {"uk": np.array(ukList), "stateInDof": np.array(stateList),
+                "pssn": np.array(pssnList)}
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+
+
+class LruCache(object):
+
+    def __init__(self, maxSize=8):
+        """Initialization of least recently used (LRU) cache class.
+
+        Parameters
+        ----------
+        maxSize : int, optional
+            Maximum number of cached items. (the default is 8.)
+        """
+
+        self._maxSize = 0
+        self._items = OrderedDict()
+
+        self.setMaxSize(maxSize)
+
+    def setMaxSize(self, maxSize):
+        """Set the maximum number of cached items.
+
+        The least recently used items will be removed if the cache is larger
+        than the new size.
+
+        Parameters
+        ----------
+        maxSize : int
+            Maximum number of cached items.
+
+        Raises
+        ------
+        ValueError
+            Maximum size should be >= 1.
+        """
+
+        if (int(maxSize) < 1):
+            raise ValueError("Maximum size should be >= 1.")
+
+        self._maxSize = int(maxSize)
+        self._removeOldItems()
+
+    def getMaxSize(self):
+        """Get the maximum number of cached items.
+
+        Returns
+        -------
+        int
+            Maximum number of cached items.
+        """
+
+        return self._maxSize
+
+    def get(self, key, default=None):
+        """Get the cached item and mark it as the most recently used one.
+
+        Parameters
+        ----------
+        key : obj
+            Hashable key of item.
+        default : obj, optional
+            Returned value if the key is not in the cache. (the default is
+            None.)
+
+        Returns
+        -------
+        obj
+            Cached item.
+        """
+
+        if (key not in self._items):
+            return default
+
+        self._items.move_to_end(key)
+
+        return self._items[key]
+
+    def put(self, key, value):
+        """Put the item into the cache.
+
+        Parameters
+        ----------
+        key : obj
+            Hashable key of item.
+        value : obj
+            Item to cache.
+        """
+
+        self._items[key] = value
+        self._items.move_to_end(key)
+
+        self._removeOldItems()
+
+    def clear(self):
+        """Remove all cached items."""
+
+        self._items.clear()
+
+    def _removeOldItems(self):
+        """Remove the least recently used items to fit the maximum size."""
+
+        while (len(self._items) > self._maxSize):
+            self._items.popitem(last=False)
+
+    def __contains__(self, key):
+
+        return (key in self._items)
+
+    def __len__(self):
+
+        return len(self._items)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,204 @@
+import os
+import json
+import argparse
+import numpy as np
+
+from lsst.ts.ofc.Utility import getBinFilePath, calcFileChecksum
+
+
+class MatBinConverter(object):
+    """Converter of the text matrix files in the configuration directory to
+    the binary (.npy) companion files.
+
+    The binary files and a manifest (JSON) are written to the "binData"
+    sub-directory next to the text files. The manifest records the shape,
+    data type, and source checksum of each file. ParamReader.getMatContent()
+    prefers the binary file if it is not older than the text file.
+    """
+
+    # Version of binary data format
+    VERSION = 1
+
+    # Directory name of binary data
+    BIN_DIR_NAME = "binData"
+
+    # File name of manifest in the binary data directory
+    MANIFEST_FILE_NAME = "manifest.json"
+
+    def convertFile(self, filePath):
+        """Convert the text matrix file to the binary companion file.
+
+        Parameters
+        ----------
+        filePath : str
+            Text matrix file path.
+
+        Returns
+        -------
+        str
+            Binary companion file path.
+
+        Raises
+        ------
+        ValueError
+            The file is not a numerical matrix.
+        """
+
+        # Keep two dimensions to select the columns as numpy.loadtxt()
+        mat = np.loadtxt(filePath, ndmin=2)
+
+        binFilePath = getBinFilePath(filePath, binDirName=self.BIN_DIR_NAME)
+        binDirPath = os.path.dirname(binFilePath)
+        os.makedirs(binDirPath, exist_ok=True)
+
+        np.save(binFilePath, mat)
+
+        manifest = self.readManifest(binDirPath)
+        manifest["files"][os.path.basename(filePath)] = {
+            "binFile": os.path.basename(binFilePath),
+            "shape": list(mat.shape),
+            "dtype": str(mat.dtype),
+            "sha256": calcFileChecksum(filePath)}
+        self._writeManifest(binDirPath, manifest)
+
+        return binFilePath
+
+    def convertDir(self, dirPath, recursive=True):
+        """Convert all the text matrix files in the directory.
+
+        The files that are not numerical matrix (e.g. the setting files) are
+        skipped.
+
+        Parameters
+        ----------
+        dirPath : str
+            Directory path.
+        recursive : bool, optional
+            Convert the files in the sub-directories or not. (the default is
+            True.)
+
+        Returns
+        -------
+        list[str]
+            List of binary companion file paths.
+        """
+
+        binFilePaths = []
+        for root, dirNames, fileNames in os.walk(dirPath):
+
+            # Do not walk into the binary data directory
+            if (self.BIN_DIR_NAME in dirNames):
+                dirNames.remove(self.BIN_DIR_NAME)
+
+            for fileName in sorted(fileNames):
+                try:
+                    binFilePath = self.convertFile(os.path.join(root,
+                                                                fileName))
+                    binFilePaths.append(binFilePath)
+                except ValueError:
+                    pass
+
+            if (not recursive):
+                break
+
+        return binFilePaths
+
+    def verifyDir(self, dirPath):
+        """Verify the binary companion files in the directory by the source
+        checksums in the manifest.
+
+        Parameters
+        ----------
+        dirPath : str
+            Directory path of text matrix files.
+
+        Returns
+        -------
+        list[str]
+            List of text file names whose binary files are missing or stale.
+        """
+
+        binDirPath = os.path.join(dirPath, self.BIN_DIR_NAME)
+        manifest = self.readManifest(binDirPath)
+
+        staleFileNames = []
+        for fileName, info in sorted(manifest["files"].items()):
+            filePath = os.path.join(dirPath, fileName)
+            binFilePath = os.path.join(binDirPath, info["binFile"])
+
+            if (not os.path.exists(filePath)) or \
+               (not os.path.exists(binFilePath)) or \
+               (calcFileChecksum(filePath) != info["sha256"]):
+                staleFileNames.append(fileName)
+
+        return staleFileNames
+
+    def readManifest(self, binDirPath):
+        """Read the manifest in the binary data directory.
+
+        Parameters
+        ----------
+        binDirPath : str
+            Binary data directory path.
+
+        Returns
+        -------
+        dict
+            Manifest. It is empty if there is no manifest or the version is
+            different.
+        """
+
+        manifest = {"version": self.VERSION, "files": dict()}
+
+        manifestPath = os.path.join(binDirPath, self.MANIFEST_FILE_NAME)
+        if os.path.exists(manifestPath):
+            with open(manifestPath, "r") as file:
+                manifestInFile = json.load(file)
+
+            if (manifestInFile.get("version") == self.VERSION):
+                manifest = manifestInFile
+
+        return manifest
+
+    def _writeManifest(self, binDirPath, manifest):
+        """Write the manifest in the binary data directory.
+
+        Parameters
+        ----------
+        binDirPath : str
+            Binary data directory path.
+        manifest : dict
+            Manifest.
+        """
+
+        manifestPath = os.path.join(binDirPath, self.MANIFEST_FILE_NAME)
+        with open(manifestPath, "w") as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Convert the text matrix files of OFC configuration to "
+                    "the binary companion files.")
+    parser.add_argument("dirPath", help="Configuration directory.")
+    parser.add_argument("--verify", action="store_true",
+                        help="Only verify the binary files by the manifest.")
+    args = parser.parse_args()
+
+    converter = MatBinConverter()
+    if args.verify:
+        for root, dirNames, fileNames in os.walk(args.dirPath):
+            if (converter.BIN_DIR_NAME in dirNames):
+                dirNames.remove(converter.BIN_DIR_NAME)
+                for fileName in converter.verifyDir(root):
+                    print("Stale: %s" % os.path.join(root, fileName))
+    else:
+        for binFilePath in converter.convertDir(args.dirPath):
+            print("Write: %s" % binFilePath)
+
+
+if __name__ == "__main__":
+
+    # Convert the text matrix files
+    main()
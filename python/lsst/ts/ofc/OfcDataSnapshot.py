@@ -0,0 +1,199 @@
+import functools
+import numpy as np
+
+
+class OfcDataSnapshot(object):
+
+    # Getters without the argument whose returned values only change with
+    # the configuration or index arrays of zn and DOF. The values are
+    # evaluated at the first call and reused until the next mutation.
+    PRECOMPUTED_GETTERS = ("getConfigDir", "getInstDir", "getZn3Idx",
+                           "getDofIdx", "getSenM", "getAuthority", "getQwgt",
+                           "getPssnAlpha", "getNumOfFieldInQwgt", "getMotRng",
+                           "getXref")
+
+    # Prefixes of the functions that change the state of decorated stack
+    MUTATOR_PREFIXES = ("set", "config", "reload")
+
+    def __init__(self, decoratedObj):
+        """Initialization of OFC data snapshot class.
+
+        The decorated stack (e.g. OptCtrlDataDecorator(
+        OptStateEstiDataDecorator(DataShare))) is collapsed into one object.
+        The public functions of all layers are bound directly, so the calls
+        do not go through the Decorator.__getattr__() of each layer. The
+        functions that change the stack (set*(), config*(), and reload())
+        are forwarded to the stack and refresh the snapshot. The other
+        attributes are read from the stack.
+
+        Parameters
+        ----------
+        decoratedObj : DataShare or Decorator
+            Instance of DataShare class or related decorated class.
+        """
+
+        object.__setattr__(self, "_stack", decoratedObj)
+        object.__setattr__(self, "_funcNames",
+                           self._collectPublicFuncNames(decoratedObj))
+
+        self._refresh()
+
+    def _collectPublicFuncNames(self, decoratedObj):
+        """Collect the names of public functions of all layers in the
+        decorated stack.
+
+        Parameters
+        ----------
+        decoratedObj : DataShare or Decorator
+            Instance of DataShare class or related decorated class.
+
+        Returns
+        -------
+        list[str]
+            Names of public functions.
+        """
+
+        funcNames = set()
+
+        layer = decoratedObj
+        while (layer is not None):
+            for name in dir(type(layer)):
+                if (not name.startswith("_")) and \
+                   callable(getattr(type(layer), name)):
+                    funcNames.add(name)
+
+            # Go to the next layer
+            layer = layer.__dict__.get("_Decorator__decoratedObj")
+
+        return sorted(funcNames)
+
+    def _refresh(self):
+        """Rebind the functions of decorated stack and reset the precomputed
+        values."""
+
+        for name in self._funcNames:
+
+            # The attribute lookup of decorated stack returns the function
+            # bound to the layer that owns it
+            func = getattr(self._stack, name)
+
+            if name.startswith(self.MUTATOR_PREFIXES):
+                func = self._makeMutator(func)
+            elif name in self.PRECOMPUTED_GETTERS:
+                func = self._makeLazyGetter(name, func)
+
+            object.__setattr__(self, name, func)
+
+    def _makeMutator(self, func):
+        """Make the function that refreshes the snapshot after changing the
+        decorated stack.
+
+        Parameters
+        ----------
+        func : method
+            Bound function of decorated stack.
+
+        Returns
+        -------
+        function
+            Function that calls the bound function and refreshes the
+            snapshot.
+        """
+
+        @functools.wraps(func)
+        def mutator(*args, **kwargs):
+            value = func(*args, **kwargs)
+            self._refresh()
+
+            return value
+
+        return mutator
+
+    def _makeLazyGetter(self, name, func):
+        """Make the getter that evaluates the bound function at the first
+        call and replaces itself by the precomputed value.
+
+        The returned numpy.ndarray is read-only.
+
+        Parameters
+        ----------
+        name : str
+            Function name.
+        func : method
+            Bound getter of decorated stack.
+
+        Returns
+        -------
+        function
+            Getter of the precomputed value.
+        """
+
+        @functools.wraps(func)
+        def lazyGetter():
+            value = func()
+            if isinstance(value, np.ndarray) and value.flags.writeable:
+                value = value.copy()
+                value.setflags(write=False)
+
+            @functools.wraps(func)
+            def getter():
+                return value
+
+            object.__setattr__(self, name, getter)
+
+            return value
+
+        return lazyGetter
+
+    def getDecoratedObj(self):
+        """Get the decorated stack of this snapshot.
+
+        Returns
+        -------
+        DataShare or Decorator
+            Instance of DataShare class or related decorated class.
+        """
+
+        return self._stack
+
+    def __getattr__(self, attributeName):
+        """Use the attributes hold by the decorated stack.
+
+        This is only called if the attribute is not bound in the snapshot.
+
+        Parameters
+        ----------
+        attributeName : str
+          Name of attribute.
+
+        Returns
+        -------
+        obj
+          Attribute of decorated stack.
+        """
+
+        return getattr(self.__dict__["_stack"], attributeName)
+
+    def __setattr__(self, attributeName, value):
+        """The snapshot is frozen.
+
+        Parameters
+        ----------
+        attributeName : str
+          Name of attribute.
+        value : obj
+          Value of attribute.
+
+        Raises
+        ------
+        AttributeError
+            The snapshot is frozen.
+        """
+
+        raise AttributeError("OfcDataSnapshot is frozen. Use the set*() "
+                             "functions instead of setting '%s'."
+                             % attributeName)
+
+
+if __name__ == "__main__":
+    pass
@@ -1,10 +1,28 @@
 import numpy as np
+from scipy.linalg import cho_factor
 
 from lsst.ts.ofc.OptCtrlDefault import OptCtrlDefault
+from lsst.ts.ofc.CompiledCtrl import CompiledCtrl
+from lsst.ts.ofc.RhoFreeCtrl import RhoFreeCtrl
+from lsst.ts.ofc.LruCache import LruCache
 
 
 class OptCtrl(OptCtrlDefault):
 
+    # Maximum number of compiled controls in the cache
+    NUM_OF_COMPILED_CTRL = 8
+
+    # Maximum number of rho free controls in the cache
+    NUM_OF_RHO_FREE_CTRL = 8
+
+    def __init__(self):
+        """Initialization of optimal control class."""
+
+        super(OptCtrl, self).__init__()
+
+        self._compiledCtrlCache = LruCache(maxSize=self.NUM_OF_COMPILED_CTRL)
+        self._rhoFreeCtrlCache = LruCache(maxSize=self.NUM_OF_RHO_FREE_CTRL)
+
     def estiUkWithoutGain(self, optCtrlData, filterType, optSt):
         """Estimate uk by referencing to "0", "x0", or "x00" based on the
         configuration file without gain compensation..
@@ -25,13 +43,379 @@ class OptCtrl(OptCtrlDefault):
             Calculated uk in the basis of DOF.
         """
 
-        ccMat = self._calcCCmat(optCtrlData, filterType)
-        qx = self._calcQx(optCtrlData, ccMat, optSt)
-        matF = self._calcMatF(optCtrlData, filterType)
-        uk = self._calcUk(optCtrlData, matF, qx)
+        compiledCtrl = self.getCompiledCtrl(optCtrlData, filterType)
+        qx = compiledCtrl.calcQx(optSt)
+        uk = self._calcUk(optCtrlData, compiledCtrl, qx)
 
         return uk.ravel()
 
+    def estiUkWithoutGainBatch(self, optCtrlData, filterType, optSt,
+                               stateInDof=None):
+        """Estimate uk of a batch of optical states by referencing to "0",
+        "x0", or "x00" based on the configuration file without gain
+        compensation.
+
+        The batch is solved by the Cholesky factorization of compiled control
+        with one call. For the reference of "0" and "x00", each optical state
+        uses its own state in DOF, which is from independent runs of the
+        closed loop.
+
+        Parameters
+        ----------
+        optCtrlData : OptCtrlDataDecorator
+            Instance of OptCtrlDataDecorator class that holds the DataShare
+            instance.
+        filterType : enum 'FilterType'
+            Active filter type.
+        optSt : numpy.ndarray
+            Optical states in the basis of DOF. The arrangement is (batch #,
+            dof #).
+        stateInDof : numpy.ndarray, optional
+            States in DOF of all the elements of state 0 used by the
+            reference of "0" and "x00". The arrangement is (batch #, state
+            #). The state of this class is used if it is None. (the default
+            is None.)
+
+        Returns
+        -------
+        numpy.ndarray
+            Calculated uk in the basis of DOF. The arrangement is (batch #,
+            dof #).
+
+        Raises
+        ------
+        ValueError
+            No Xref is assigned.
+        """
+
+        compiledCtrl = self.getCompiledCtrl(optCtrlData, filterType)
+
+        # Each column of qx is one optical state
+        optSt = np.atleast_2d(np.asarray(optSt, dtype=float))
+        qx = compiledCtrl.qMat.dot(optSt.T) + compiledCtrl.qy2
+
+        if (stateInDof is None):
+            stateInDof = self.stateInDof.reshape(1, -1)
+        else:
+            stateInDof = np.atleast_2d(stateInDof)
+
+        dofIdx = optCtrlData.getDofIdx()
+        xRef = optCtrlData.getXref()
+        if (xRef == "x0"):
+            stateDiff = None
+        elif (xRef == "0"):
+            stateDiff = stateInDof[:, dofIdx]
+        elif (xRef == "x00"):
+            stateDiff = stateInDof[:, dofIdx] - self.getState0(dofIdx)
+        else:
+            raise ValueError("No Xref is assigned.")
+
+        if (stateDiff is not None):
+            rho = compiledCtrl.rho
+            qx = qx + rho**2 * compiledCtrl.matH.dot(stateDiff.T)
+
+        uk = self._calcUkRefX0(compiledCtrl, qx)
+
+        return uk.T
+
+    def estiUkWithoutGainOfRho(self, optCtrlData, filterType, optSt, rhos,
+                               stateInDof=None):
+        """Estimate uk of each penality of motion (rho) by referencing to
+        "0", "x0", or "x00" based on the configuration file without gain
+        compensation.
+
+        The rho in the configuration file is not used. The cached
+        eigendecomposition of rho free control is reused, so uk of each rho
+        only needs the rescale of eigenvalues.
+
+        Parameters
+        ----------
+        optCtrlData : OptCtrlDataDecorator
+            Instance of OptCtrlDataDecorator class that holds the DataShare
+            instance.
+        filterType : enum 'FilterType'
+            Active filter type.
+        optSt : numpy.ndarray
+            Optical state in the basis of DOF.
+        rhos : numpy.ndarray or list
+            Penalities of motion.
+        stateInDof : numpy.ndarray, optional
+            State in DOF of all the elements of state 0 used by the
+            reference of "0" and "x00". The state of this class is used if it
+            is None. (the default is None.)
+
+        Returns
+        -------
+        numpy.ndarray
+            Calculated uk in the basis of DOF. The arrangement is (rho #,
+            dof #).
+
+        Raises
+        ------
+        ValueError
+            No Xref is assigned.
+        """
+
+        rhoFreeCtrl = self.getRhoFreeCtrl(optCtrlData, filterType)
+        qx = rhoFreeCtrl.calcQx(optSt)
+
+        if (stateInDof is None):
+            stateInDof = self.stateInDof
+
+        dofIdx = optCtrlData.getDofIdx()
+        xRef = optCtrlData.getXref()
+        if (xRef == "x0"):
+            stateDiff = None
+        elif (xRef == "0"):
+            stateDiff = stateInDof[dofIdx].reshape(-1, 1)
+        elif (xRef == "x00"):
+            stateDiff = stateInDof[dofIdx] - self.getState0(dofIdx)
+            stateDiff = stateDiff.reshape(-1, 1)
+        else:
+            raise ValueError("No Xref is assigned.")
+
+        uk = -rhoFreeCtrl.solve(qx, rhos, stateDiff=stateDiff)
+
+        return uk[:, :, 0]
+
+    def calcGqPssn(self, optCtrlData, filterType, optSt):
+        """Calculate the normalized point source sensitivity (PSSN) of the
+        optical state by the Gaussian quadrature of field points.
+
+        The PSSN of each field point is approximated by 1 - sum_{j} alpha_j *
+        (2 * pi / lambda)**2 * y_j**2, where y = A * x + y2. This is the same
+        image quality metric used in the cost function.
+
+        Parameters
+        ----------
+        optCtrlData : OptCtrlDataDecorator
+            Instance of OptCtrlDataDecorator class that holds the DataShare
+            instance.
+        filterType : enum 'FilterType'
+            Active filter type.
+        optSt : numpy.ndarray
+            Optical state in the basis of DOF. The optical states can be
+            stacked in the leading axes.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            PSSN by Gaussian quadrature of each optical state.
+        """
+
+        ccDiag = np.diag(self._calcCCmat(optCtrlData, filterType))
+
+        qWgt = optCtrlData.getQwgt()
+        senM = optCtrlData.getSenM()
+        numOfField = optCtrlData.getNumOfFieldInQwgt()
+        y2c = optCtrlData.getY2Corr(np.arange(numOfField))
+
+        wfErr = np.einsum("fzd,...d->...fz", senM[:numOfField],
+                          np.asarray(optSt, dtype=float)) + y2c
+        pssn = 1 - np.sum(ccDiag * wfErr**2, axis=-1)
+
+        return pssn.dot(qWgt)
+
+    def getRhoFreeCtrl(self, optCtrlData, filterType):
+        """Get the rho free control of current configuration.
+
+        The rho free control holds the matrices H and Q, which only depend on
+        the active filter, index arrays of zk and DOF, and authority. It is
+        cached and shared by the compiled controls of different penalities
+        of motion (rho).
+
+        Parameters
+        ----------
+        optCtrlData : OptCtrlDataDecorator
+            Instance of OptCtrlDataDecorator class that holds the DataShare
+            instance.
+        filterType : enum 'FilterType'
+            Active filter type.
+
+        Returns
+        -------
+        RhoFreeCtrl
+            Rho free control.
+        """
+
+        key = self._getRhoFreeCtrlKey(optCtrlData, filterType)
+        rhoFreeCtrl = self._rhoFreeCtrlCache.get(key)
+        if (rhoFreeCtrl is None):
+            rhoFreeCtrl = self._buildRhoFreeCtrl(optCtrlData, filterType)
+            self._rhoFreeCtrlCache.put(key, rhoFreeCtrl)
+
+        return rhoFreeCtrl
+
+    def getCompiledCtrl(self, optCtrlData, filterType):
+        """Get the compiled control of current configuration.
+
+        The compiled control holds the matrices F, Q, and H, which only depend
+        on the active filter, index arrays of zk and DOF, authority, and
+        penality of motion. It is cached and reused between the visits.
+
+        Parameters
+        ----------
+        optCtrlData : OptCtrlDataDecorator
+            Instance of OptCtrlDataDecorator class that holds the DataShare
+            instance.
+        filterType : enum 'FilterType'
+            Active filter type.
+
+        Returns
+        -------
+        CompiledCtrl
+            Compiled control.
+        """
+
+        key = self._getCompiledCtrlKey(optCtrlData, filterType)
+        compiledCtrl = self._compiledCtrlCache.get(key)
+        if (compiledCtrl is None):
+            compiledCtrl = self._compileCtrl(optCtrlData, filterType)
+            self._compiledCtrlCache.put(key, compiledCtrl)
+
+        return compiledCtrl
+
+    def clearCompiledCtrlCache(self):
+        """Clear the cache of compiled control.
+
+        This is needed if the data files used in OptCtrlDataDecorator are
+        changed without changing the instrument directory.
+        """
+
+        self._compiledCtrlCache.clear()
+        self._rhoFreeCtrlCache.clear()
+
+    def _getRhoFreeCtrlKey(self, optCtrlData, filterType):
+        """Get the key of rho free control in the cache.
+
+        Parameters
+        ----------
+        optCtrlData : OptCtrlDataDecorator
+            Instance of OptCtrlDataDecorator class that holds the DataShare
+            instance.
+        filterType : enum 'FilterType'
+            Active filter type.
+
+        Returns
+        -------
+        tuple
+            Key of rho free control.
+        """
+
+        key = (optCtrlData.getInstDir(), filterType,
+               optCtrlData.getZn3Idx().tobytes(),
+               optCtrlData.getDofIdx().tobytes(),
+               optCtrlData.getAuthority().tobytes())
+
+        return key
+
+    def _getCompiledCtrlKey(self, optCtrlData, filterType):
+        """Get the key of compiled control in the cache.
+
+        Parameters
+        ----------
+        optCtrlData : OptCtrlDataDecorator
+            Instance of OptCtrlDataDecorator class that holds the DataShare
+            instance.
+        filterType : enum 'FilterType'
+            Active filter type.
+
+        Returns
+        -------
+        tuple
+            Key of compiled control.
+        """
+
+        penality = optCtrlData.getPenality()
+        key = self._getRhoFreeCtrlKey(optCtrlData, filterType) + \
+            (penality["Motion"],)
+
+        return key
+
+    def _compileCtrl(self, optCtrlData, filterType):
+        """Compile the control of current configuration.
+
+        The rho free matrices are reused from the cache, so only the
+        Cholesky factorization is calculated for a new penality of motion.
+
+        Parameters
+        ----------
+        optCtrlData : OptCtrlDataDecorator
+            Instance of OptCtrlDataDecorator class that holds the DataShare
+            instance.
+        filterType : enum 'FilterType'
+            Active filter type.
+
+        Returns
+        -------
+        CompiledCtrl
+            Compiled control.
+        """
+
+        rhoFreeCtrl = self.getRhoFreeCtrl(optCtrlData, filterType)
+
+        penality = optCtrlData.getPenality()
+        rho = penality["Motion"]
+        choFactorOfInvF = self._calcChoFactorOfInvF(
+            rhoFreeCtrl.qMat, rhoFreeCtrl.matH, rho)
+
+        return CompiledCtrl(rhoFreeCtrl.matH, rhoFreeCtrl.qMat,
+                            choFactorOfInvF, rhoFreeCtrl.aTccMat,
+                            rhoFreeCtrl.qy2, rho)
+
+    def _buildRhoFreeCtrl(self, optCtrlData, filterType):
+        """Build the rho free control of current configuration.
+
+        Parameters
+        ----------
+        optCtrlData : OptCtrlDataDecorator
+            Instance of OptCtrlDataDecorator class that holds the DataShare
+            instance.
+        filterType : enum 'FilterType'
+            Active filter type.
+
+        Returns
+        -------
+        RhoFreeCtrl
+            Rho free control.
+        """
+
+        authority = optCtrlData.getAuthority()
+        dofIdx = optCtrlData.getDofIdx()
+        matH = self._getMatH(authority, dofIdx)
+
+        ccMat = self._calcCCmat(optCtrlData, filterType)
+        senM = optCtrlData.getSenM()
+        qWgt = optCtrlData.getQwgt()
+        qMat = self._calcQmat(ccMat, senM, qWgt)
+
+        fieldNumInQwgt = optCtrlData.getNumOfFieldInQwgt()
+        aTccMat = self._calcATccMat(ccMat, senM[:fieldNumInQwgt])
+        qy2 = self._calcQx(optCtrlData, ccMat, np.zeros(len(dofIdx)))
+
+        return RhoFreeCtrl(matH, qMat, aTccMat, qy2)
+
+    def _calcATccMat(self, ccMat, senM):
+        """Calculate A.T * C.T * C of each field point.
+
+        Parameters
+        ----------
+        ccMat : numpy.ndarray
+            C.T * C matrix.
+        senM : numpy.ndarray
+            Sensitivity matrix M.
+
+        Returns
+        -------
+        numpy.ndarray
+            A.T * C.T * C of each field point. The arrangement is (field #,
+            dof #, zn #).
+        """
+
+        ccDiag = np.diag(ccMat)
+
+        return np.transpose(senM, (0, 2, 1)) * ccDiag
+
     def _calcCCmat(self, optCtrlData, filterType):
         """Calculate the CC matrix used in matrix Q.
 
@@ -86,48 +470,54 @@ class OptCtrl(OptCtrlDefault):
             qx array.
         """
 
-        optSt = optSt.reshape(-1, 1)
-
         qWgt = optCtrlData.getQwgt()
         senM = optCtrlData.getSenM()
 
         fieldNumInQwgt = optCtrlData.getNumOfFieldInQwgt()
         y2c = optCtrlData.getY2Corr(np.arange(fieldNumInQwgt))
 
-        qx = 0
-        for aMat, wgt, y2k in zip(senM, qWgt, y2c):
-            y2k = y2k.reshape(-1, 1)
-            qx += wgt * aMat.T.dot(ccMat).dot(aMat.dot(optSt) + y2k)
+        wgtSenM = self._calcWgtSenM(ccMat, senM, qWgt)
+        numOfField = len(wgtSenM)
+
+        # Wavefront error of each field: A * yk + y2k
+        wfErr = np.tensordot(senM[:numOfField], optSt.ravel(), axes=1)
+        wfErr += y2c[:numOfField]
 
-        return qx
+        qx = np.tensordot(wgtSenM, wfErr, axes=([0, 1], [0, 1]))
 
-    def _calcMatF(self, optCtrlData, filterType):
-        """Calculate the F matrix.
+        return qx.reshape(-1, 1)
 
-        F = inv(A.T * C.T * C * A + rho * H).
+    def _calcWgtSenM(self, ccMat, senM, qWgt):
+        """Calculate the sensitivity matrix weighted by the image quality
+        weighting ratio and C.T * C.
+
+        The weighted matrix of each field point is wi * C.T * C * A. Only the
+        field points in the weighting ratio are used. C.T * C is diagonal,
+        so it is applied as the scaling of zk.
 
         Parameters
         ----------
-        optCtrlData : OptCtrlDataDecorator
-            Instance of OptCtrlDataDecorator class that holds the DataShare
-            instance.
-        filterType : enum 'FilterType'
-            Active filter type.
-        """
+        ccMat : numpy.ndarray
+            C.T * C matrix.
+        senM : numpy.ndarray
+            Sensitivity matrix M.
+        qWgt : numpy.ndarray
+            Weighting ratio for the image quality Q matrix calculation.
 
-        authority = optCtrlData.getAuthority()
-        dofIdx = optCtrlData.getDofIdx()
-        matH = self._getMatH(authority, dofIdx)
+        Returns
+        -------
+        numpy.ndarray
+            Weighted sensitivity matrix. The arrangement is (field #, zn #,
+            dof #).
+        """
 
-        ccMat = self._calcCCmat(optCtrlData, filterType)
-        senM = optCtrlData.getSenM()
-        qWgt = optCtrlData.getQwgt()
-        qMat = self._calcQmat(ccMat, senM, qWgt)
+        numOfField = min(len(senM), len(qWgt))
+        ccDiag = np.diag(ccMat)
 
-        penality = optCtrlData.getPenality()
-        matF = self._calcF(qMat, matH, penality["Motion"])
+        wgt = np.asarray(qWgt[:numOfField]).reshape(-1, 1, 1) * \
+            ccDiag.reshape(1, -1, 1)
 
-        return matF
+        return senM[:numOfField] * wgt
 
     def _getMatH(self, authority, dofIdx):
         """Get the matrix H used in the control algorithm.
@@ -173,20 +563,30 @@ class OptCtrl(OptCtrlDefault):
             Q matrix used in cost functin.
         """
 
-        qMat = 0
-        for aMat, wgt in zip(senM, qWgt):
-            qMat += wgt * aMat.T.dot(ccMat).dot(aMat)
+        # The weights are non-negative. Q = B.T * B with B = sqrt(wi * C.T *
+        # C) * A stacked over the field points, which is a single symmetric
+        # matrix product.
+        numOfField = min(len(senM), len(qWgt))
+        ccDiag = np.diag(ccMat)
+        sqrtWgt = np.sqrt(np.asarray(qWgt[:numOfField]).reshape(-1, 1, 1) *
+                          ccDiag.reshape(1, -1, 1))
+
+        matB = (senM[:numOfField] * sqrtWgt).reshape(-1, senM.shape[2])
+        qMat = matB.T.dot(matB)
 
         return qMat
 
-    def _calcF(self, qMat, matH, rho):
-        """Calculate the F matrix.
+    def _calcChoFactorOfInvF(self, qMat, matH, rho):
+        """Calculate the Cholesky factorization of inverse of F matrix.
 
         u = - A.T * C.T * C * A / (A.T * C.T * C * A + rho * H) * x0
           = - F * (A.T * C.T * C * A) * x0
         Q = A.T * C.T * C * A
         F = inv( A.T * C.T * C * A + rho * H )
 
+        Q + rho * H is symmetric positive definite, so F is applied by the
+        Cholesky solver instead of the explicit inversion.
+
         Parameters
         ----------
         qMat : numpy.ndarray
@@ -195,19 +595,18 @@ class OptCtrl(OptCtrlDefault):
             Matrix H used in the cost function.
         rho: floate
             Penality of motion.
+
         Returns
         -------
-        numpy.ndarray
-            F matrix.
+        tuple
+            Cholesky factorization of inv(F) from scipy.linalg.cho_factor().
         """
 
         # Because the unit is rms^2, the square of rho read from
         # the *.ctrl file is needed.
-        matF = np.linalg.inv(rho**2 * matH + qMat)
+        return cho_factor(rho**2 * matH + qMat)
 
-        return matF
-
-    def _calcUk(self, optCtrlData, matF, qx):
+    def _calcUk(self, optCtrlData, compiledCtrl, qx):
         """Calculate uk by referencing to "0", "x0", or "x00" based on
         the configuration file.
 
@@ -216,8 +615,8 @@ class OptCtrl(OptCtrlDefault):
         optCtrlData : OptCtrlDataDecorator
             Instance of OptCtrlDataDecorator class that holds the DataShare
             instance.
-        matF : numpy.ndarray
-            Matrix F.
+        compiledCtrl : CompiledCtrl
+            Compiled control.
         qx : numpy.ndarray
             qx array.
 
@@ -234,24 +633,25 @@ class OptCtrl(OptCtrlDefault):
 
         xRef = optCtrlData.getXref()
         if (xRef == "x0"):
-            return self._calcUkRefX0(matF, qx)
+            return self._calcUkRefX0(compiledCtrl, qx)
         elif (xRef == "0"):
-            return self._calcUkRef0(optCtrlData, matF, qx)
+            return self._calcUkRef0(optCtrlData, compiledCtrl, qx)
         elif (xRef == "x00"):
-            return self._calcUkRefX00(optCtrlData, matF, qx)
+            return self._calcUkRefX00(optCtrlData, compiledCtrl, qx)
         else:
             raise ValueError("No Xref is assigned.")
 
-    def _calcUkRefX0(self, matF, qx):
+    def _calcUkRefX0(self, compiledCtrl, qx):
         """Calculate uk by referencing to "x0".
 
         The offset will only trace the previous one.
-        uk = -F' * QX.
+        uk = -F' * QX. The compiled control solves it with the Cholesky
+        factorization, which is shared by all the references.
 
         Parameters
         ----------
-        matF : numpy.ndarray
-            Matrix F.
+        compiledCtrl : CompiledCtrl
+            Compiled control.
         qx : numpy.ndarray
             qx array.
 
@@ -261,11 +661,11 @@ class OptCtrl(OptCtrlDefault):
             Calculated uk in the basis of degree of freedom (DOF).
         """
 
-        uk = -matF.dot(qx)
+        uk = -compiledCtrl.solve(qx)
 
         return uk
 
-    def _calcUkRef0(self, optCtrlData, matF, qx):
+    def _calcUkRef0(self, optCtrlData, compiledCtrl, qx):
         """Calculate uk by referencing to "0".
 
         The offset will trace the real value and target for 0.
@@ -276,8 +676,8 @@ class OptCtrl(OptCtrlDefault):
         optCtrlData : OptCtrlDataDecorator
             Instance of OptCtrlDataDecorator class that holds the DataShare
             instance.
-        matF : numpy.ndarray
-            Matrix F.
+        compiledCtrl : CompiledCtrl
+            Compiled control.
         qx : numpy.ndarray
             qx array.
 
@@ -287,20 +687,16 @@ class OptCtrl(OptCtrlDefault):
             Calculated uk in the basis of degree of freedom (DOF).
         """
 
-        authority = optCtrlData.getAuthority()
         dofIdx = optCtrlData.getDofIdx()
-        matH = self._getMatH(authority, dofIdx)
-
         stateInDof = self.getState(dofIdx)
         stateInDof = stateInDof.reshape(-1, 1)
 
-        penality = optCtrlData.getPenality()
-        rho = penality["Motion"]
-        qx += rho**2 * matH.dot(stateInDof)
+        rho = compiledCtrl.rho
+        qx = qx + rho**2 * compiledCtrl.matH.dot(stateInDof)
 
-        return self._calcUkRefX0(matF, qx)
+        return self._calcUkRefX0(compiledCtrl, qx)
 
-    def _calcUkRefX00(self, optCtrlData, matF, qx):
+    def _calcUkRefX00(self, optCtrlData, compiledCtrl, qx):
         """Calculate uk by referencing to "x00".
 
         The offset will only trace the relative changes of offset without
@@ -312,8 +708,8 @@ class OptCtrl(OptCtrlDefault):
         optCtrlData : OptCtrlDataDecorator
             Instance of OptCtrlDataDecorator class that holds the DataShare
             instance.
-        matF : numpy.ndarray
-            Matrix F.
+        compiledCtrl : CompiledCtrl
+            Compiled control.
         qx : numpy.ndarray
             qx array.
 
@@ -323,21 +719,16 @@ class OptCtrl(OptCtrlDefault):
             Calculated uk in the basis of degree of freedom (DOF).
         """
 
-        authority = optCtrlData.getAuthority()
         dofIdx = optCtrlData.getDofIdx()
-        matH = self._getMatH(authority, dofIdx)
-
         stateInDof = self.getState(dofIdx)
         state0InDof = self.getState0(dofIdx)
         stateDiff = stateInDof - state0InDof
         stateDiff = stateDiff.reshape(-1, 1)
 
-        penality = optCtrlData.getPenality()
-        rho = penality["Motion"]
-
-        qx += rho**2 * matH.dot(stateDiff)
+        rho = compiledCtrl.rho
+        qx = qx + rho**2 * compiledCtrl.matH.dot(stateDiff)
 
-        return self._calcUkRefX0(matF, qx)
+        return self._calcUkRefX0(compiledCtrl, qx)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,20 @@
 import os
+import json
 import numpy as np
 
 from lsst.ts.ofc.Decorator import Decorator
 from lsst.ts.ofc.ParamReader import ParamReader
+from lsst.ts.ofc.Utility import getBinFilePath, calcFileChecksum
 
 
 class OptCtrlDataDecorator(Decorator):
 
+    # File name of cached authority of mirror in the binary data directory
+    AUTHORITY_FILE_NAME = "authority.json"
+
+    # Version of cached authority
+    AUTHORITY_VERSION = 1
+
     def __init__(self, decoratedObj):
         """Initialization of optimal control data decorator class.
 
@@ -21,11 +29,26 @@ class OptCtrlDataDecorator(Decorator):
         self.xRef = ""
 
         self._authority = np.array([])
+        self._authorityParts = (np.array([]), np.array([]), np.array([]))
+
+        # Actuator force file name and columns of each mirror, and the
+        # actuator forces read at the first use
+        self._actuatorForceArgs = dict()
+        self._actuatorForce = dict()
+
         self._rigidBodyStrokeFile = ParamReader()
         self._weightingFile = ParamReader()
         self._pssnAlphaFile = ParamReader()
         self._configOptCtrlFile = ParamReader()
 
+        # Tables parsed in the configuration
+        self._qWgt = np.array([])
+        self._pssnAlpha = np.array([])
+        self._penality = dict()
+
+        # Arguments used in the configuration for the reload
+        self._configArgs = dict()
+
     def configOptCtrlData(self, configFileName="optiPSSN_x00.ctrl",
                           weightingFileName="imgQualWgt.txt",
                           pssnAlphaFileName="pssn_alpha.txt",
@@ -56,6 +79,15 @@ class OptCtrlDataDecorator(Decorator):
             Number of mirror bending mode. (the default is 20.)
         """
 
+        self._configArgs = dict(
+            configFileName=configFileName,
+            weightingFileName=weightingFileName,
+            pssnAlphaFileName=pssnAlphaFileName,
+            rigidBodyStrokeFileName=rigidBodyStrokeFileName,
+            m1m3ActuatorForceFileName=m1m3ActuatorForceFileName,
+            m2ActuatorForceFileName=m2ActuatorForceFileName,
+            numOfBendingMode=numOfBendingMode)
+
         rigidBodyStrokeFilePath = os.path.join(self.getConfigDir(),
                                                rigidBodyStrokeFileName)
         self._rigidBodyStrokeFile = ParamReader(
@@ -74,9 +106,47 @@ class OptCtrlDataDecorator(Decorator):
 
         self.xRef = self._configOptCtrlFile.getSetting("xref")
 
+        self._setTables()
         self._setAuthority(m1m3ActuatorForceFileName, m2ActuatorForceFileName,
                            int(numOfBendingMode))
 
+    def reload(self):
+        """Reload the configuration files.
+
+        The decorated object is reloaded first. Nothing else is done if the
+        configuration of this class has not been done.
+        """
+
+        super(OptCtrlDataDecorator, self).reload()
+
+        if self._configArgs:
+            self.configOptCtrlData(**self._configArgs)
+
+    def _setTables(self):
+        """Set the image quality weighting ratio, PSSN alpha, and penality of
+        subsystems from the configuration files.
+
+        The arrays are read-only.
+        """
+
+        qWgt = self._weightingFile.getMatContent(usecols=1)
+
+        # Do the normalization
+        self._qWgt = qWgt/np.sum(qWgt)
+        self._qWgt.setflags(write=False)
+
+        self._pssnAlpha = self._pssnAlphaFile.getMatContent(usecols=0)
+        self._pssnAlpha.setflags(write=False)
+
+        penality = {}
+        penality["M1M3Act"] = float(self._configOptCtrlFile.getSetting(
+                                                "M1M3_actuator_penalty"))
+        penality["M2Act"] = float(self._configOptCtrlFile.getSetting(
+                                                "M2_actuator_penalty"))
+        penality["Motion"] = float(self._configOptCtrlFile.getSetting(
+                                                "Motion_penalty"))
+        self._penality = penality
+
     def _setAuthority(self, m1m3ActuatorForceFileName, m2ActuatorForceFileName,
                       numOfBendingMode):
         """Set the authority of subsystems.
@@ -97,18 +167,71 @@ class OptCtrlDataDecorator(Decorator):
         rbStrokeAuthority = self._calcRigidBodyAuth()
 
         # Skip the first three columns (M1M3 only)
-        usecols = np.arange(3, 3+numOfBendingMode)
-        m1m3Authority = self._calcMirrorAuth("M1M3", m1m3ActuatorForceFileName,
-                                             usecols=usecols)
+        self._actuatorForceArgs = {
+            "M1M3": (m1m3ActuatorForceFileName,
+                     np.arange(3, 3+numOfBendingMode)),
+            "M2": (m2ActuatorForceFileName, np.arange(numOfBendingMode))}
+        self._actuatorForce = dict()
+
+        m1m3Authority = self._calcMirrorAuth(
+            "M1M3", *self._actuatorForceArgs["M1M3"])
+        m2Authority = self._calcMirrorAuth("M2",
+                                           *self._actuatorForceArgs["M2"])
+
+        # Authority without the penality
+        self._authorityParts = (rbStrokeAuthority, m1m3Authority, m2Authority)
+
+        self._authority = self._applyPenalityOnAuthority(self.getPenality())
+
+    def _applyPenalityOnAuthority(self, penality):
+        """Apply the penality on the authority of subsystems.
 
-        usecols = np.arange(numOfBendingMode)
-        m2Authority = self._calcMirrorAuth("M2", m2ActuatorForceFileName,
-                                           usecols=usecols)
+        Parameters
+        ----------
+        penality : dict
+            Penality of subsystems.
+
+        Returns
+        -------
+        numpy.ndarray
+            Authority of subsystem.
+        """
+
+        rbStrokeAuthority, m1m3Authority, m2Authority = self._authorityParts
+
+        return np.concatenate((rbStrokeAuthority,
+                               penality["M1M3Act"]*m1m3Authority,
+                               penality["M2Act"]*m2Authority))
+
+    def setPenality(self, penality):
+        """Set the penality of subsystems.
+
+        This overrides the penality in the configuration file. The
+        authority is updated as well. The configuration or reload restores
+        the penality in the file.
+
+        Parameters
+        ----------
+        penality : dict
+            Penality of subsystems. The keys are "M1M3Act", "M2Act", and
+            "Motion". The missing keys keep the current values.
+
+        Raises
+        ------
+        ValueError
+            Unknown penality.
+        """
+
+        for key in penality:
+            if (key not in self._penality):
+                raise ValueError("Unknown penality: %s." % key)
 
-        penality = self.getPenality()
-        self._authority = np.concatenate((rbStrokeAuthority,
-                                         penality["M1M3Act"]*m1m3Authority,
-                                         penality["M2Act"]*m2Authority))
+        newPenality = self.getPenality()
+        for key, value in penality.items():
+            newPenality[key] = float(value)
+
+        self._penality = newPenality
+        self._authority = self._applyPenalityOnAuthority(newPenality)
 
     def _calcRigidBodyAuth(self):
         """Calculate the distribution of control authority of rigid body.
@@ -151,6 +274,10 @@ class OptCtrlDataDecorator(Decorator):
         This is based on the standard deviation of actuator forces for each
         bending mode is used. The unit is 1 N RMS.
 
+        The authority is cached in the binary data directory of mirror with
+        the checksum of actuator force file, so the actuator forces are only
+        read if the file is changed or the columns are different.
+
         Parameters
         ----------
         mirrorDirName : str
@@ -170,11 +297,164 @@ class OptCtrlDataDecorator(Decorator):
 
         filePath = os.path.join(self.configDir, mirrorDirName,
                                 actuatorForceFileName)
-        bendingMode = np.loadtxt(filePath, usecols=usecols)
+        try:
+            checksum = calcFileChecksum(filePath)
+        except OSError:
+            checksum = None
+
+        cachedAuthority = dict()
+        if (checksum is not None):
+            authorityFilePath = self._getAuthorityFilePath(filePath)
+            cachedAuthority = self._readCachedAuthority(authorityFilePath)
+
+            key = "%s:%s" % (checksum, "all" if (usecols is None) else
+                             ",".join(map(str, np.atleast_1d(usecols))))
+            if (key in cachedAuthority):
+                return np.array(cachedAuthority[key], dtype=float)
+
+        bendingMode = ParamReader(filePath=filePath).getMatContent(
+            usecols=usecols)
         authority = np.std(bendingMode, axis=0)
 
+        if (checksum is not None):
+            cachedAuthority[key] = authority.tolist()
+            self._writeCachedAuthority(authorityFilePath, cachedAuthority)
+
         return authority
 
+    def _getAuthorityFilePath(self, actuatorForceFilePath):
+        """Get the path of cached authority file of the actuator force file.
+
+        Parameters
+        ----------
+        actuatorForceFilePath : str
+            Actuator force file path.
+
+        Returns
+        -------
+        str
+            Cached authority file path in the binary data directory.
+        """
+
+        binDirPath = os.path.dirname(getBinFilePath(actuatorForceFilePath))
+
+        return os.path.join(binDirPath, self.AUTHORITY_FILE_NAME)
+
+    def _readCachedAuthority(self, authorityFilePath):
+        """Read the cached authority.
+
+        Parameters
+        ----------
+        authorityFilePath : str
+            Cached authority file path.
+
+        Returns
+        -------
+        dict
+            Cached authority. The key is the checksum of actuator force file
+            and the columns. It is empty if the file can not be read or the
+            version is different.
+        """
+
+        try:
+            with open(authorityFilePath, "r") as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return dict()
+
+        if (cache.get("version") != self.AUTHORITY_VERSION):
+            return dict()
+
+        return cache.get("authority", dict())
+
+    def _writeCachedAuthority(self, authorityFilePath, cachedAuthority):
+        """Write the cached authority.
+
+        This is best-effort. Nothing is written if the directory is not
+        writable (e.g. installed package). The file is replaced atomically,
+        so the processes that configure at the same time do not read a
+        partial file.
+
+        Parameters
+        ----------
+        authorityFilePath : str
+            Cached authority file path.
+        cachedAuthority : dict
+            Cached authority.
+        """
+
+        tmpFilePath = "%s.%d.tmp" % (authorityFilePath, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(authorityFilePath), exist_ok=True)
+            with open(tmpFilePath, "w") as file:
+                json.dump({"version": self.AUTHORITY_VERSION,
+                           "authority": cachedAuthority}, file, indent=2,
+                          sort_keys=True)
+            os.replace(tmpFilePath, authorityFilePath)
+
+        except OSError:
+            try:
+                os.remove(tmpFilePath)
+            except OSError:
+                pass
+
+    def getM1M3ActuatorForce(self):
+        """Get the M1M3 actuator forces of bending modes.
+
+        The actuator force file is read at the first call after the
+        configuration.
+
+        Returns
+        -------
+        numpy.ndarray
+            Actuator forces in N of 1 um bending modes. The arrangement is
+            (actuator #, bending mode #). The array is read-only.
+        """
+
+        return self._getActuatorForce("M1M3")
+
+    def getM2ActuatorForce(self):
+        """Get the M2 actuator forces of bending modes.
+
+        The actuator force file is read at the first call after the
+        configuration.
+
+        Returns
+        -------
+        numpy.ndarray
+            Actuator forces in N of 1 um bending modes. The arrangement is
+            (actuator #, bending mode #). The array is read-only.
+        """
+
+        return self._getActuatorForce("M2")
+
+    def _getActuatorForce(self, mirrorDirName):
+        """Get the actuator forces of bending modes of mirror.
+
+        Parameters
+        ----------
+        mirrorDirName : str
+            Mirror directory name.
+
+        Returns
+        -------
+        numpy.ndarray
+            Actuator forces of bending modes. The array is read-only.
+        """
+
+        if (mirrorDirName not in self._actuatorForce):
+            actuatorForceFileName, usecols = \
+                self._actuatorForceArgs[mirrorDirName]
+            filePath = os.path.join(self.configDir, mirrorDirName,
+                                    actuatorForceFileName)
+
+            actuatorForce = ParamReader(filePath=filePath).getMatContent(
+                usecols=usecols)
+            actuatorForce.setflags(write=False)
+            self._actuatorForce[mirrorDirName] = actuatorForce
+
+        return self._actuatorForce[mirrorDirName]
+
     def getAuthority(self):
         """Get the authority of subsystems.
 
@@ -200,12 +480,7 @@ class OptCtrlDataDecorator(Decorator):
             Weighting ratio for the iamge quality Q matrix calculation.
         """
 
-        qWgt = self._weightingFile.getMatContent(usecols=1)
-
-        # Do the normalization
-        qWgt = qWgt/np.sum(qWgt)
-
-        return qWgt
+        return self._qWgt
 
     def getPssnAlpha(self):
         """Get the PSSN alpha value.
@@ -218,9 +493,7 @@ class OptCtrlDataDecorator(Decorator):
             PSSN alpha.
         """
 
-        pssnAlpha = self._pssnAlphaFile.getMatContent(usecols=0)
-
-        return pssnAlpha
+        return self._pssnAlpha
 
     def getNumOfFieldInQwgt(self):
         """Get the number of field in the image quality weighting ratio.
@@ -231,9 +504,7 @@ class OptCtrlDataDecorator(Decorator):
             Number of field for the image quality weighting ratio.
         """
 
-        qWgt = self.getQwgt()
-
-        return len(qWgt)
+        return len(self._qWgt)
 
     def getMotRng(self):
         """Get the range of motion of degree of freedom (DOF).
@@ -265,7 +536,7 @@ class OptCtrlDataDecorator(Decorator):
         """
 
         filePath = os.path.join(self.getInstDir(), state0InDofFileName)
-        state0InDof = np.loadtxt(filePath, usecols=1)
+        state0InDof = ParamReader(filePath=filePath).getMatContent(usecols=1)
 
         return state0InDof
 
@@ -278,14 +549,7 @@ class OptCtrlDataDecorator(Decorator):
             Penality of subsystems.
         """
 
-        penality = {}
-        penality["M1M3Act"] = float(self._configOptCtrlFile.getSetting(
-                                                "M1M3_actuator_penalty"))
-        penality["M2Act"] = float(self._configOptCtrlFile.getSetting(
-                                                "M2_actuator_penalty"))
-        penality["Motion"] = float(self._configOptCtrlFile.getSetting(
-                                                "Motion_penalty"))
-        return penality
+        return dict(self._penality)
 
     def getXref(self):
         """Get the X reference.
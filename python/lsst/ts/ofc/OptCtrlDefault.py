@@ -255,6 +255,54 @@ class OptCtrlDefault(object):
 
         raise NotImplementedError("Child class should implemented this.")
 
+    def estiUkWithoutGainBatch(self, optCtrlData, filterType, optSt,
+                               stateInDof=None):
+        """Estimate uk of a batch of optical states in the basis of degree of
+        freedom (DOF) without gain compensation.
+
+        The default implementation calls estiUkWithoutGain() for each
+        optical state with the related state in DOF. The state of this class
+        is restored at the end. The child class can override this with the
+        stacked calculation.
+
+        Parameters
+        ----------
+        optCtrlData: OptCtrlDataDecorator
+            Instance of OptCtrlDataDecorator class that holds the DataShare
+            instance.
+        filterType : enum 'FilterType'
+            Active filter type.
+        optSt : numpy.ndarray
+            Optical states in the basis of DOF. The arrangement is (batch #,
+            dof #).
+        stateInDof : numpy.ndarray, optional
+            States in DOF of all the elements of state 0 used by the
+            reference of "0" and "x00". The arrangement is (batch #, state
+            #). The state of this class is used if it is None. (the default
+            is None.)
+
+        Returns
+        -------
+        numpy.ndarray
+            Calculated uk in the basis of DOF. The arrangement is (batch #,
+            dof #).
+        """
+
+        optSt = np.atleast_2d(optSt)
+
+        stateInDofOrig = self.stateInDof
+        uk = []
+        try:
+            for idx, optStOfBatch in enumerate(optSt):
+                if (stateInDof is not None):
+                    self.stateInDof = np.array(stateInDof[idx], dtype=float)
+                uk.append(self.estiUkWithoutGain(optCtrlData, filterType,
+                                                 optStOfBatch))
+        finally:
+            self.stateInDof = stateInDofOrig
+
+        return np.array(uk).reshape(len(optSt), -1)
+
 
 if __name__ == "__main__":
     pass
@@ -1,12 +1,31 @@
+import math
+import itertools
 import numpy as np
 
 from lsst.ts.ofc.OptStateEstiDefault import OptStateEstiDefault
+from lsst.ts.ofc.LruCache import LruCache
 
 
 class OptStateEsti(OptStateEstiDefault):
 
     RCOND = 1e-4
 
+    # Maximum number of pueudo-inversed matrix A in the cache
+    NUM_OF_PINV_A = 16
+
+    # Default maximum number of dropped fields in the precomputation
+    MAX_NUM_OF_DROP = 2
+
+    # Maximum number of subsets of fields in the precomputation
+    MAX_NUM_OF_SUBSET = 1024
+
+    def __init__(self):
+        """Initialization of optical state estimator class."""
+
+        super(OptStateEsti, self).__init__()
+
+        self._pinvAcache = LruCache(maxSize=self.NUM_OF_PINV_A)
+
     def estiOptState(self, optStateEstiData, filterType, wfErr, fieldIdx):
         """Estimate the optical state in the basis of degree of
         freedom (DOF).
@@ -38,14 +57,172 @@ class OptStateEsti(OptStateEstiDefault):
         y = wfErr[:, zn3Idx] - intrinsicZk - y2c
         y = y.reshape(-1, 1)
 
-        senM = optStateEstiData.getSenM()
-        matA = self._getMatA(senM, fieldIdx)
-        pinvA = self._getPinvA(matA, self.RCOND)
-
+        pinvA = self.getPinvA(optStateEstiData, fieldIdx)
         x = pinvA.dot(y)
 
         return x.ravel()
 
+    def estiOptStateBatch(self, optStateEstiData, filterType, wfErr,
+                          fieldIdx, returnCov=False):
+        """Estimate the optical states of a stack of visits or samples in the
+        basis of degree of freedom (DOF).
+
+        Solve Y = A*X by X = pinv(A)*Y with one matrix product for all the
+        visits, which use the same filter and field index array. This can be
+        used to propagate the perturbed wavefront samples in the Monte Carlo
+        study of estimator noise.
+
+        Parameters
+        ----------
+        optStateEstiData: OptStateEstiData
+            Instance of OptStateEstiDataDecorator class that holds the
+            DataShare instance.
+        filterType : enum 'FilterType'
+            Active filter type.
+        wfErr : numpy.ndarray
+            Wavefront error im um. The arrangement is (visit #, sensor #,
+            zk #). There can be more leading axes, e.g. (run #, sample #,
+            sensor #, zk #).
+        fieldIdx : numpy.ndarray[int] or list[int]
+            Field index array.
+        returnCov : bool, optional
+            Return the empirical covariance of optical states of all the
+            visits or not. (the default is False.)
+
+        Returns
+        -------
+        numpy.ndarray
+            Optical states in the basis of DOF. The arrangement is (visit #,
+            dof #) with the same leading axes as the wavefront error.
+        numpy.ndarray
+            Empirical covariance of optical states (dof #, dof #). This is
+            only returned if returnCov is True.
+
+        Raises
+        ------
+        ValueError
+            Need at least 2 visits to calculate the covariance.
+        """
+
+        intrinsicZk = optStateEstiData.getIntrinsicZk(filterType, fieldIdx)
+        y2c = optStateEstiData.getY2Corr(fieldIdx)
+
+        zn3Idx = optStateEstiData.getZn3Idx()
+        wfErr = np.asarray(wfErr)
+        y = wfErr[..., zn3Idx] - intrinsicZk - y2c
+        y = y.reshape(-1, y.shape[-2] * y.shape[-1])
+
+        pinvA = self.getPinvA(optStateEstiData, fieldIdx)
+        x = y.dot(pinvA.T)
+
+        return self._shapeOptStateBatch(x, wfErr.shape[:-2], returnCov)
+
+    def getPinvA(self, optStateEstiData, fieldIdx):
+        """Get the pueudo-inversed matrix A of the field index array.
+
+        The pueudo-inversed matrix A only depends on the sensitivity matrix,
+        index arrays of zk and DOF, and field index array. It is cached and
+        reused between the visits.
+
+        Parameters
+        ----------
+        optStateEstiData: OptStateEstiData
+            Instance of OptStateEstiDataDecorator class that holds the
+            DataShare instance.
+        fieldIdx : numpy.ndarray[int] or list[int]
+            Field index array.
+
+        Returns
+        -------
+        numpy.ndarray
+            Pueudo-inversed matrix A.
+        """
+
+        key = (optStateEstiData.getInstDir(),
+               tuple(int(idx) for idx in fieldIdx),
+               optStateEstiData.getZn3Idx().tobytes(),
+               optStateEstiData.getDofIdx().tobytes(), self.RCOND)
+        pinvA = self._pinvAcache.get(key)
+        if (pinvA is None):
+            senM = optStateEstiData.getSenM()
+            matA = self._getMatA(senM, fieldIdx)
+            pinvA = self._getPinvA(matA, self.RCOND)
+            pinvA.setflags(write=False)
+
+            self._pinvAcache.put(key, pinvA)
+
+        return pinvA
+
+    def precomputePinvA(self, optStateEstiData, fieldIdx,
+                        maxNumOfDrop=MAX_NUM_OF_DROP):
+        """Precompute the pueudo-inversed matrix A of the field index array
+        and its subsets without some fields.
+
+        This is to keep the cost of visit the same when some wavefront
+        sensors are rejected. The order of fields in each subset follows
+        the input field index array. The subsets that have fewer equations
+        than variables are not enumerated. The cache is enlarged to hold all
+        the subsets.
+
+        Parameters
+        ----------
+        optStateEstiData: OptStateEstiData
+            Instance of OptStateEstiDataDecorator class that holds the
+            DataShare instance.
+        fieldIdx : numpy.ndarray[int] or list[int]
+            Field index array of all the configured wavefront sensors.
+        maxNumOfDrop : int, optional
+            Maximum number of dropped fields in the subsets. All the subsets
+            with enough equations are used if it is None. (the default is
+            MAX_NUM_OF_DROP.)
+
+        Returns
+        -------
+        int
+            Number of precomputed pueudo-inversed matrices.
+
+        Raises
+        ------
+        ValueError
+            Number of subsets is more than MAX_NUM_OF_SUBSET.
+        """
+
+        fieldIdx = [int(idx) for idx in fieldIdx]
+
+        # Smallest number of fields that has enough equations
+        numOfZk = len(optStateEstiData.getZn3Idx())
+        numOfDof = len(optStateEstiData.getDofIdx())
+        minNumOfField = max(math.ceil(numOfDof / numOfZk), 1)
+        if (maxNumOfDrop is not None):
+            minNumOfField = max(len(fieldIdx) - int(maxNumOfDrop),
+                                minNumOfField)
+
+        numsOfField = range(len(fieldIdx), minNumOfField - 1, -1)
+        numOfSubset = sum(math.comb(len(fieldIdx), numOfField)
+                          for numOfField in numsOfField)
+        if (numOfSubset > self.MAX_NUM_OF_SUBSET):
+            raise ValueError("Number of subsets (%d) is more than %d."
+                             % (numOfSubset, self.MAX_NUM_OF_SUBSET))
+
+        maxSize = max(self._pinvAcache.getMaxSize(),
+                      numOfSubset + self.NUM_OF_PINV_A)
+        self._pinvAcache.setMaxSize(maxSize)
+
+        for numOfField in numsOfField:
+            for subset in itertools.combinations(fieldIdx, numOfField):
+                self.getPinvA(optStateEstiData, subset)
+
+        return numOfSubset
+
+    def clearPinvAcache(self):
+        """Clear the cache of pueudo-inversed matrix A.
+
+        This is needed if the sensitivity matrix is changed without changing
+        the instrument directory.
+        """
+
+        self._pinvAcache.clear()
+
     def _getMatA(self, senM, fieldIdx):
         """Get the sensitivity matrix A based on the array of field index.
 
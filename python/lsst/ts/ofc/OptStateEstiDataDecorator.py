@@ -22,15 +22,25 @@ class OptStateEstiDataDecorator(Decorator):
         super(OptStateEstiDataDecorator, self).__init__(decoratedObj)
 
         self._intrincZkFileName = ""
-        self._intrincZkFile = ParamReader()
         self._wavelengthTable = ParamReader()
         self._y2CorrectionFile = ParamReader()
 
+        # Intrinsic zk of all zk in um for each filter type
+        self._intrinsicZkTable = dict()
+
+        # y2 correction of all fields and zn
+        self._y2Corr = np.array([])
+
+        # Arguments used in the configuration for the reload
+        self._configArgs = dict()
+
     def configOptStateEstiData(self, wavelengthTable="effWaveLength.txt",
                                intrincZkFileName="intrinsic_zn",
                                y2CorrectionFileName="y2.txt"):
         """Do the configuration of OptStateEstiDataDecorator class.
 
+        The intrinsic zk files of all filter types are read here.
+
         Parameters
         ----------
         wavelengthTable : str, optional
@@ -40,8 +50,17 @@ class OptStateEstiDataDecorator(Decorator):
             Intric zk file name. (the default is "intrinsic_zn".)
         y2CorrectionFileName : str, optional
             y2 correction file name. (the default is "y2.txt".)
+
+        Raises
+        ------
+        FileNotFoundError
+            Can not find the intrinsic zk file of filter type.
         """
 
+        self._configArgs = dict(wavelengthTable=wavelengthTable,
+                                intrincZkFileName=intrincZkFileName,
+                                y2CorrectionFileName=y2CorrectionFileName)
+
         wavelengthTablePath = os.path.join(self.getConfigDir(),
                                            wavelengthTable)
         self._wavelengthTable = ParamReader(filePath=wavelengthTablePath)
@@ -50,7 +69,57 @@ class OptStateEstiDataDecorator(Decorator):
                                             y2CorrectionFileName)
         self._y2CorrectionFile = ParamReader(filePath=y2CorrectionFilePath)
 
+        self._y2Corr = self._y2CorrectionFile.getMatContent()
+        self._y2Corr.setflags(write=False)
+
         self._intrincZkFileName = intrincZkFileName
+        self._setIntrinsicZkTable()
+
+    def reload(self):
+        """Reload the configuration files.
+
+        The decorated object is reloaded first. Nothing else is done if the
+        configuration of this class has not been done.
+        """
+
+        super(OptStateEstiDataDecorator, self).reload()
+
+        if self._configArgs:
+            self.configOptStateEstiData(**self._configArgs)
+
+    def _setIntrinsicZkTable(self):
+        """Set the table of intrinsic zk in um for each filter type.
+
+        The intrinsic zk is multiplied by the effective wavelength of filter
+        type in advance.
+
+        Raises
+        ------
+        FileNotFoundError
+            Can not find the intrinsic zk file of filter type.
+        """
+
+        filePaths = getDirFiles(self.getInstDir())
+
+        self._intrinsicZkTable = dict()
+        for filterType in FilterType:
+
+            # Get the intrinsicZk file path
+            reMatchStrTail = ""
+            if (filterType != FilterType.REF):
+                reMatchStrTail = "_" + filterType.name
+
+            reMatchStr = r"\A%s%s[.]\S+" % (self._intrincZkFileName,
+                                            reMatchStrTail)
+            zkFilePath = getMatchFilePath(reMatchStr, filePaths)
+
+            # Get the intrinsicZk with the consideration of effective
+            # wavelength
+            intrinsicZk = ParamReader(filePath=zkFilePath).getMatContent()
+            intrinsicZk = intrinsicZk * self.getEffWave(filterType)
+            intrinsicZk.setflags(write=False)
+
+            self._intrinsicZkTable[filterType] = intrinsicZk
 
     def getEffWave(self, filterType):
         """Get the effective wavelength in um.
@@ -89,8 +158,7 @@ class OptStateEstiDataDecorator(Decorator):
             y2 correction array.
         """
 
-        y2c = self._y2CorrectionFile.getMatContent()
-        y2c = y2c[np.ix_(fieldIdx, self.getZn3Idx())]
+        y2c = self._y2Corr[np.ix_(fieldIdx, self.getZn3Idx())]
 
         return y2c
 
@@ -111,24 +179,11 @@ class OptStateEstiDataDecorator(Decorator):
             Instrinsic zk of specific effective wavelength in um.
         """
 
-        # Get the intrinsicZk file path
-        reMatchStrTail = ""
-        if (filterType != FilterType.REF):
-            reMatchStrTail = "_" + filterType.name
-
-        reMatchStr = r"\A%s%s[.]\S+" % (self._intrincZkFileName,
-                                        reMatchStrTail)
-        filePaths = getDirFiles(self.getInstDir())
-        zkFilePath = getMatchFilePath(reMatchStr, filePaths)
-
         # Remap the zk index for z0-z2
         zkIdx = self.getZn3Idx() + 3
 
-        # Get the intrinsicZk with the consideration of effective wavelength
-        self._intrincZkFile = ParamReader(filePath=zkFilePath)
-        intrinsicZk = self._intrincZkFile.getMatContent()
+        intrinsicZk = self._intrinsicZkTable[filterType]
         intrinsicZk = intrinsicZk[np.ix_(fieldIdx, zkIdx)]
-        intrinsicZk = intrinsicZk * self.getEffWave(filterType)
 
         return intrinsicZk
 
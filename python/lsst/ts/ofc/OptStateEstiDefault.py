@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class OptStateEstiDefault(object):
 
     def estiOptState(self, optStateEstiData, filterType, wfErr, fieldIdx):
@@ -28,6 +31,94 @@ class OptStateEstiDefault(object):
         """
         raise NotImplementedError("Child class should implemented this.")
 
+    def estiOptStateBatch(self, optStateEstiData, filterType, wfErr,
+                          fieldIdx, returnCov=False):
+        """Estimate the optical states of a stack of visits or samples in the
+        basis of degree of freedom (DOF).
+
+        All the visits use the same filter and field index array. The
+        default implementation calls estiOptState() for each visit. The
+        child class can override this with the stacked calculation.
+
+        Parameters
+        ----------
+        optStateEstiData: OptStateEstiDataDecorator
+            Instance of OptStateEstiDataDecorator class that holds the
+            DataShare instance.
+        filterType : enum 'FilterType'
+            Active filter type.
+        wfErr : numpy.ndarray
+            Wavefront error im um. The arrangement is (visit #, sensor #,
+            zk #). There can be more leading axes, e.g. (run #, sample #,
+            sensor #, zk #).
+        fieldIdx : numpy.ndarray[int] or list[int]
+            Field index array.
+        returnCov : bool, optional
+            Return the empirical covariance of optical states of all the
+            visits or not. (the default is False.)
+
+        Returns
+        -------
+        numpy.ndarray
+            Optical states in the basis of DOF. The arrangement is (visit #,
+            dof #) with the same leading axes as the wavefront error.
+        numpy.ndarray
+            Empirical covariance of optical states (dof #, dof #). This is
+            only returned if returnCov is True.
+
+        Raises
+        ------
+        ValueError
+            Need at least 2 visits to calculate the covariance.
+        """
+
+        wfErr = np.asarray(wfErr)
+        wfErrOfVisits = wfErr.reshape((-1,) + wfErr.shape[-2:])
+
+        optSt = [self.estiOptState(optStateEstiData, filterType, wfErrOfVisit,
+                                   fieldIdx) for wfErrOfVisit in wfErrOfVisits]
+        optSt = np.array(optSt).reshape(len(wfErrOfVisits), -1)
+
+        return self._shapeOptStateBatch(optSt, wfErr.shape[:-2], returnCov)
+
+    def _shapeOptStateBatch(self, optSt, leadShape, returnCov):
+        """Shape the optical states of stacked visits and calculate the
+        empirical covariance if needed.
+
+        Parameters
+        ----------
+        optSt : numpy.ndarray
+            Optical states in the basis of DOF. The arrangement is (visit #,
+            dof #).
+        leadShape : tuple
+            Leading axes of the stacked wavefront error.
+        returnCov : bool
+            Return the empirical covariance of optical states or not.
+
+        Returns
+        -------
+        numpy.ndarray
+            Optical states with the leading axes.
+        numpy.ndarray
+            Empirical covariance of optical states. This is only returned
+            if returnCov is True.
+
+        Raises
+        ------
+        ValueError
+            Need at least 2 visits to calculate the covariance.
+        """
+
+        optStInShape = optSt.reshape(tuple(leadShape) + (optSt.shape[-1],))
+        if not returnCov:
+            return optStInShape
+
+        if (len(optSt) < 2):
+            raise ValueError("Need at least 2 visits to calculate the "
+                             "covariance.")
+
+        return optStInShape, np.cov(optSt, rowvar=False)
+
 
 if __name__ == "__main__":
     pass
@@ -1,6 +1,8 @@
 import os
 import numpy as np
 
+from lsst.ts.ofc.Utility import getBinFilePath
+
 
 class ParamReader(object):
 
@@ -18,7 +20,11 @@ class ParamReader(object):
         else:
             self.filePath = filePath
 
-        self._content = self._readTxtContent(self.filePath)
+        # The text content and index of setting lines are read at the first
+        # use. The matrix file does not need them.
+        self._content = None
+        self._lines = []
+        self._settingIdx = dict()
 
     def _readTxtContent(self, filePath):
         """Read the content of text file.
@@ -42,6 +48,51 @@ class ParamReader(object):
 
         return content
 
+    def _readAndIndexContent(self):
+        """Read and index the content of text file if it is not done yet."""
+
+        if (self._content is None):
+            self._content = self._readTxtContent(self.filePath)
+            self._lines, self._settingIdx = self._indexSetting(self._content)
+
+    def _indexSetting(self, content):
+        """Index the setting lines of content.
+
+        The comment and empty lines are skipped. The first word of each line
+        is the parameter name. If the parameter name repeats, the first line
+        is used.
+
+        Parameters
+        ----------
+        content : str
+            Content of file.
+
+        Returns
+        -------
+        list[str]
+            Setting lines without the comment and empty lines.
+        dict
+            Index of setting lines. The key is the parameter name, and the
+            value is the position of line in the setting lines.
+        """
+
+        lines = []
+        settingIdx = {}
+        for line in content.splitlines():
+            line = line.strip()
+
+            # Skip the comment or empty line
+            if line.startswith("#") or (len(line) == 0):
+                continue
+
+            param = line.split()[0]
+            if (param not in settingIdx):
+                settingIdx[param] = len(lines)
+
+            lines.append(line)
+
+        return lines, settingIdx
+
     def getFilePath(self):
         """Get the parameter file path.
 
@@ -62,16 +113,25 @@ class ParamReader(object):
             Text content.
         """
 
+        self._readAndIndexContent()
+
         return self._content
 
-    def getMatContent(self, usecols=None):
+    def getMatContent(self, usecols=None, mmapMode=None):
         """Get the matrix content.
 
+        The binary companion file made by MatBinConverter is used if it is
+        not older than the text file. Otherwise, the text file is parsed.
+
         Parameters
         ----------
         usecols: sequence, optional
             Which columns to read, with 0 being the first. (the default is
             None.)
+        mmapMode : str, optional
+            Memory-map mode of numpy.load() (e.g. "r") for the binary
+            companion file. It is ignored if the text file is parsed. (the
+            default is None.)
 
         Returns
         -------
@@ -79,16 +139,73 @@ class ParamReader(object):
             Matrix content.
         """
 
-        if (os.path.exists(self.filePath)):
+        binFilePath = getBinFilePath(self.filePath)
+        if self._isBinFileUpToDate(binFilePath):
+            mat = self._readBinMat(binFilePath, usecols=usecols,
+                                   mmapMode=mmapMode)
+        elif (os.path.exists(self.filePath)):
             mat = np.loadtxt(self.filePath, usecols=usecols)
         else:
             mat = np.array([])
 
         return mat
 
+    def _isBinFileUpToDate(self, binFilePath):
+        """The binary companion file is up to date or not.
+
+        Parameters
+        ----------
+        binFilePath : str
+            Binary companion file path.
+
+        Returns
+        -------
+        bool
+            True if the binary file exists and is not older than the text
+            file.
+        """
+
+        try:
+            return (os.path.getmtime(binFilePath) >=
+                    os.path.getmtime(self.filePath))
+        except OSError:
+            return False
+
+    def _readBinMat(self, binFilePath, usecols=None, mmapMode=None):
+        """Read the matrix in the binary companion file.
+
+        The binary file keeps the text matrix in two dimensions. The columns
+        are selected and squeezed in the same way as numpy.loadtxt(). The
+        memory-mapped matrix is only copied if the columns are selected.
+
+        Parameters
+        ----------
+        binFilePath : str
+            Binary companion file path.
+        usecols: int or sequence, optional
+            Which columns to read, with 0 being the first. (the default is
+            None.)
+        mmapMode : str, optional
+            Memory-map mode of numpy.load(). (the default is None.)
+
+        Returns
+        -------
+        numpy.ndarray
+            Matrix content.
+        """
+
+        mat = np.load(binFilePath, mmap_mode=mmapMode)
+        if (usecols is not None):
+            mat = mat[:, np.atleast_1d(usecols)]
+
+        return np.squeeze(mat)
+
     def getSetting(self, param, arrayParamList=[]):
         """Get the setting value.
 
+        The parameter name should match the first word of setting line
+        exactly.
+
         Parameters
         ----------
         param : str
@@ -109,40 +226,24 @@ class ParamReader(object):
             No setting value is found.
         """
 
-        val = None
-        lineCount = 0
-        assignedLine = -1
-        content = self._content.splitlines()
-        for line in content:
-            line = line.strip()
-
-            # Skip the comment or empty line
-            if line.startswith("#") or (len(line) == 0):
-                continue
+        self._readAndIndexContent()
 
-            if line.startswith(param):
-                val = line.split()[1:]
-
-            if (val is not None) and (len(val) == 1):
-                val = val[0]
+        if (param not in self._settingIdx):
+            raise ValueError("Can not find the setting of %s." % param)
 
-            # Search for the array value if necessary
-            if (val is not None) and (param in arrayParamList):
-                assignedLine = int(val)
-                val = None
+        lineIdx = self._settingIdx[param]
+        val = self._lines[lineIdx].split()[1:]
 
-            if (val is None) and (assignedLine > -1):
-                if (lineCount != assignedLine):
-                    lineCount += 1
-                else:
-                    val = line
+        if (len(val) == 1):
+            val = val[0]
 
-            # Stop search if the value is found
-            if (val is not None):
-                break
+        # The array value is in the assigned line after the parameter
+        if (param in arrayParamList):
+            lineIdx += int(val)
+            if (lineIdx >= len(self._lines)):
+                raise ValueError("Can not find the setting of %s." % param)
 
-        if (val is None):
-            raise ValueError("Can not find the setting of %s." % param)
+            val = self._lines[lineIdx]
 
         return val
 
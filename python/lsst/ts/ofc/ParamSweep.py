@@ -0,0 +1,303 @@
+import os
+import json
+import argparse
+import itertools
+import numpy as np
+
+from lsst.ts.wep.Utility import FilterType
+
+from lsst.ts.ofc.Utility import InstName
+from lsst.ts.ofc.ReplayDriver import getWorkerZTAAC, mapInWorkers
+from lsst.ts.ofc.IterDataReader import IterDataReader
+
+# Keys of grid of parameters in the order of columns of result table
+GRID_KEYS = ("m1m3ActPenality", "m2ActPenality", "motionPenality",
+             "defaultGain", "fwhmThresholdInArcsec")
+
+# Columns of result table
+RESULT_COLUMNS = GRID_KEYS + ("gain", "pssnBefore", "pssnAfter", "ukNorm")
+
+
+def evalSweepCell(cell):
+    """Evaluate one cell of the parameter sweep.
+
+    The cell has one penality of M1M3 and M2 actuators, so the authority is
+    only updated once. The uk of all the penalities of motion is calculated
+    from the eigendecomposition of rho free control, and the gains of all
+    the pairs of default gain and FWHM threshold are applied on it.
+
+    The cell keys are:
+    "visit": visit data (see ParamSweep.readVisit()).
+    "configDir": configuration directory.
+    "instName": instrument name (e.g. "lsst").
+    "configFileName": name of control configuration file.
+    "m1m3ActPenality", "m2ActPenality": penalities of actuators. The value
+    in the configuration file is used if it is None.
+    "motionPenality", "defaultGain", "fwhmThresholdInArcsec": lists of
+    values. The value in the configuration file or ZTAAC is used if the item
+    is None.
+
+    Parameters
+    ----------
+    cell : dict
+        Cell of parameter sweep.
+
+    Returns
+    -------
+    dict
+        Evaluation with the arrays of columns (see RESULT_COLUMNS) and "uk"
+        (row #, dof #). The rows are in the order of (motion penality,
+        default gain, FWHM threshold).
+    """
+
+    instName = InstName[cell.get("instName", "lsst").upper()]
+    ztaac, penalityInFile = getWorkerZTAAC(
+        configDir=cell.get("configDir"), instName=instName,
+        configFileName=cell.get("configFileName", "optiPSSN_x00.ctrl"))
+
+    dataShare = ztaac.dataShare
+    optCtrl = ztaac.optCtrl
+    visit = cell["visit"]
+
+    filterType = FilterType[visit.get("filterType", "REF").upper()]
+    ztaac.setFilter(filterType)
+    ztaac.setStateToState0()
+
+    penality = dict(penalityInFile)
+    for key, penalityKey in (("m1m3ActPenality", "M1M3Act"),
+                             ("m2ActPenality", "M2Act")):
+        if (cell.get(key) is not None):
+            penality[penalityKey] = cell[key]
+
+    rhos = [penality["Motion"] if (rho is None) else float(rho)
+            for rho in cell["motionPenality"]]
+    defaultGains = np.array([ztaac.defaultGain if (gain is None) else gain
+                             for gain in cell["defaultGain"]], dtype=float)
+    thresholds = np.array(
+        [ztaac.fwhmThresholdInArcsec if (threshold is None) else threshold
+         for threshold in cell["fwhmThresholdInArcsec"]], dtype=float)
+
+    try:
+        # The authority is recalculated from the cached parts without
+        # reading the actuator force files
+        dataShare.setPenality(penality)
+
+        sensorNameList = ztaac.mapSensorIdToName(visit["sensorIdList"])[0]
+        fieldIdx = dataShare.getFieldIdx(sensorNameList)
+        optSt = ztaac.optStateEsti.estiOptState(
+            dataShare, filterType, np.array(visit["wfErr"]), fieldIdx)
+
+        ukWithoutGain = optCtrl.estiUkWithoutGainOfRho(
+            dataShare, filterType, optSt, rhos)
+
+        # Gain of each pair of default gain and FWHM threshold
+        if (visit.get("pssn") is None):
+            gains = np.repeat(defaultGains.reshape(-1, 1), len(thresholds),
+                              axis=1)
+        else:
+            pssnNameList = ztaac.mapSensorIdToName(
+                visit["pssnSensorIdList"])[0]
+            fwhmGq = optCtrl.calcEffGQFWHM(
+                dataShare, visit["pssn"], dataShare.getFieldIdx(pssnNameList))
+            gains = np.where(fwhmGq > thresholds.reshape(1, -1), 1.0,
+                             defaultGains.reshape(-1, 1))
+
+        # The arrangement is (rho #, default gain #, threshold #, dof #)
+        uk = gains[np.newaxis, :, :, np.newaxis] * \
+            ukWithoutGain[:, np.newaxis, np.newaxis, :]
+
+        pssnBefore = optCtrl.calcGqPssn(dataShare, filterType, optSt)
+        pssnAfter = optCtrl.calcGqPssn(dataShare, filterType, optSt + uk)
+
+    finally:
+        dataShare.setPenality(penalityInFile)
+
+    shape = uk.shape[:-1]
+    columns = (penality["M1M3Act"], penality["M2Act"],
+               np.reshape(rhos, (-1, 1, 1)),
+               defaultGains.reshape(1, -1, 1), thresholds.reshape(1, 1, -1),
+               gains[np.newaxis], pssnBefore, pssnAfter,
+               np.linalg.norm(uk, axis=-1))
+
+    evaluation = {name: np.broadcast_to(value, shape).ravel().astype(float)
+                  for name, value in zip(RESULT_COLUMNS, columns)}
+    evaluation["uk"] = uk.reshape(-1, uk.shape[-1])
+
+    return evaluation
+
+
+class ParamSweep(object):
+
+    # Minimum number of cells to evaluate in the worker processes
+    MIN_NUM_OF_CELL_IN_WORKERS = 4
+
+    def __init__(self, numOfWorker=None, numOfThreadPerWorker=1):
+        """Initialization of parameter sweep class.
+
+        The penalities of M1M3 and M2 actuators, penality of motion, default
+        gain, and FWHM threshold are swept on one visit. Each grid point
+        gets the uk and predicted PSSN after the correction (see
+        OptCtrl.calcGqPssn()). The pairs of actuator penalities are the
+        cells evaluated in the worker processes when the grid is large.
+
+        Parameters
+        ----------
+        numOfWorker : int, optional
+            Number of worker processes. The number of CPUs is used if it is
+            None. The cells are evaluated in current process if it is 0.
+            (the default is None.)
+        numOfThreadPerWorker : int, optional
+            Number of BLAS threads in each worker. (the default is 1.)
+        """
+
+        if (numOfWorker is None):
+            numOfWorker = os.cpu_count() or 1
+
+        self.numOfWorker = int(numOfWorker)
+        self.numOfThreadPerWorker = int(numOfThreadPerWorker)
+
+    def readVisit(self, iterDataDir, iterNum, filterType=FilterType.REF):
+        """Read the visit data from the iteration data directory.
+
+        Parameters
+        ----------
+        iterDataDir : str
+            Iteration data directory.
+        iterNum : int
+            Iteration number.
+        filterType : enum 'FilterType', optional
+            Active filter type. (the default is FilterType.REF.)
+
+        Returns
+        -------
+        dict
+            Visit data with the keys of "wfErr", "sensorIdList", "pssn",
+            "pssnSensorIdList", and "filterType".
+        """
+
+        iterDataReader = IterDataReader(iterDataDir)
+        wfErr, pssn = iterDataReader.readIteration(iterNum)[0:2]
+
+        return {"wfErr": wfErr,
+                "sensorIdList": iterDataReader.getWfsSensorIdList(),
+                "pssn": pssn,
+                "pssnSensorIdList": iterDataReader.getPssnSensorIdList(),
+                "filterType": filterType.name}
+
+    def run(self, visit, grid, configDir=None, instName=InstName.LSST,
+            configFileName="optiPSSN_x00.ctrl"):
+        """Run the parameter sweep on the visit.
+
+        Parameters
+        ----------
+        visit : dict
+            Visit data (see readVisit()). The PSSN is optional. The default
+            gain is used if there is no PSSN.
+        grid : dict
+            Lists of values of parameters with the keys in GRID_KEYS. The
+            value in the configuration file or ZTAAC is used for the missing
+            key.
+        configDir : str, optional
+            Configuration directory. The configData of module is used if it
+            is None. (the default is None.)
+        instName : enum 'InstName', optional
+            Instrument name. (the default is InstName.LSST.)
+        configFileName : str, optional
+            Name of control configuration file. (the default is
+            "optiPSSN_x00.ctrl".)
+
+        Returns
+        -------
+        dict
+            Sweep result with the arrays of columns (see RESULT_COLUMNS) and
+            "uk" (row #, dof #). The rows are in the order of product of
+            grid values.
+
+        Raises
+        ------
+        ValueError
+            Unknown grid key.
+        """
+
+        for key in grid:
+            if (key not in GRID_KEYS):
+                raise ValueError("Unknown grid key: %s." % key)
+
+        values = {key: list(grid.get(key, [None])) for key in GRID_KEYS}
+
+        cells = []
+        for m1m3ActPenality, m2ActPenality in itertools.product(
+                values["m1m3ActPenality"], values["m2ActPenality"]):
+            cells.append({"visit": visit, "configDir": configDir,
+                          "instName": instName.name.lower(),
+                          "configFileName": configFileName,
+                          "m1m3ActPenality": m1m3ActPenality,
+                          "m2ActPenality": m2ActPenality,
+                          "motionPenality": values["motionPenality"],
+                          "defaultGain": values["defaultGain"],
+                          "fwhmThresholdInArcsec":
+                              values["fwhmThresholdInArcsec"]})
+
+        numOfWorker = self.numOfWorker
+        if (len(cells) < self.MIN_NUM_OF_CELL_IN_WORKERS):
+            numOfWorker = 0
+
+        evaluations = mapInWorkers(
+            evalSweepCell, cells, min(numOfWorker, len(cells)),
+            numOfThreadPerWorker=self.numOfThreadPerWorker,
+            configDir=configDir, instName=instName,
+            configFileName=configFileName)
+
+        results = dict()
+        for name in RESULT_COLUMNS + ("uk",):
+            results[name] = np.concatenate(
+                [evaluation[name] for evaluation in evaluations])
+
+        return results
+
+    def writeResults(self, filePath, results):
+        """Write the sweep results to the comma-separated values (CSV) file.
+
+        The uk is not written.
+
+        Parameters
+        ----------
+        filePath : str
+            Result file path.
+        results : dict
+            Sweep results.
+        """
+
+        table = np.column_stack([results[name] for name in RESULT_COLUMNS])
+        np.savetxt(filePath, table, fmt="%.6g", delimiter=",",
+                   header=",".join(RESULT_COLUMNS), comments="")
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Sweep the penalities and gain parameters on a visit.")
+    parser.add_argument("specFile",
+                        help="JSON file with the keys of iterDataDir, "
+                             "iterNum, and grid.")
+    parser.add_argument("resultFile", help="Result file (.csv).")
+    parser.add_argument("--numOfWorker", type=int, default=None,
+                        help="Number of worker processes.")
+    parser.add_argument("--numOfThreadPerWorker", type=int, default=1,
+                        help="Number of BLAS threads in each worker.")
+    args = parser.parse_args()
+
+    with open(args.specFile, "r") as file:
+        spec = json.load(file)
+
+    paramSweep = ParamSweep(numOfWorker=args.numOfWorker,
+                            numOfThreadPerWorker=args.numOfThreadPerWorker)
+    visit = paramSweep.readVisit(spec["iterDataDir"], spec.get("iterNum", 0))
+    results = paramSweep.run(visit, spec["grid"])
+    paramSweep.writeResults(args.resultFile, results)
+
+
+if __name__ == "__main__":
+
+    # Sweep the parameters
+    main()
@@ -0,0 +1,412 @@
+import os
+import json
+import argparse
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from lsst.ts.wep.Utility import FilterType
+
+from lsst.ts.ofc.Utility import InstName, getModulePath
+from lsst.ts.ofc.DataShare import DataShare
+from lsst.ts.ofc.OptStateEstiDataDecorator import OptStateEstiDataDecorator
+from lsst.ts.ofc.OptCtrlDataDecorator import OptCtrlDataDecorator
+from lsst.ts.ofc.OptStateEsti import OptStateEsti
+from lsst.ts.ofc.OptCtrl import OptCtrl
+from lsst.ts.ofc.ZTAAC import ZTAAC
+from lsst.ts.ofc.CamRot import CamRot
+from lsst.ts.ofc.IterDataReader import IterDataReader
+
+# Environment variables to limit the threads of BLAS libraries
+BLAS_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS",
+                        "MKL_NUM_THREADS", "VECLIB_MAXIMUM_THREADS",
+                        "NUMEXPR_NUM_THREADS")
+
+# ZTAAC instances of the worker process. The key is (configDir, instName,
+# configFileName).
+_workerZtaacs = dict()
+
+
+def buildZTAAC(configDir=None, instName=InstName.LSST,
+               configFileName="optiPSSN_x00.ctrl"):
+    """Build the configured ZTAAC instance.
+
+    Parameters
+    ----------
+    configDir : str, optional
+        Configuration directory. The configData of module is used if it is
+        None. (the default is None.)
+    instName : enum 'InstName', optional
+        Instrument name. (the default is InstName.LSST.)
+    configFileName : str, optional
+        Name of control configuration file. (the default is
+        "optiPSSN_x00.ctrl".)
+
+    Returns
+    -------
+    ZTAAC
+        Configured ZTAAC instance with the state 0 from file.
+    """
+
+    if (configDir is None):
+        configDir = os.path.join(getModulePath(), "configData")
+
+    dataShare = DataShare()
+    dataShare.config(configDir, instName=instName)
+
+    optStateEstiData = OptStateEstiDataDecorator(dataShare)
+    optStateEstiData.configOptStateEstiData()
+
+    mixedData = OptCtrlDataDecorator(optStateEstiData)
+    mixedData.configOptCtrlData(configFileName=configFileName)
+
+    ztaac = ZTAAC(OptStateEsti(), OptCtrl(), mixedData)
+    ztaac.config(filterType=FilterType.REF, defaultGain=0.7,
+                 fwhmThresholdInArcsec=0.2)
+    ztaac.setState0FromFile(state0InDofFileName="state0inDof.txt")
+    ztaac.setStateToState0()
+
+    return ztaac
+
+
+def getWorkerZTAAC(configDir=None, instName=InstName.LSST,
+                   configFileName="optiPSSN_x00.ctrl"):
+    """Get the ZTAAC instance of current process.
+
+    The instance is built at the first call and reused by the following
+    jobs in the same process, so the cached control matrices are kept.
+
+    Parameters
+    ----------
+    configDir : str, optional
+        Configuration directory. The configData of module is used if it is
+        None. (the default is None.)
+    instName : enum 'InstName', optional
+        Instrument name. (the default is InstName.LSST.)
+    configFileName : str, optional
+        Name of control configuration file. (the default is
+        "optiPSSN_x00.ctrl".)
+
+    Returns
+    -------
+    ZTAAC
+        Configured ZTAAC instance.
+    dict
+        Penality of subsystems in the configuration file.
+    """
+
+    key = (configDir, instName, configFileName)
+    if (key not in _workerZtaacs):
+        ztaac = buildZTAAC(configDir=configDir, instName=instName,
+                           configFileName=configFileName)
+
+        # Keep the penality in the configuration file to restore it
+        _workerZtaacs[key] = (ztaac, ztaac.dataShare.getPenality())
+
+    return _workerZtaacs[key]
+
+
+def limitBlasThreads(numOfThread):
+    """Limit the number of threads of BLAS libraries in current process.
+
+    The environment variables only affect the libraries loaded after this
+    call. The loaded libraries are limited by threadpoolctl if it is
+    available.
+
+    Parameters
+    ----------
+    numOfThread : int
+        Number of threads.
+    """
+
+    for envVar in BLAS_THREAD_ENV_VARS:
+        os.environ[envVar] = str(int(numOfThread))
+
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=int(numOfThread))
+    except ImportError:
+        pass
+
+
+def _initWorker(numOfThread, configDir, instName, configFileName):
+    """Initialize the worker process.
+
+    Parameters
+    ----------
+    numOfThread : int
+        Number of BLAS threads in the worker.
+    configDir : str
+        Configuration directory.
+    instName : enum 'InstName'
+        Instrument name.
+    configFileName : str
+        Name of control configuration file.
+    """
+
+    limitBlasThreads(numOfThread)
+    getWorkerZTAAC(configDir=configDir, instName=instName,
+                   configFileName=configFileName)
+
+
+def mapInWorkers(func, items, numOfWorker, numOfThreadPerWorker=1,
+                 configDir=None, instName=InstName.LSST,
+                 configFileName="optiPSSN_x00.ctrl"):
+    """Map the function on the items in the worker processes.
+
+    Each worker pre-configures its ZTAAC instance (see getWorkerZTAAC()) and
+    limits its BLAS threads.
+
+    Parameters
+    ----------
+    func : function
+        Module level function to call on each item.
+    items : list
+        Items to map.
+    numOfWorker : int
+        Number of worker processes. The items are mapped in current process
+        if it is 0.
+    numOfThreadPerWorker : int, optional
+        Number of BLAS threads in each worker. (the default is 1.)
+    configDir : str, optional
+        Configuration directory of the ZTAAC pre-configured in each worker.
+        (the default is None.)
+    instName : enum 'InstName', optional
+        Instrument name of the ZTAAC pre-configured in each worker. (the
+        default is InstName.LSST.)
+    configFileName : str, optional
+        Name of control configuration file of the ZTAAC pre-configured in
+        each worker. (the default is "optiPSSN_x00.ctrl".)
+
+    Returns
+    -------
+    list
+        Returned values in the order of items.
+    """
+
+    if (int(numOfWorker) == 0):
+        return [func(item) for item in items]
+
+    # The spawned workers load BLAS with the environment variables of parent
+    # process
+    envOrig = {envVar: os.environ.get(envVar)
+               for envVar in BLAS_THREAD_ENV_VARS}
+    try:
+        for envVar in BLAS_THREAD_ENV_VARS:
+            os.environ[envVar] = str(int(numOfThreadPerWorker))
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+                max_workers=int(numOfWorker), mp_context=context,
+                initializer=_initWorker,
+                initargs=(int(numOfThreadPerWorker), configDir, instName,
+                          configFileName)) as executor:
+            results = list(executor.map(func, items))
+
+    finally:
+        for envVar, value in envOrig.items():
+            if (value is None):
+                os.environ.pop(envVar, None)
+            else:
+                os.environ[envVar] = value
+
+    return results
+
+
+def runJob(job):
+    """Run the closed-loop replay of one job.
+
+    The job keys are:
+    "iterDataDir": iteration data directory (required).
+    "configDir": configuration directory.
+    "instName": instrument name (e.g. "lsst").
+    "configFileName": name of control configuration file.
+    "filterType": active filter name (e.g. "REF").
+    "gain": fixed gain value. The gain is decided by PSSN if it is None.
+    "penality": dict to override the penality of subsystems.
+    "rotAngInDeg": camera rotation angle in degree.
+    "start", "stop": range of iteration numbers.
+
+    Parameters
+    ----------
+    job : dict
+        Job of replay.
+
+    Returns
+    -------
+    dict
+        Replay result with the arrays of "uk", "dof", and "gain" for each
+        iteration. The uk is rotated. The dof is the total state applied in
+        the next iteration.
+    """
+
+    instName = InstName[job.get("instName", "lsst").upper()]
+    ztaac, penalityInFile = getWorkerZTAAC(
+        configDir=job.get("configDir"), instName=instName,
+        configFileName=job.get("configFileName", "optiPSSN_x00.ctrl"))
+
+    # Reset the job dependent settings
+    penality = dict(penalityInFile)
+    penality.update(job.get("penality", dict()))
+    ztaac.dataShare.setPenality(penality)
+
+    ztaac.setFilter(FilterType[job.get("filterType", "REF").upper()])
+    ztaac.setStateToState0()
+
+    camRot = CamRot()
+    camRot.setRotAng(job.get("rotAngInDeg", 0))
+
+    iterDataReader = IterDataReader(job["iterDataDir"])
+    sensorIdList = iterDataReader.getWfsSensorIdList()
+    sensorNameList = ztaac.mapSensorIdToName(sensorIdList)[0]
+
+    pssnIdList = iterDataReader.getPssnSensorIdList()
+    pssnSensorNameList = ztaac.mapSensorIdToName(pssnIdList)[0]
+
+    gain = job.get("gain")
+    dofIdx = np.arange(ztaac.optCtrl.getNumOfState0())
+
+    ukList = []
+    dofList = []
+    gainList = []
+    for wfErr, pssn, dofInFile in iterDataReader.iterIterations(
+            start=job.get("start", 0), stop=job.get("stop")):
+
+        if (gain is None):
+            ztaac.setGainByPSSN(pssn, pssnSensorNameList)
+        else:
+            ztaac.setGain(gain)
+
+        uk = ztaac.estiUkWithGain(wfErr, sensorNameList)
+        rotUk = ztaac.rotUk(camRot, uk)
+        ztaac.aggState(rotUk)
+
+        ukList.append(rotUk)
+        dofList.append(ztaac.optCtrl.getState(dofIdx))
+        gainList.append(ztaac.getGainInUse())
+
+    return {"uk": np.array(ukList), "dof": np.array(dofList),
+            "gain": np.array(gainList)}
+
+
+class ReplayDriver(object):
+
+    def __init__(self, numOfWorker=None, numOfThreadPerWorker=1):
+        """Initialization of replay driver class.
+
+        The closed-loop replays of jobs are fanned out to the worker
+        processes. Each worker keeps its pre-configured ZTAAC instances, and
+        the BLAS threads of each worker are limited to avoid the
+        oversubscription of cores.
+
+        Parameters
+        ----------
+        numOfWorker : int, optional
+            Number of worker processes. The number of CPUs is used if it is
+            None. The jobs run in current process if it is 0. (the default
+            is None.)
+        numOfThreadPerWorker : int, optional
+            Number of BLAS threads in each worker. (the default is 1.)
+        """
+
+        if (numOfWorker is None):
+            numOfWorker = os.cpu_count() or 1
+
+        self.numOfWorker = int(numOfWorker)
+        self.numOfThreadPerWorker = int(numOfThreadPerWorker)
+
+    def run(self, jobs, configDir=None, instName=InstName.LSST,
+            configFileName="optiPSSN_x00.ctrl"):
+        """Run the jobs of closed-loop replay.
+
+        Parameters
+        ----------
+        jobs : list[dict]
+            Jobs of replay. See runJob() for the keys.
+        configDir : str, optional
+            Configuration directory of the ZTAAC pre-configured in each
+            worker. (the default is None.)
+        instName : enum 'InstName', optional
+            Instrument name of the ZTAAC pre-configured in each worker. (the
+            default is InstName.LSST.)
+        configFileName : str, optional
+            Name of control configuration file of the ZTAAC pre-configured
+            in each worker. (the default is "optiPSSN_x00.ctrl".)
+
+        Returns
+        -------
+        list[dict]
+            Replay results in the order of jobs.
+        """
+
+        return mapInWorkers(runJob, jobs, self.numOfWorker,
+                            numOfThreadPerWorker=self.numOfThreadPerWorker,
+                            configDir=configDir, instName=instName,
+                            configFileName=configFileName)
+
+    def readJobs(self, filePath):
+        """Read the jobs from the JSON file.
+
+        Parameters
+        ----------
+        filePath : str
+            JSON file path of list of jobs.
+
+        Returns
+        -------
+        list[dict]
+            Jobs of replay.
+        """
+
+        with open(filePath, "r") as file:
+            jobs = json.load(file)
+
+        return jobs
+
+    def writeResults(self, filePath, jobs, results):
+        """Write the replay results to one numpy .npz file.
+
+        The arrays of i-th job are saved as "job<i>_uk", "job<i>_dof", and
+        "job<i>_gain". The jobs are saved as the JSON string in "jobs".
+
+        Parameters
+        ----------
+        filePath : str
+            Result file path.
+        jobs : list[dict]
+            Jobs of replay.
+        results : list[dict]
+            Replay results in the order of jobs.
+        """
+
+        arrays = {"jobs": np.array(json.dumps(jobs))}
+        for idx, result in enumerate(results):
+            for name, array in result.items():
+                arrays["job%d_%s" % (idx, name)] = array
+
+        np.savez(filePath, **arrays)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Replay the closed loops of iteration data in parallel.")
+    parser.add_argument("jobFile", help="JSON file of list of jobs.")
+    parser.add_argument("resultFile", help="Result file (.npz).")
+    parser.add_argument("--numOfWorker", type=int, default=None,
+                        help="Number of worker processes.")
+    parser.add_argument("--numOfThreadPerWorker", type=int, default=1,
+                        help="Number of BLAS threads in each worker.")
+    args = parser.parse_args()
+
+    driver = ReplayDriver(numOfWorker=args.numOfWorker,
+                          numOfThreadPerWorker=args.numOfThreadPerWorker)
+    jobs = driver.readJobs(args.jobFile)
+    results = driver.run(jobs)
+    driver.writeResults(args.resultFile, jobs, results)
+
+
+if __name__ == "__main__":
+
+    # Replay the closed loops
+    main()
@@ -0,0 +1,138 @@
+import numpy as np
+
+
+class RhoFreeCtrl(object):
+
+    def __init__(self, matH, qMat, aTccMat, qy2):
+        """Initialization of rho free control class.
+
+        This class holds the matrices of control law that do not depend on
+        the penality of motion (rho), so that the control can be re-tuned by
+        rho without rebuilding them.
+
+        Cost function: J = x.T * Q * x + rho * u.T * H * u.
+
+        H is diagonal (authority**2), so H^(-1/2) * Q * H^(-1/2) = V * L *
+        V.T is diagonalized once. Then F = inv(rho**2 * H + Q) = H^(-1/2) *
+        V * inv(rho**2 + L) * V.T * H^(-1/2) for any rho.
+
+        Parameters
+        ----------
+        matH : numpy.ndarray
+            Matrix H used in the cost function.
+        qMat : numpy.ndarray
+            Q matrix used in cost functin.
+        aTccMat : numpy.ndarray
+            A.T * C.T * C of each field point in the image quality weighting
+            ratio. The arrangement is (field #, dof #, zn #).
+        qy2 : numpy.ndarray
+            sum_{wi * A.T * C.T * C * y2k}, which is the part of Qx without
+            the optical state.
+        """
+
+        self.matH = matH
+        self.qMat = qMat
+        self.aTccMat = aTccMat
+        self.qy2 = qy2.reshape(-1, 1)
+
+        for mat in (self.matH, self.qMat, self.aTccMat, self.qy2):
+            mat.setflags(write=False)
+
+        # Eigendecomposition of H^(-1/2) * Q * H^(-1/2), which is calculated
+        # at the first use
+        self._eigVal = None
+        self._eigVec = None
+
+    def calcQx(self, optSt):
+        """Calculate the Qx.
+
+        Qx = sum_{wi * A.T * C.T * C * (A * yk + y2k)} = Q * yk + qy2.
+
+        Parameters
+        ----------
+        optSt : numpy.ndarray
+            Optical state in the basis of degree of freedom (DOF). The
+            optical states of a batch are the columns.
+
+        Returns
+        -------
+        numpy.ndarray
+            qx array.
+        """
+
+        optSt = np.array(optSt, dtype=float).reshape(len(self.qMat), -1)
+
+        return self.qMat.dot(optSt) + self.qy2
+
+    def getEigen(self):
+        """Get the eigendecomposition of H^(-1/2) * Q * H^(-1/2).
+
+        Returns
+        -------
+        numpy.ndarray
+            Eigenvalues.
+        numpy.ndarray
+            Eigenvectors in the columns.
+        """
+
+        if (self._eigVal is None):
+            invSqrtH = self._getInvSqrtHdiag()
+            scaledQ = invSqrtH.reshape(-1, 1) * self.qMat * invSqrtH
+            eigVal, eigVec = np.linalg.eigh(scaledQ)
+
+            eigVal.setflags(write=False)
+            eigVec.setflags(write=False)
+            self._eigVal, self._eigVec = eigVal, eigVec
+
+        return self._eigVal, self._eigVec
+
+    def _getInvSqrtHdiag(self):
+        """Get the diagonal of H^(-1/2).
+
+        Returns
+        -------
+        numpy.ndarray
+            Diagonal of H^(-1/2).
+        """
+
+        return 1 / np.sqrt(np.diag(self.matH))
+
+    def solve(self, qx, rhos, stateDiff=None):
+        """Apply the F matrix of each rho on the qx array.
+
+        For the reference of "0" and "x00", qx + rho**2 * H * S is used,
+        where S is the state difference.
+
+        Parameters
+        ----------
+        qx : numpy.ndarray
+            qx array. The arrangement is (dof #, batch #).
+        rhos : numpy.ndarray or list
+            Penalities of motion.
+        stateDiff : numpy.ndarray, optional
+            State difference S. The arrangement is (dof #, batch #). (the
+            default is None.)
+
+        Returns
+        -------
+        numpy.ndarray
+            F * qx of each rho. The arrangement is (rho #, dof #, batch #).
+        """
+
+        eigVal, eigVec = self.getEigen()
+        invSqrtH = self._getInvSqrtHdiag().reshape(-1, 1)
+
+        rhoSq = np.asarray(rhos, dtype=float).reshape(-1, 1, 1)**2
+
+        # Project to the eigenvectors: V.T * H^(-1/2) * (qx + rho**2 * H * S)
+        proj = eigVec.T.dot(invSqrtH * qx)
+        if (stateDiff is not None):
+            proj = proj + rhoSq * eigVec.T.dot(stateDiff / invSqrtH)
+
+        scaledProj = proj / (rhoSq + eigVal.reshape(1, -1, 1))
+
+        return invSqrtH * np.matmul(eigVec, scaledProj)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,201 @@
+import sys
+import time
+import contextlib
+import numpy as np
+
+
+class StageTimer(object):
+
+    # Edges of histogram bins of wall time in second. There are four bins in
+    # each decade from 1 us to 10 sec.
+    BIN_EDGES_IN_SEC = np.logspace(-6, 1, 29)
+
+    def __init__(self):
+        """Initialization of stage timer class.
+
+        The timer records the wall time and number of allocated memory
+        blocks of each stage (e.g. estimate, control, rotate) in the
+        in-memory histograms. It is disabled by default, and measure()
+        returns a shared null context in that case.
+        """
+
+        self._enabled = False
+        self._callback = None
+        self._traceAlloc = False
+
+        self._stats = dict()
+
+        self._nullContext = contextlib.nullcontext()
+
+    def enable(self, callback=None, traceAlloc=False):
+        """Enable the timer.
+
+        Parameters
+        ----------
+        callback : function, optional
+            Function called at the end of each stage with the arguments of
+            stage name, wall time in second, and the change of number of
+            allocated memory blocks (0 if the allocation is not traced).
+            (the default is None.)
+        traceAlloc : bool, optional
+            Trace the number of allocated memory blocks or not. (the default
+            is False.)
+        """
+
+        self._enabled = True
+        self._callback = callback
+        self._traceAlloc = traceAlloc
+
+    def disable(self):
+        """Disable the timer. The recorded statistics are kept."""
+
+        self._enabled = False
+        self._callback = None
+        self._traceAlloc = False
+
+    def isEnabled(self):
+        """The timer is enabled or not.
+
+        Returns
+        -------
+        bool
+            True if the timer is enabled.
+        """
+
+        return self._enabled
+
+    def measure(self, stageName):
+        """Measure the stage in the "with" statement.
+
+        Parameters
+        ----------
+        stageName : str
+            Stage name.
+
+        Returns
+        -------
+        obj
+            Context manager of the measurement.
+        """
+
+        if self._enabled:
+            return _StageMeasurement(self, stageName, self._traceAlloc)
+        else:
+            return self._nullContext
+
+    def record(self, stageName, timeInSec, allocBlocks=0):
+        """Record the measurement of stage.
+
+        Parameters
+        ----------
+        stageName : str
+            Stage name.
+        timeInSec : float
+            Wall time in second.
+        allocBlocks : int, optional
+            Change of number of allocated memory blocks. (the default is 0.)
+        """
+
+        stat = self._stats.get(stageName)
+        if (stat is None):
+            stat = {"count": 0, "totalTimeInSec": 0.0, "maxTimeInSec": 0.0,
+                    "totalAllocBlocks": 0,
+                    "hist": np.zeros(len(self.BIN_EDGES_IN_SEC) + 1,
+                                     dtype=int)}
+            self._stats[stageName] = stat
+
+        stat["count"] += 1
+        stat["totalTimeInSec"] += timeInSec
+        stat["maxTimeInSec"] = max(stat["maxTimeInSec"], timeInSec)
+        stat["totalAllocBlocks"] += allocBlocks
+        stat["hist"][np.searchsorted(self.BIN_EDGES_IN_SEC, timeInSec)] += 1
+
+        if (self._callback is not None):
+            self._callback(stageName, timeInSec, allocBlocks)
+
+    def getStats(self):
+        """Get the statistics of stages.
+
+        The histogram has one more bin than the bin edges. The first bin
+        counts the time below the first edge and the last bin counts the
+        time above the last edge.
+
+        Returns
+        -------
+        dict
+            Statistics of each stage with the keys of "count",
+            "totalTimeInSec", "meanTimeInSec", "maxTimeInSec",
+            "totalAllocBlocks", and "hist".
+        """
+
+        stats = dict()
+        for stageName, stat in self._stats.items():
+            stats[stageName] = dict(stat, hist=stat["hist"].copy(),
+                                    meanTimeInSec=(stat["totalTimeInSec"] /
+                                                   stat["count"]))
+
+        return stats
+
+    def getBinEdgesInSec(self):
+        """Get the edges of histogram bins of wall time.
+
+        Returns
+        -------
+        numpy.ndarray
+            Edges of histogram bins in second.
+        """
+
+        return self.BIN_EDGES_IN_SEC.copy()
+
+    def reset(self):
+        """Reset the recorded statistics."""
+
+        self._stats = dict()
+
+
+class _StageMeasurement(object):
+
+    def __init__(self, stageTimer, stageName, traceAlloc):
+        """Initialization of measurement of one stage.
+
+        Parameters
+        ----------
+        stageTimer : StageTimer
+            Stage timer to record the measurement.
+        stageName : str
+            Stage name.
+        traceAlloc : bool
+            Trace the number of allocated memory blocks or not.
+        """
+
+        self._stageTimer = stageTimer
+        self._stageName = stageName
+        self._traceAlloc = traceAlloc
+
+        self._startTime = 0.0
+        self._startBlocks = 0
+
+    def __enter__(self):
+
+        if self._traceAlloc:
+            self._startBlocks = sys.getallocatedblocks()
+        self._startTime = time.perf_counter()
+
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+
+        timeInSec = time.perf_counter() - self._startTime
+
+        allocBlocks = 0
+        if self._traceAlloc:
+            allocBlocks = sys.getallocatedblocks() - self._startBlocks
+
+        self._stageTimer.record(self._stageName, timeInSec,
+                                allocBlocks=allocBlocks)
+
+        return False
+
+
+if __name__ == "__main__":
+    pass
@@ -1,5 +1,6 @@
 import os
 import re
+import hashlib
 from enum import Enum
 import lsst.ts.ofc
 
@@ -75,6 +76,49 @@ def getMatchFilePath(reMatchStr, filePaths):
     return matchFilePath
 
 
+def getBinFilePath(filePath, binDirName="binData"):
+    """Get the path of binary (.npy) companion file of the text matrix file.
+
+    The binary file is in the sub-directory of text file, so that it will
+    not be matched by the regular expression of file name in the same
+    directory.
+
+    Parameters
+    ----------
+    filePath : str
+        Text matrix file path.
+    binDirName : str, optional
+        Name of binary data directory. (the default is "binData".)
+
+    Returns
+    -------
+    str
+        Binary companion file path.
+    """
+
+    dirPath, fileName = os.path.split(filePath)
+
+    return os.path.join(dirPath, binDirName, fileName + ".npy")
+
+
+def calcFileChecksum(filePath):
+    """Calculate the SHA-256 checksum of file.
+
+    Parameters
+    ----------
+    filePath : str
+        File path.
+
+    Returns
+    -------
+    str
+        Hexadecimal checksum.
+    """
+
+    with open(filePath, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
 def getModulePath(module=lsst.ts.ofc, startIdx=1, endIdx=-4):
     """Get the path of module.
 
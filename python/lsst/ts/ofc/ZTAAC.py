@@ -3,6 +3,8 @@ import numpy as np
 from lsst.ts.wep.Utility import FilterType
 
 from lsst.ts.ofc.Utility import DofGroup
+from lsst.ts.ofc.CamRot import CamRot
+from lsst.ts.ofc.StageTimer import StageTimer
 
 
 class ZTAAC(object):
@@ -29,6 +31,13 @@ class ZTAAC(object):
         self.defaultGain = 0
         self.fwhmThresholdInArcsec = 0
 
+        self.stageTimer = StageTimer()
+
+        # Wavefront sensors and the maximum number of dropped sensors to
+        # precompute the pseudo-inversed sensitivity matrices
+        self._pinvAsensorNameList = None
+        self._pinvAmaxNumOfDrop = None
+
     def config(self, filterType=None, defaultGain=0.7,
                fwhmThresholdInArcsec=0.2):
         """Do the configuration of Zernike to actuator adjustment calculator
@@ -53,6 +62,102 @@ class ZTAAC(object):
         self.defaultGain = defaultGain
         self.fwhmThresholdInArcsec = fwhmThresholdInArcsec
 
+    def reloadConfig(self):
+        """Reload the configuration files of data.
+
+        The cached compiled control and pseudo-inversed sensitivity matrix
+        are cleared because they depend on the configuration files.
+        """
+
+        self.dataShare.reload()
+
+        self.optStateEsti.clearPinvAcache()
+        self.optCtrl.clearCompiledCtrlCache()
+
+        self._precomputePinvAofSensors()
+
+    def precomputePinvA(self, sensorNameList, maxNumOfDrop=2):
+        """Precompute the pseudo-inversed sensitivity matrices of the
+        wavefront sensors and the subsets without some sensors.
+
+        The visit that rejects some wavefront sensors (e.g. the poor donuts)
+        reuses the precomputed matrix and costs the same as the nominal
+        one. The sensors in the visit should keep the order in this list.
+        The matrices are precomputed again after the reloadConfig() and
+        setZkAndDofInGroups().
+
+        Parameters
+        ----------
+        sensorNameList : list[str]
+            List of abbreviated sensor names of all the wavefront sensors.
+        maxNumOfDrop : int, optional
+            Maximum number of dropped sensors. All the subsets with enough
+            equations are used if it is None. (the default is 2.)
+
+        Returns
+        -------
+        int
+            Number of precomputed pseudo-inversed matrices.
+
+        Raises
+        ------
+        ValueError
+            Too many subsets of sensors (see OptStateEsti.precomputePinvA()).
+        """
+
+        fieldIdx = self.dataShare.getFieldIdx(sensorNameList)
+        numOfPinvA = self.optStateEsti.precomputePinvA(
+            self.dataShare, fieldIdx, maxNumOfDrop=maxNumOfDrop)
+
+        self._pinvAsensorNameList = list(sensorNameList)
+        self._pinvAmaxNumOfDrop = maxNumOfDrop
+
+        return numOfPinvA
+
+    def _precomputePinvAofSensors(self):
+        """Precompute the pseudo-inversed sensitivity matrices of the
+        wavefront sensors set by precomputePinvA().
+
+        Returns
+        -------
+        int
+            Number of precomputed pseudo-inversed matrices.
+        """
+
+        if (self._pinvAsensorNameList is None):
+            return 0
+
+        fieldIdx = self.dataShare.getFieldIdx(self._pinvAsensorNameList)
+
+        return self.optStateEsti.precomputePinvA(
+            self.dataShare, fieldIdx, maxNumOfDrop=self._pinvAmaxNumOfDrop)
+
+    def setStageTimer(self, stageTimer):
+        """Set the stage timer.
+
+        The stage timer can be shared with the other calculators to collect
+        the timing of whole pipeline.
+
+        Parameters
+        ----------
+        stageTimer : StageTimer
+            Stage timer to record the wall time of stages ("estimate",
+            "control", "rotate", "aggregate", and "gainByPSSN").
+        """
+
+        self.stageTimer = stageTimer
+
+    def getStageTimer(self):
+        """Get the stage timer.
+
+        Returns
+        -------
+        StageTimer
+            Stage timer. It is disabled by default.
+        """
+
+        return self.stageTimer
+
     def mapSensorIdToName(self, sensorIdList):
         """Map the list of sensor Id to sensor name.
 
@@ -184,15 +289,17 @@ class ZTAAC(object):
             FWHM in atmosphere. (the default is 0.6.)
         """
 
-        fieldIdx = self.dataShare.getFieldIdx(sensorNameList)
-        fwhmGq = self.optCtrl.calcEffGQFWHM(self.dataShare, pssn, fieldIdx)
+        with self.stageTimer.measure("gainByPSSN"):
+            fieldIdx = self.dataShare.getFieldIdx(sensorNameList)
+            fwhmGq = self.optCtrl.calcEffGQFWHM(self.dataShare, pssn,
+                                                fieldIdx)
 
-        if (fwhmGq > self.fwhmThresholdInArcsec):
-            gainToUse = 1
-        else:
-            gainToUse = self.defaultGain
+            if (fwhmGq > self.fwhmThresholdInArcsec):
+                gainToUse = 1
+            else:
+                gainToUse = self.defaultGain
 
-        self.setGain(gainToUse)
+            self.setGain(gainToUse)
 
     def getGainInUse(self):
         """Get the gain value used in the Optimal Control.
@@ -271,11 +378,143 @@ class ZTAAC(object):
             Calculated uk in the basis of degree of freedom (DOF).
         """
 
+        with self.stageTimer.measure("estimate"):
+            fieldIdx = self.dataShare.getFieldIdx(sensorNameList)
+            optSt = self.optStateEsti.estiOptState(
+                self.dataShare, self.filterType, wfErr, fieldIdx)
+
+        with self.stageTimer.measure("control"):
+            uk = self.optCtrl.estiUkWithGain(self.dataShare, self.filterType,
+                                             optSt)
+
+        return uk
+
+    def estiUkWithGainBatch(self, wfErr, sensorNameList, filterTypes=None,
+                            gains=None, rotAngsInDeg=None):
+        """Estimate uk with gain compensation for a stack of visits.
+
+        The visits are the consecutive iterations of closed loop starting
+        from the current state. The optical states of all the visits are
+        estimated by the stacked matrix products against the cached
+        pseudo-inversed sensitivity matrix. If the reference is "x0" and
+        there is no rotation, uk of all the visits are solved at once.
+        Otherwise, the visits are processed sequentially: uk of each visit
+        is rotated and aggregated in the state of next visit, and this
+        recurrence is vectorized across the independent runs. The state of
+        this class is not changed.
+
+        Parameters
+        ----------
+        wfErr : numpy.ndarray
+            Wavefront error. The arrangement is (visit #, sensor #, zk #) or
+            (run #, visit #, sensor #, zk #).
+        sensorNameList : list[str]
+            List of abbreviated sensor names.
+        filterTypes : list[enum 'FilterType'], optional
+            Active filter type of each visit. The active filter of this class
+            is used if it is None. (the default is None.)
+        gains : numpy.ndarray or list, optional
+            Gain value of each visit. The gain value in use is used if it is
+            None. (the default is None.)
+        rotAngsInDeg : numpy.ndarray or list, optional
+            Camera rotation angle in degree of each visit. There is no
+            rotation if it is None. (the default is None.)
+
+        Returns
+        -------
+        numpy.ndarray
+            Calculated uk in the basis of degree of freedom (DOF). The
+            arrangement is (visit #, dof #) or (run #, visit #, dof #) based
+            on the input wavefront error.
+
+        Raises
+        ------
+        ValueError
+            Number of filter types, gains, or rotation angles is not the
+            number of visits.
+        ValueError
+            Gain is not in the range of [0, 1].
+        """
+
+        wfErr = np.asarray(wfErr, dtype=float)
+        isSingleRun = (wfErr.ndim == 3)
+        if isSingleRun:
+            wfErr = wfErr[np.newaxis, :]
+
+        numOfRun, numOfVisit, numOfSensor, numOfZk = wfErr.shape
+
+        if (filterTypes is None):
+            filterTypes = [self.filterType] * numOfVisit
+
+        if (gains is None):
+            gains = np.ones(numOfVisit) * self.getGainInUse()
+        gains = np.asarray(gains, dtype=float).reshape(-1)
+
+        for name, values in (("filter types", filterTypes), ("gains", gains),
+                             ("rotation angles", rotAngsInDeg)):
+            if (values is not None) and (len(values) != numOfVisit):
+                raise ValueError("Number of %s is not the number of visits."
+                                 % name)
+
+        if np.any(gains < 0) or np.any(gains > 1):
+            raise ValueError("Gain is not in the range of [0, 1].")
+
+        # Visit indexes of each filter type
+        visitIdxOfFilter = dict()
+        for visitIdx, filterType in enumerate(filterTypes):
+            visitIdxOfFilter.setdefault(filterType, []).append(visitIdx)
+
+        # Estimate the optical states of all the visits
         fieldIdx = self.dataShare.getFieldIdx(sensorNameList)
-        optSt = self.optStateEsti.estiOptState(self.dataShare, self.filterType,
-                                               wfErr, fieldIdx)
-        uk = self.optCtrl.estiUkWithGain(self.dataShare, self.filterType,
-                                         optSt)
+        dofIdx = self.dataShare.getDofIdx()
+        optSt = np.zeros((numOfRun, numOfVisit, len(dofIdx)))
+        for filterType, visitIdx in visitIdxOfFilter.items():
+            wfErrOfFilter = wfErr[:, visitIdx].reshape(-1, numOfSensor,
+                                                       numOfZk)
+            optStOfFilter = self.optStateEsti.estiOptStateBatch(
+                self.dataShare, filterType, wfErrOfFilter, fieldIdx)
+            optSt[:, visitIdx] = optStOfFilter.reshape(numOfRun,
+                                                       len(visitIdx), -1)
+
+        uk = np.zeros((numOfRun, numOfVisit, len(dofIdx)))
+        if (self.dataShare.getXref() == "x0") and (rotAngsInDeg is None):
+            for filterType, visitIdx in visitIdxOfFilter.items():
+                ukOfFilter = self.optCtrl.estiUkWithoutGainBatch(
+                    self.dataShare, filterType,
+                    optSt[:, visitIdx].reshape(-1, len(dofIdx)))
+                uk[:, visitIdx] = ukOfFilter.reshape(numOfRun, len(visitIdx),
+                                                     -1)
+            uk *= gains.reshape(1, -1, 1)
+
+        else:
+            # The state recurrence runs on a copy of the state
+            stateIdx = np.arange(self.optCtrl.getNumOfState0())
+            stateInDof = np.tile(self.optCtrl.getState(stateIdx),
+                                 (numOfRun, 1))
+
+            camRot = CamRot()
+            for visitIdx in range(numOfVisit):
+                ukOfVisit = gains[visitIdx] * \
+                    self.optCtrl.estiUkWithoutGainBatch(
+                        self.dataShare, filterTypes[visitIdx],
+                        optSt[:, visitIdx], stateInDof=stateInDof)
+
+                if (rotAngsInDeg is not None):
+                    rotMats = camRot.getDofRotMats(
+                        np.full(numOfRun, rotAngsInDeg[visitIdx]),
+                        m2TiltXYinArcsec=np.transpose(self._getTiltXY(
+                            DofGroup.M2HexPos, stateInDof=stateInDof)),
+                        m1m3TiltXYinArcsec=np.transpose(self._getTiltXY(
+                            DofGroup.M1M3Bend, stateInDof=stateInDof)))
+                    ukOfVisit = np.einsum(
+                        "nij,nj->ni", rotMats[:, dofIdx][:, :, dofIdx],
+                        ukOfVisit)
+
+                stateInDof[:, dofIdx] += ukOfVisit
+                uk[:, visitIdx] = ukOfVisit
+
+        if isSingleRun:
+            uk = uk[0]
 
         return uk
 
@@ -288,8 +527,9 @@ class ZTAAC(object):
             Calculated DOF.
         """
 
-        dofIdx = self.dataShare.getDofIdx()
-        self.optCtrl.aggState(calcDof, dofIdx)
+        with self.stageTimer.measure("aggregate"):
+            dofIdx = self.dataShare.getDofIdx()
+            self.optCtrl.aggState(calcDof, dofIdx)
 
     def getGroupDof(self, dofGroup, inputDof=None):
         """Get the degree of freedom (DOF) of specific group.
@@ -344,6 +584,8 @@ class ZTAAC(object):
                                            m1m3Bend=m1m3Bend,
                                            m2Bend=m2Bend)
 
+        self._precomputePinvAofSensors()
+
     def rotUk(self, camRot, uk):
         """Rotate uk based on the camera rotation angle.
 
@@ -365,22 +607,47 @@ class ZTAAC(object):
             Order of DofGroup and DOF are different.
         """
 
-        dof = self._transUkToDof(uk)
-        dofOrder = [DofGroup.M2HexPos, DofGroup.CamHexPos, DofGroup.M1M3Bend,
-                    DofGroup.M2Bend]
+        with self.stageTimer.measure("rotate"):
+            dofIdx = np.arange(self.optCtrl.getNumOfState0())
+            stateInDof = self.optCtrl.getState(dofIdx)
 
-        rotDof = []
-        for dofGroup, dofItemInOrder in zip(DofGroup, dofOrder):
-            if (dofGroup != dofItemInOrder):
-                raise ValueError("Order of DofGroup and DOF are different.")
+            rotUk = self._rotUkByState(camRot, uk, stateInDof)
 
-            dofOfGroup = self.getGroupDof(dofGroup, inputDof=dof)
-            tiltXYinArcsec = self._getTiltXY(dofGroup)
-            rotDofOfGroup = camRot.rotGroupDof(dofGroup, dofOfGroup,
-                                               tiltXYinArcsec=tiltXYinArcsec)
-            rotDof = np.append(rotDof, rotDofOfGroup)
+        return rotUk
+
+    def _rotUkByState(self, camRot, uk, stateInDof):
+        """Rotate uk based on the camera rotation angle and the tilt angles
+        in the state.
 
-        rotUk = self._transDofToUk(rotDof)
+        Parameters
+        ----------
+        camRot : CamRot
+            Instance of camera rotation class.
+        uk : numpy.ndarray
+            Calculated uk in the basis of degree of freedom (DOF).
+        stateInDof : numpy.ndarray
+            State in DOF of all the elements of state 0.
+
+        Returns
+        -------
+        numpy.ndarray
+            Rotated uk.
+
+        Raises
+        ------
+        ValueError
+            Order of DofGroup and DOF are different.
+        """
+
+        rotMat = camRot.getDofRotMat(
+            m2TiltXYinArcsec=self._getTiltXY(DofGroup.M2HexPos,
+                                             stateInDof=stateInDof),
+            m1m3TiltXYinArcsec=self._getTiltXY(DofGroup.M1M3Bend,
+                                               stateInDof=stateInDof))
+
+        # Only the rows and columns of DOF in use are needed
+        dofIdx = self.dataShare.getDofIdx()
+        rotUk = rotMat[np.ix_(dofIdx, dofIdx)].dot(uk)
 
         return rotUk
 
@@ -424,7 +691,7 @@ class ZTAAC(object):
 
         return dof
 
-    def _getTiltXY(self, dofGroup):
+    def _getTiltXY(self, dofGroup, stateInDof=None):
         """Get the relative tilt angle XY in arcsec compared with the camera
         hexapod.
 
@@ -432,19 +699,26 @@ class ZTAAC(object):
         ----------
         dofGroup : enum 'DofGroup'
             Degree of freedom (DOF) group.
+        stateInDof : numpy.ndarray, optional
+            State in DOF of all the elements of state 0. The states can be
+            stacked in the leading axes. The state in optimal control is
+            used if it is None. (the default is None.)
 
         Returns
         -------
         tuple
-            Tilt angle (x, y) in arcsec.
+            Tilt angle (x, y) in arcsec. The items are the arrays of the
+            leading axes of stacked states.
         """
 
-        dofIdx = np.arange(self.optCtrl.getNumOfState0())
-        stateInDof = self.optCtrl.getState(dofIdx)
-        m2PosRx = stateInDof[3]
-        m2PosRy = stateInDof[4]
-        camPosRx = stateInDof[8]
-        camPosRy = stateInDof[9]
+        if (stateInDof is None):
+            dofIdx = np.arange(self.optCtrl.getNumOfState0())
+            stateInDof = self.optCtrl.getState(dofIdx)
+
+        m2PosRx = stateInDof[..., 3]
+        m2PosRy = stateInDof[..., 4]
+        camPosRx = stateInDof[..., 8]
+        camPosRy = stateInDof[..., 9]
 
         if dofGroup in (DofGroup.M2HexPos, DofGroup.M2Bend):
             tiltXYinArcsec = (m2PosRx-camPosRx, m2PosRy-camPosRy)
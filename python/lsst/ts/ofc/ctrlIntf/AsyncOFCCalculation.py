@@ -0,0 +1,376 @@
+import time
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from lsst.ts.ofc.StageTimer import StageTimer
+
+
+class _Request(object):
+
+    def __init__(self, name, func, args, kwargs, future):
+        """Request of the calculation in the queue.
+
+        Parameters
+        ----------
+        name : str
+            Request name used in the metrics.
+        func : function
+            Function to call in the executor.
+        args : tuple
+            Positional arguments of function.
+        kwargs : dict
+            Keyword arguments of function.
+        future : asyncio.Future
+            Future of the returned value of function.
+        """
+
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+
+        self.enqueueTime = time.perf_counter()
+
+
+class AsyncOFCCalculation(object):
+    """Asynchronous front-end of the OFC calculation for the asyncio based
+    commandable SAL component (CSC).
+
+    The requests are put into a bounded queue and run one by one in a
+    dedicated thread, so the numerical calculation does not block the event
+    loop and the calls that change the OFC state are serialized. The queued
+    FWHM updates submitted back to back are coalesced into the latest one.
+    """
+
+    # Request names used in the metrics
+    FWHM_REQUEST_NAME = "setFWHMSensorDataOfCam"
+
+    def __init__(self, ofcCalculation, maxQueueSize=8):
+        """Construct an asynchronous OFC calculation.
+
+        Parameters
+        ----------
+        ofcCalculation : OFCCalculation
+            OFC calculation to wrap. It should only be used through this
+            object after the construction.
+        maxQueueSize : int, optional
+            Maximum number of queued requests. The submission waits if the
+            queue is full. (the default is 8.)
+
+        Raises
+        ------
+        ValueError
+            Maximum queue size should be >= 1.
+        """
+        super().__init__()
+
+        if (int(maxQueueSize) < 1):
+            raise ValueError("Maximum queue size should be >= 1.")
+
+        self.ofcCalculation = ofcCalculation
+
+        self._queue = asyncio.Queue(maxsize=int(maxQueueSize))
+        self._executor = None
+        self._workerTask = None
+
+        # Queued FWHM request that is not started yet
+        self._pendingFwhmRequest = None
+
+        self._numOfCoalesced = 0
+        self._maxQueueDepth = 0
+
+        # Histograms of the waiting time in queue and running time
+        self._waitTimer = StageTimer()
+        self._waitTimer.enable()
+        self._runTimer = StageTimer()
+        self._runTimer.enable()
+
+    async def submit(self, name, func, *args, **kwargs):
+        """Submit the function to run in the calculation thread.
+
+        This can be used to serialize the other calls that change the OFC
+        state, such as ZTAAC.aggState().
+
+        Parameters
+        ----------
+        name : str
+            Request name used in the metrics.
+        func : function
+            Function to call.
+        *args : tuple
+            Positional arguments of function.
+        **kwargs : dict
+            Keyword arguments of function.
+
+        Returns
+        -------
+        obj
+            Returned value of function.
+
+        Raises
+        ------
+        RuntimeError
+            The calculation is stopped.
+        """
+
+        request = await self._enqueue(name, func, args, kwargs)
+
+        return await request.future
+
+    async def _enqueue(self, name, func, args, kwargs, isFwhmUpdate=False):
+        """Put the request into the queue.
+
+        Only the FWHM update that is the last submitted request can be
+        coalesced. Otherwise, the later FWHM data would run before the
+        requests submitted in between.
+
+        Parameters
+        ----------
+        name : str
+            Request name used in the metrics.
+        func : function
+            Function to call.
+        args : tuple
+            Positional arguments of function.
+        kwargs : dict
+            Keyword arguments of function.
+        isFwhmUpdate : bool, optional
+            The request is the FWHM update that can be coalesced or not.
+            (the default is False.)
+
+        Returns
+        -------
+        _Request
+            Queued request.
+
+        Raises
+        ------
+        RuntimeError
+            The calculation is stopped.
+        """
+
+        if (self._executor is None):
+            self._start()
+
+        loop = asyncio.get_running_loop()
+        request = _Request(name, func, args, kwargs, loop.create_future())
+
+        # Track the submission order before waiting for the space in queue
+        self._pendingFwhmRequest = request if isFwhmUpdate else None
+
+        await self._queue.put(request)
+        self._maxQueueDepth = max(self._maxQueueDepth, self._queue.qsize())
+
+        return request
+
+    def _start(self):
+        """Start the calculation thread and the worker task.
+
+        Raises
+        ------
+        RuntimeError
+            The calculation is stopped.
+        """
+
+        if (self._workerTask is not None):
+            raise RuntimeError("The calculation is stopped.")
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ofcCalculation")
+        self._workerTask = asyncio.get_running_loop().create_task(
+            self._runRequests())
+
+    async def _runRequests(self):
+        """Run the queued requests one by one in the calculation thread."""
+
+        loop = asyncio.get_running_loop()
+        while True:
+            request = await self._queue.get()
+            if (request is None):
+                break
+
+            if (request is self._pendingFwhmRequest):
+                self._pendingFwhmRequest = None
+
+            if request.future.cancelled():
+                continue
+
+            startTime = time.perf_counter()
+            self._waitTimer.record(request.name,
+                                   startTime - request.enqueueTime)
+
+            # Wait without raising the exception of function. Otherwise, the
+            # traceback holds the frame of this task and the caller that
+            # clears the frames of traceback would close this task.
+            executorFuture = loop.run_in_executor(
+                self._executor, functools.partial(
+                    request.func, *request.args, **request.kwargs))
+            await asyncio.wait([executorFuture])
+
+            self._runTimer.record(request.name,
+                                  time.perf_counter() - startTime)
+
+            if request.future.cancelled():
+                continue
+
+            exception = executorFuture.exception()
+            if (exception is None):
+                request.future.set_result(executorFuture.result())
+            else:
+                request.future.set_exception(exception)
+
+    async def stop(self):
+        """Finish the queued requests and stop the calculation thread.
+
+        The calculation can not be used after the stop.
+        """
+
+        if (self._executor is None):
+            return
+
+        await self._queue.put(None)
+        await self._workerTask
+
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    async def setFWHMSensorDataOfCam(self, listOfFWHMSensorData):
+        """Set the list of FWHMSensorData of each CCD of camera.
+
+        If the last submitted request is a FWHM update that is not started
+        yet, it is replaced by this one and both calls wait for the same
+        update.
+
+        Parameters
+        ----------
+        listOfFWHMSensorData : list [FWHMSensorData]
+            List of FWHMSensorData which contains the sensor Id and FWHM data.
+        """
+
+        request = self._pendingFwhmRequest
+        if (request is not None) and (not request.future.cancelled()):
+            request.args = (listOfFWHMSensorData,)
+            self._numOfCoalesced += 1
+        else:
+            request = await self._enqueue(
+                self.FWHM_REQUEST_NAME,
+                self.ofcCalculation.setFWHMSensorDataOfCam,
+                (listOfFWHMSensorData,), dict(), isFwhmUpdate=True)
+
+        await asyncio.shield(request.future)
+
+    async def calculateCorrections(self, listOfWfErr):
+        """Calculate the Hexapod, M1M3, and M2 corrections from the FWHM
+        and wavefront error.
+
+        Parameters
+        ----------
+        listOfWfErr : list [SensorWavefrontError]
+            The list of wavefront error of each sensor for an exposure.
+
+        Returns
+        -------
+        CameraHexapodCorrection
+            The position offset for the MT Hexapod.
+        M2HexapodCorrection
+            The position offset for the MT M2 Hexapod.
+        M1M3Correction
+            The figure offset for the MT M1M3.
+        M2Correction
+            The figure offset for the MT M2.
+        """
+
+        return await self.submit("calculateCorrections",
+                                 self.ofcCalculation.calculateCorrections,
+                                 listOfWfErr)
+
+    async def resetOfcState(self):
+        """Reset the OFC calculation state, which is the aggregated DOF now.
+
+        Returns
+        -------
+        CameraHexapodCorrection
+            The position offset for the MT Hexapod.
+        M2HexapodCorrection
+            The position offset for the MT M2 Hexapod.
+        M1M3Correction
+            The figure offset for the MT M1M3.
+        M2Correction
+            The figure offset for the MT M2.
+        """
+
+        return await self.submit("resetOfcState",
+                                 self.ofcCalculation.resetOfcState)
+
+    async def setFilter(self, filterType):
+        """Set the current filter.
+
+        Parameters
+        ----------
+        filterType : FilterType
+            The new filter configuration to use for OFC data processing.
+        """
+
+        await self.submit("setFilter", self.ofcCalculation.setFilter,
+                          filterType)
+
+    async def setRotAng(self, rotAngInDeg):
+        """Set the camera rotation angle in degree.
+
+        Parameters
+        ----------
+        rotAngInDeg : float
+            The camera rotation angle in degree (-90 to 90).
+        """
+
+        await self.submit("setRotAng", self.ofcCalculation.setRotAng,
+                          rotAngInDeg)
+
+    async def setGainByUser(self, gainByUser=-1):
+        """Set the gain value by the user.
+
+        Parameters
+        ----------
+        gainByUser : float, optional
+            The gain value by the user. This value should be in (0, 1). The
+            default value is -1, which means the gain value will be decided by
+            the PSSN. (the default is -1.)
+        """
+
+        await self.submit("setGainByUser", self.ofcCalculation.setGainByUser,
+                          gainByUser)
+
+    def getQueueDepth(self):
+        """Get the number of queued requests.
+
+        Returns
+        -------
+        int
+            Number of queued requests.
+        """
+
+        return self._queue.qsize()
+
+    def getMetrics(self):
+        """Get the metrics of request queue.
+
+        Returns
+        -------
+        dict
+            Metrics with the keys of "queueDepth", "maxQueueDepth",
+            "numOfCoalesced", "waitTime", and "runTime". The waitTime and
+            runTime are the statistics of each request name in second (see
+            StageTimer.getStats()).
+        """
+
+        return {"queueDepth": self.getQueueDepth(),
+                "maxQueueDepth": self._maxQueueDepth,
+                "numOfCoalesced": self._numOfCoalesced,
+                "waitTime": self._waitTimer.getStats(),
+                "runTime": self._runTimer.getStats()}
+
+
+if __name__ == "__main__":
+    pass
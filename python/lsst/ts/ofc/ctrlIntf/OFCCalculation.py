@@ -2,6 +2,7 @@ import numpy as np
 
 from lsst.ts.wep.Utility import FilterType
 
+from lsst.ts.ofc.StageTimer import StageTimer
 from lsst.ts.ofc.ctrlIntf.CameraHexapodCorrection import CameraHexapodCorrection
 from lsst.ts.ofc.ctrlIntf.M2HexapodCorrection import M2HexapodCorrection
 from lsst.ts.ofc.ctrlIntf.M1M3Correction import M1M3Correction
@@ -39,6 +40,33 @@ class OFCCalculation(object):
         self.dofFromLastVisit = np.zeros(50)
         self.dofAgg = np.zeros(50)
 
+        self.stageTimer = StageTimer()
+
+    def setStageTimer(self, stageTimer):
+        """Set the stage timer.
+
+        Share the stage timer with the ZTAAC to collect the per-stage timing
+        of the whole calculation.
+
+        Parameters
+        ----------
+        stageTimer : StageTimer
+            Stage timer to record the wall time of stages.
+        """
+
+        self.stageTimer = stageTimer
+
+    def getStageTimer(self):
+        """Get the stage timer.
+
+        Returns
+        -------
+        StageTimer
+            Stage timer. It is disabled by default.
+        """
+
+        return self.stageTimer
+
     def setFWHMSensorDataOfCam(self, listOfFWHMSensorData):
         """Set the list of FWHMSensorData of each CCD of camera. 
 
@@ -172,11 +200,13 @@ class OFCCalculation(object):
             The figure offset for the MT M2.
         """
 
-        camHexapodCorrection = CameraHexapodCorrection(0.0, 0.0, 0.0, 0.0, 0.0,
-                                                       0.0)
-        m2HexapodCorrection = M2HexapodCorrection(0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
-        m1m3Correction = M1M3Correction([0.0] * 156)
-        m2Correction = M2Correction([0.0] * 72)
+        with self.stageTimer.measure("calculateCorrections"):
+            camHexapodCorrection = CameraHexapodCorrection(0.0, 0.0, 0.0, 0.0,
+                                                           0.0, 0.0)
+            m2HexapodCorrection = M2HexapodCorrection(0.0, 0.0, 0.0, 0.0, 0.0,
+                                                      0.0)
+            m1m3Correction = M1M3Correction([0.0] * 156)
+            m2Correction = M2Correction([0.0] * 72)
 
         return camHexapodCorrection, m2HexapodCorrection, m1m3Correction, \
                m2Correction
@@ -0,0 +1,172 @@
+import time
+import asyncio
+import unittest
+import numpy as np
+
+from lsst.ts.wep.Utility import FilterType
+
+from lsst.ts.ofc.ctrlIntf.OFCCalculation import OFCCalculation
+from lsst.ts.ofc.ctrlIntf.AsyncOFCCalculation import AsyncOFCCalculation
+from lsst.ts.ofc.ctrlIntf.FWHMToPSSN import FWHMToPSSN
+from lsst.ts.ofc.ctrlIntf.FWHMSensorData import FWHMSensorData
+from lsst.ts.ofc.ctrlIntf.CameraHexapodCorrection import CameraHexapodCorrection
+from lsst.ts.ofc.ctrlIntf.SensorWavefrontError import SensorWavefrontError
+
+
+class TestAsyncOFCCalculation(unittest.IsolatedAsyncioTestCase):
+    """Test the AsyncOFCCalculation class."""
+
+    def setUp(self):
+
+        self.ofcCalculation = OFCCalculation(FWHMToPSSN())
+        self.asyncOfcCalculation = AsyncOFCCalculation(self.ofcCalculation,
+                                                       maxQueueSize=4)
+
+    async def asyncTearDown(self):
+
+        await self.asyncOfcCalculation.stop()
+
+    def testInitWithWrongQueueSize(self):
+
+        self.assertRaises(ValueError, AsyncOFCCalculation,
+                          self.ofcCalculation, maxQueueSize=0)
+
+    async def testCalculateCorrections(self):
+
+        listOfWfErr = [SensorWavefrontError(1, np.ones(19))]
+        corrections = await self.asyncOfcCalculation.calculateCorrections(
+            listOfWfErr)
+
+        self.assertEqual(len(corrections), 4)
+        self.assertTrue(isinstance(corrections[0], CameraHexapodCorrection))
+
+        metrics = self.asyncOfcCalculation.getMetrics()
+        self.assertEqual(metrics["runTime"]["calculateCorrections"]["count"],
+                         1)
+        self.assertEqual(metrics["queueDepth"], 0)
+
+    async def testSetFilterIsSerialized(self):
+
+        await asyncio.gather(
+            self.asyncOfcCalculation.setFilter(FilterType.G),
+            self.asyncOfcCalculation.setRotAng(30),
+            self.asyncOfcCalculation.setGainByUser(0.5),
+            self.asyncOfcCalculation.setFilter(FilterType.R))
+
+        self.assertEqual(self.ofcCalculation.getFilter(), FilterType.R)
+        self.assertEqual(self.ofcCalculation.getRotAng(), 30)
+        self.assertEqual(self.ofcCalculation.gainByUser, 0.5)
+
+    async def testSubmitWithException(self):
+
+        def raiseError():
+            raise ValueError("Wrong value.")
+
+        with self.assertRaises(ValueError):
+            await self.asyncOfcCalculation.submit("raiseError", raiseError)
+
+        # The following requests still run
+        await self.asyncOfcCalculation.setRotAng(10)
+        self.assertEqual(self.ofcCalculation.getRotAng(), 10)
+
+    async def testSubmitDoesNotBlockEventLoop(self):
+
+        numOfTick = 0
+
+        async def tick():
+            nonlocal numOfTick
+            for ii in range(5):
+                await asyncio.sleep(0.01)
+                numOfTick += 1
+
+        sleepTask = asyncio.ensure_future(
+            self.asyncOfcCalculation.submit("sleep", time.sleep, 0.5))
+        await tick()
+
+        # The event loop ticks while the request is still running
+        self.assertEqual(numOfTick, 5)
+        self.assertFalse(sleepTask.done())
+
+        await sleepTask
+
+    async def testSetFWHMSensorDataOfCamWithCoalescing(self):
+
+        # Occupy the calculation thread to keep the FWHM updates in queue
+        busyTask = asyncio.ensure_future(
+            self.asyncOfcCalculation.submit("sleep", time.sleep, 0.1))
+        await asyncio.sleep(0.01)
+
+        updates = []
+        for fwhm in (0.1, 0.2, 0.3):
+            listOfFWHMSensorData = [FWHMSensorData(1, np.ones(3) * fwhm)]
+            updates.append(asyncio.ensure_future(
+                self.asyncOfcCalculation.setFWHMSensorDataOfCam(
+                    listOfFWHMSensorData)))
+            await asyncio.sleep(0)
+
+        self.assertEqual(self.asyncOfcCalculation.getQueueDepth(), 1)
+
+        await asyncio.gather(busyTask, *updates)
+
+        metrics = self.asyncOfcCalculation.getMetrics()
+        self.assertEqual(metrics["numOfCoalesced"], 2)
+        self.assertEqual(
+            metrics["runTime"]["setFWHMSensorDataOfCam"]["count"], 1)
+
+        ans = FWHMToPSSN().convertToPssn(np.ones(3) * 0.3)
+        self.assertAlmostEqual(self.ofcCalculation.pssnArray[0],
+                               np.average(ans))
+
+    async def testSetFWHMSensorDataOfCamInFifoOrder(self):
+
+        seenPssn = []
+
+        def calculateCorrections(listOfWfErr):
+            seenPssn.append(self.ofcCalculation.pssnArray.copy())
+            return self.ofcCalculation.calculateCorrections(listOfWfErr)
+
+        # Occupy the calculation thread to keep the requests in queue
+        busyTask = asyncio.ensure_future(
+            self.asyncOfcCalculation.submit("sleep", time.sleep, 0.1))
+        await asyncio.sleep(0.01)
+
+        listOfWfErr = [SensorWavefrontError(1, np.ones(19))]
+        tasks = []
+        for fwhm in (0.3, 1.0):
+            listOfFWHMSensorData = [FWHMSensorData(1, np.ones(3) * fwhm)]
+            tasks.append(asyncio.ensure_future(
+                self.asyncOfcCalculation.setFWHMSensorDataOfCam(
+                    listOfFWHMSensorData)))
+            await asyncio.sleep(0)
+
+            tasks.append(asyncio.ensure_future(
+                self.asyncOfcCalculation.submit(
+                    "calculateCorrections", calculateCorrections,
+                    listOfWfErr)))
+            await asyncio.sleep(0)
+
+        await asyncio.gather(busyTask, *tasks)
+
+        # The FWHM update is not coalesced across the other request
+        metrics = self.asyncOfcCalculation.getMetrics()
+        self.assertEqual(metrics["numOfCoalesced"], 0)
+
+        fwhmToPssn = FWHMToPSSN()
+        self.assertEqual(len(seenPssn), 2)
+        for pssn, fwhm in zip(seenPssn, (0.3, 1.0)):
+            ans = fwhmToPssn.convertToPssn(np.ones(3) * fwhm)
+            self.assertAlmostEqual(pssn[0], np.average(ans))
+
+    async def testStop(self):
+
+        await self.asyncOfcCalculation.setRotAng(10)
+        await self.asyncOfcCalculation.stop()
+
+        with self.assertRaises(RuntimeError):
+            await self.asyncOfcCalculation.setRotAng(20)
+
+
+if __name__ == "__main__":
+
+    # Run the unit test
+    unittest.main()
@@ -107,6 +107,17 @@ class TestOFCCalculation(unittest.TestCase):
         self.assertTrue(isinstance(m1m3Correction, M1M3Correction))
         self.assertTrue(isinstance(m2Correction, M2Correction))
 
+    def testStageTimer(self):
+
+        stageTimer = self.ofcCalculation.getStageTimer()
+        stageTimer.enable()
+
+        sensorWavefrontError = SensorWavefrontError(1, np.ones(19))
+        self.ofcCalculation.calculateCorrections([sensorWavefrontError])
+
+        stats = stageTimer.getStats()
+        self.assertEqual(stats["calculateCorrections"]["count"], 1)
+
     def testGetStateCorrectionFromLastVisit(self):
 
         stateCorrection = self.ofcCalculation.getStateCorrectionFromLastVisit()
@@ -79,6 +79,90 @@ class TestCamRot(unittest.TestCase):
         self.assertAlmostEqual(rotatedStateInDof[0], 0.70710678)
         self.assertEqual(rotatedStateInDof[2], 2)
 
+    def testGetDofRotMat(self):
+
+        self.camRot.setRotAng(30)
+        m2TiltXYinArcsec = (1224, -300)
+        m1m3TiltXYinArcsec = (20, 50)
+        rotMat = self.camRot.getDofRotMat(
+            m2TiltXYinArcsec=m2TiltXYinArcsec,
+            m1m3TiltXYinArcsec=m1m3TiltXYinArcsec)
+
+        self.assertEqual(rotMat.shape, (50, 50))
+        self.assertFalse(rotMat.flags.writeable)
+
+        dof = np.random.RandomState(seed=1).normal(size=50)
+        rotDof = rotMat.dot(dof)
+
+        tiltXYinArcsecs = (m2TiltXYinArcsec, (0, 0), m1m3TiltXYinArcsec,
+                           m2TiltXYinArcsec)
+        startIdx = 0
+        for dofGroup, tiltXYinArcsec in zip(DofGroup, tiltXYinArcsecs):
+            endIdx = startIdx + (5 if startIdx < 10 else 20)
+            ans = self.camRot.rotGroupDof(dofGroup, dof[startIdx:endIdx],
+                                          tiltXYinArcsec=tiltXYinArcsec)
+            delta = np.max(np.abs(rotDof[startIdx:endIdx] - ans))
+            self.assertLess(delta, 1e-9)
+
+            startIdx = endIdx
+
+    def testGetDofRotMatFromCache(self):
+
+        self.camRot.setRotAng(45)
+        rotMat = self.camRot.getDofRotMat()
+        self.assertIs(self.camRot.getDofRotMat(), rotMat)
+
+        self.camRot.setRotAng(-45)
+        self.assertIsNot(self.camRot.getDofRotMat(), rotMat)
+
+        self.camRot.setRotAng(45)
+        self.camRot.clearDofRotMatCache()
+        self.assertIsNot(self.camRot.getDofRotMat(), rotMat)
+
+    def testGetDofRotMats(self):
+
+        rotAngsInDeg = np.array([-60, 0, 15, 90])
+        m2TiltXYinArcsec = np.array([[1224, -300], [0, 0], [10, 20],
+                                     [-5, 5]])
+        m1m3TiltXYinArcsec = (20, 50)
+        rotMats = self.camRot.getDofRotMats(
+            rotAngsInDeg, m2TiltXYinArcsec=m2TiltXYinArcsec,
+            m1m3TiltXYinArcsec=m1m3TiltXYinArcsec)
+
+        self.assertEqual(rotMats.shape, (4, 50, 50))
+        self.assertEqual(self.camRot.getRotAng(), 0)
+
+        for rotAngInDeg, m2TiltXY, rotMat in zip(rotAngsInDeg,
+                                                 m2TiltXYinArcsec, rotMats):
+            camRot = CamRot(rotAngInDeg=rotAngInDeg)
+            ans = camRot.getDofRotMat(m2TiltXYinArcsec=m2TiltXY,
+                                      m1m3TiltXYinArcsec=m1m3TiltXYinArcsec)
+            self.assertLess(np.max(np.abs(rotMat - ans)), 1e-9)
+
+    def testGetDofRotMatsWithWrongValue(self):
+
+        self.assertRaises(ValueError, self.camRot.getDofRotMats,
+                          [0, 45, 91])
+        self.assertRaises(ValueError, self.camRot.getDofRotMats,
+                          [0, np.nan])
+
+    def testRotDofBatch(self):
+
+        rotAngsInDeg = np.array([-30, 45, 90])
+        dof = np.random.RandomState(seed=1).normal(size=(3, 50))
+
+        rotDof = self.camRot.rotDofBatch(rotAngsInDeg, dof)
+        self.assertEqual(rotDof.shape, (3, 50))
+        for rotAngInDeg, dofOfAng, rotDofOfAng in zip(rotAngsInDeg, dof,
+                                                      rotDof):
+            self.camRot.setRotAng(rotAngInDeg)
+            ans = self.camRot.getDofRotMat().dot(dofOfAng)
+            self.assertLess(np.max(np.abs(rotDofOfAng - ans)), 1e-9)
+
+        rotDof = self.camRot.rotDofBatch(rotAngsInDeg, dof[0])
+        self.assertEqual(rotDof.shape, (3, 50))
+        self.assertAlmostEqual(rotDof[2, 11], dof[0, 10])
+
 
 if __name__ == "__main__":
 
@@ -0,0 +1,57 @@
+import numpy as np
+from scipy.linalg import cho_factor
+import unittest
+
+from lsst.ts.ofc.CompiledCtrl import CompiledCtrl
+
+
+class TestCompiledCtrl(unittest.TestCase):
+    """Test the CompiledCtrl class."""
+
+    def setUp(self):
+
+        matH = np.diag([1.0, 4.0])
+        qMat = np.array([[2.0, 1.0], [1.0, 3.0]])
+        rho = 0.5
+        choFactorOfInvF = cho_factor(rho**2 * matH + qMat)
+        aTccMat = np.ones((3, 2, 4))
+        qy2 = np.array([1.0, -1.0])
+
+        self.compiledCtrl = CompiledCtrl(matH, qMat, choFactorOfInvF,
+                                         aTccMat, qy2, rho)
+
+    def testCalcQx(self):
+
+        qx = self.compiledCtrl.calcQx([1, 2])
+
+        self.assertEqual(qx.shape, (2, 1))
+        self.assertEqual(np.sum(np.abs(qx.ravel() - [5, 6])), 0)
+
+    def testSolve(self):
+
+        qx = self.compiledCtrl.calcQx([1, 2])
+        ans = np.linalg.solve(self.compiledCtrl.rho**2 * self.compiledCtrl.matH
+                              + self.compiledCtrl.qMat, qx)
+
+        delta = np.sum(np.abs(self.compiledCtrl.solve(qx) - ans))
+        self.assertLess(delta, 1e-10)
+
+    def testGetMatF(self):
+
+        matF = self.compiledCtrl.getMatF()
+        ans = np.linalg.inv(self.compiledCtrl.rho**2 * self.compiledCtrl.matH
+                            + self.compiledCtrl.qMat)
+
+        delta = np.sum(np.abs(matF - ans))
+        self.assertLess(delta, 1e-10)
+
+    def testReadOnly(self):
+
+        self.assertFalse(self.compiledCtrl.choFactorOfInvF[0].flags.writeable)
+        self.assertFalse(self.compiledCtrl.qy2.flags.writeable)
+
+
+if __name__ == "__main__":
+
+    # Run the unit test
+    unittest.main()
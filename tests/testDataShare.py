@@ -1,8 +1,11 @@
 import os
+import shutil
+import tempfile
 import unittest
 import numpy as np
 
 from lsst.ts.ofc.DataShare import DataShare
+from lsst.ts.ofc.MatBinConverter import MatBinConverter
 from lsst.ts.ofc.Utility import InstName, DofGroup, getModulePath
 
 
@@ -38,6 +41,60 @@ class TestDataShare(unittest.TestCase):
 
         self.assertEqual(self.dataShare._getZn3Max(), 19)
 
+    def testGetSenMwithCache(self):
+
+        senM = self.dataShare.getSenM()
+        self.assertIs(self.dataShare.getSenM(), senM)
+        self.assertFalse(senM.flags.writeable)
+
+        fullSenM = self.dataShare._getFullSenM()
+        self.assertIs(self.dataShare._getFullSenM(), fullSenM)
+
+        zn3Idx = np.arange(3, 9)
+        dofIdx = np.arange(1, 40, 3)
+        self.dataShare.setZkAndDofIdxArrays(zn3Idx, dofIdx)
+
+        senMsubset = self.dataShare.getSenM()
+        self.assertIsNot(senMsubset, senM)
+        self.assertEqual(senMsubset.shape, (35, 6, 13))
+        self.assertIs(self.dataShare._getFullSenM(), fullSenM)
+
+    def testGetSenMwithMmap(self):
+
+        senM = self.dataShare.getSenM()
+
+        tmpDir = tempfile.mkdtemp()
+        try:
+            configDir = os.path.join(tmpDir, "configData")
+            shutil.copytree(self.configDir, configDir)
+            MatBinConverter().convertFile(
+                os.path.join(configDir, "lsst", "senM_35_19_50.txt"))
+
+            dataShare = DataShare()
+            dataShare.config(configDir, instName=InstName.LSST)
+            dataShare.setSenMmmapMode("r")
+            self.assertEqual(dataShare.getSenMmmapMode(), "r")
+
+            # The contiguous index arrays select a view of the memory map
+            senMinMmap = dataShare.getSenM()
+            self.assertTrue(np.shares_memory(senMinMmap,
+                                             dataShare._getFullSenM()))
+            self.assertEqual(np.sum(np.abs(senMinMmap - senM)), 0)
+
+            zn3Idx = np.arange(3, 9)
+            dofIdx = np.arange(1, 40, 3)
+            self.dataShare.setZkAndDofIdxArrays(zn3Idx, dofIdx)
+            dataShare.setZkAndDofIdxArrays(zn3Idx, dofIdx)
+            self.assertEqual(np.sum(np.abs(dataShare.getSenM() -
+                                           self.dataShare.getSenM())), 0)
+
+            # Release the memory map before removing the file
+            del senMinMmap
+            dataShare.setSenMmmapMode(None)
+
+        finally:
+            shutil.rmtree(tmpDir)
+
     def testComCamSetting(self):
 
         dataShare = DataShare()
@@ -75,6 +132,21 @@ class TestDataShare(unittest.TestCase):
         self.assertRaises(TypeError, self.dataShare.getFieldIdx,
                           sensorNameList)
 
+    def testGetFieldIdxArray(self):
+
+        sensorNameArray = np.array(["R04_S20", "R10_S02", "R04_S20"])
+        fieldIdx = self.dataShare.getFieldIdxArray(sensorNameArray)
+        self.assertTrue(isinstance(fieldIdx, np.ndarray))
+        self.assertEqual(fieldIdx.tolist(), [32, 23, 32])
+
+        fieldIdx = self.dataShare.getFieldIdxArray([])
+        self.assertEqual(len(fieldIdx), 0)
+
+        self.assertRaises(ValueError, self.dataShare.getFieldIdxArray,
+                          ["R04_S20", "R000_S1111"])
+        self.assertRaises(ValueError, self.dataShare.getFieldIdx,
+                          ["R000_S1111"])
+
     def testGetGroupIdxAndLeng(self):
 
         dofGroupList = [DofGroup.M2HexPos, DofGroup.CamHexPos,
@@ -184,6 +256,26 @@ class TestDataShare(unittest.TestCase):
         self.assertEqual(sensorNameList, [])
         self.assertEqual(numOfsensor, 0)
 
+    def testMapSensorIdArrayToName(self):
+
+        sensorIdArray = np.array([1, 2, -1, 3, 4, 10000])
+        sensorNameArray = self.dataShare.mapSensorIdArrayToName(sensorIdArray)
+        self.assertEqual(sensorNameArray.tolist(),
+                         ["R00_S21", "R00_S22", "R01_S00", "R01_S01"])
+
+        sensorNameArray = self.dataShare.mapSensorIdArrayToName([])
+        self.assertEqual(len(sensorNameArray), 0)
+
+    def testMapSensorNameArrayToId(self):
+
+        sensorNameArray = np.array(["R00_S21", "R00_S22", "R01_S00",
+                                    "R01_S01"])
+        sensorIdArray = self.dataShare.mapSensorNameArrayToId(sensorNameArray)
+        self.assertEqual(sensorIdArray.tolist(), [1, 2, 3, 4])
+
+        self.assertRaises(ValueError, self.dataShare.mapSensorNameArrayToId,
+                          ["R00_S21", "R000_S1111"])
+
     def testMapSensorNameToId(self):
 
         sensorNameList = ["R00_S21", "R00_S22", "R01_S00", "R01_S01"]
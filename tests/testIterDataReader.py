@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import unittest
+
+from lsst.ts.ofc.IterDataReader import IterDataReader
+from lsst.ts.ofc.Utility import getModulePath
+
+
+class TestIterDataReader(unittest.TestCase):
+    """Test the IterDataReader class."""
+
+    def setUp(self):
+
+        iterDataDir = os.path.join(getModulePath(), "tests", "testData",
+                                   "iteration")
+        self.iterDataReader = IterDataReader(iterDataDir)
+
+    def testGetIterNumList(self):
+
+        self.assertEqual(self.iterDataReader.getIterNumList(),
+                         [0, 1, 2, 3, 4, 5])
+
+    def testReadIteration(self):
+
+        wfErr, pssn, dof = self.iterDataReader.readIteration(1)
+        self.assertEqual(wfErr.shape, (4, 19))
+        self.assertEqual(len(pssn), 31)
+        self.assertEqual(len(dof), 50)
+
+        self.assertEqual(np.sum(np.abs(wfErr -
+                                       self.iterDataReader.getWfsErr(1))), 0)
+
+    def testIterIterations(self):
+
+        for numOfPrefetch in (0, 1, 3):
+            dataList = list(self.iterDataReader.iterIterations(
+                start=1, stop=4, numOfPrefetch=numOfPrefetch))
+            self.assertEqual(len(dataList), 3)
+
+            for iterNum, (wfErr, pssn, dof) in enumerate(dataList, start=1):
+                self.assertEqual(
+                    np.sum(np.abs(dof - self.iterDataReader.getDof(iterNum))),
+                    0)
+
+    def testIterIterationsToTheEnd(self):
+
+        dataList = list(self.iterDataReader.iterIterations(start=2))
+        self.assertEqual(len(dataList), 4)
+
+    def testIterIterationsWithoutData(self):
+
+        dataIter = self.iterDataReader.iterIterations(start=5, stop=7)
+        next(dataIter)
+        self.assertRaises(FileNotFoundError, next, dataIter)
+
+    def testReadIterationFilledAfterIndexing(self):
+
+        tmpDir = tempfile.mkdtemp()
+        try:
+            iterDir = os.path.join(tmpDir, "iter1")
+            os.mkdir(iterDir)
+
+            iterDataReader = IterDataReader(tmpDir)
+            self.assertEqual(iterDataReader.getIterNumList(), [1])
+
+            srcIterDir = os.path.join(self.iterDataReader.dataDir, "iter1")
+            for fileName in os.listdir(srcIterDir):
+                shutil.copy(os.path.join(srcIterDir, fileName), iterDir)
+
+            wfErr, pssn, dof = iterDataReader.readIteration(1)
+            self.assertEqual(
+                np.sum(np.abs(wfErr - self.iterDataReader.getWfsErr(1))), 0)
+            self.assertEqual(
+                np.sum(np.abs(dof - self.iterDataReader.getDof(1))), 0)
+
+        finally:
+            shutil.rmtree(tmpDir)
+
+
+if __name__ == "__main__":
+
+    # Run the unit test
+    unittest.main()
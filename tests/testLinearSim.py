@@ -0,0 +1,127 @@
+import os
+import numpy as np
+import unittest
+
+from lsst.ts.wep.Utility import FilterType
+
+from lsst.ts.ofc.Utility import InstName, getModulePath
+from lsst.ts.ofc.DataShare import DataShare
+from lsst.ts.ofc.OptStateEstiDataDecorator import OptStateEstiDataDecorator
+from lsst.ts.ofc.OptCtrlDataDecorator import OptCtrlDataDecorator
+from lsst.ts.ofc.OptStateEsti import OptStateEsti
+from lsst.ts.ofc.OptCtrl import OptCtrl
+from lsst.ts.ofc.ZTAAC import ZTAAC
+from lsst.ts.ofc.LinearSim import LinearSim
+
+
+class TestLinearSim(unittest.TestCase):
+    """Test the LinearSim class."""
+
+    def setUp(self):
+
+        dataShare = DataShare()
+        configDir = os.path.join(getModulePath(), "configData")
+        dataShare.config(configDir, instName=InstName.LSST)
+
+        optStateEstiData = OptStateEstiDataDecorator(dataShare)
+        optStateEstiData.configOptStateEstiData()
+
+        mixedData = OptCtrlDataDecorator(optStateEstiData)
+        mixedData.configOptCtrlData(configFileName="optiPSSN_x00.ctrl")
+
+        self.ztaac = ZTAAC(OptStateEsti(), OptCtrl(), mixedData)
+        self.ztaac.config(filterType=FilterType.REF, defaultGain=0.7,
+                          fwhmThresholdInArcsec=0.2)
+        self.ztaac.setState0FromFile(state0InDofFileName="state0inDof.txt")
+        self.ztaac.setStateToState0()
+        self.ztaac.setGain(0.7)
+
+        self.sensorNameList = ["R44_S00", "R04_S20", "R00_S22", "R40_S02"]
+
+        self.perturbInDof = np.zeros(50)
+        self.perturbInDof[0] = 20
+        self.perturbInDof[10] = 0.05
+
+        self.linearSim = LinearSim(self.ztaac, self.sensorNameList,
+                                   numOfLoop=3, seeds=[1, 2, 3])
+        self.linearSim.setPerturbation(self.perturbInDof)
+
+    def testInitWithWrongSeeds(self):
+
+        self.assertRaises(ValueError, LinearSim, self.ztaac,
+                          self.sensorNameList, numOfLoop=2, seeds=[1])
+
+    def testGetWfErr(self):
+
+        wfErr = self.linearSim.getWfErr()
+        self.assertEqual(wfErr.shape, (3, 4, 19))
+        self.assertLess(np.max(np.abs(wfErr[1] - wfErr[0])), 1e-12)
+
+        self.linearSim.setNoise([0, 0.01, 0.01])
+        wfErrWithNoise = self.linearSim.getWfErr()
+        self.assertEqual(np.max(np.abs(wfErrWithNoise[0] - wfErr[0])), 0)
+        self.assertGreater(np.max(np.abs(wfErrWithNoise[1] - wfErr[1])), 0)
+
+    def testStepIsSameAsZTAAC(self):
+
+        wfErr = self.linearSim.getWfErr()
+        uk = self.linearSim.step()
+
+        ukAns = self.ztaac.estiUkWithGain(wfErr[0], self.sensorNameList)
+        self.assertLess(np.max(np.abs(uk[0] - ukAns)), 1e-8)
+
+        self.ztaac.aggState(ukAns)
+        stateIdx = np.arange(self.ztaac.optCtrl.getNumOfState0())
+        stateAns = self.ztaac.optCtrl.getState(stateIdx)
+        self.assertLess(
+            np.max(np.abs(self.linearSim.stateInDof[0] - stateAns)), 1e-8)
+
+    def testSetGains(self):
+
+        self.linearSim.setGains([0.7, 0.35, 0])
+        uk = self.linearSim.step()
+
+        self.assertLess(np.max(np.abs(uk[1] - 0.5 * uk[0])), 1e-8)
+        self.assertEqual(np.max(np.abs(uk[2])), 0)
+
+        self.assertRaises(ValueError, self.linearSim.setGains, 1.2)
+
+    def testSetPenalities(self):
+
+        penalityOrig = self.ztaac.dataShare.getPenality()
+        self.linearSim.setPenalities([None, {"Motion": 0.01}, None])
+        uk = self.linearSim.step()
+
+        self.assertLess(np.max(np.abs(uk[2] - uk[0])), 1e-8)
+        self.assertGreater(np.max(np.abs(uk[1] - uk[0])), 1e-3)
+        self.assertEqual(self.ztaac.dataShare.getPenality(), penalityOrig)
+
+        self.assertRaises(ValueError, self.linearSim.setPenalities, [None])
+
+    def testRun(self):
+
+        self.linearSim.setNoise(0.001)
+        result = self.linearSim.run(5)
+
+        self.assertEqual(result["uk"].shape, (5, 3, 50))
+        self.assertEqual(result["stateInDof"].shape, (5, 3, 50))
+        self.assertEqual(result["pssn"].shape, (5, 3))
+
+        # The image quality is improved by the closed loop
+        self.assertTrue(np.all(result["pssn"][-1] > result["pssn"][0]))
+
+    def testReset(self):
+
+        self.linearSim.step()
+        self.linearSim.reset()
+
+        stateIdx = np.arange(self.ztaac.optCtrl.getNumOfState0())
+        stateAns = self.ztaac.optCtrl.getState(stateIdx)
+        self.assertEqual(
+            np.max(np.abs(self.linearSim.stateInDof - stateAns)), 0)
+
+
+if __name__ == "__main__":
+
+    # Run the unit test
+    unittest.main()
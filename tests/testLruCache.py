@@ -0,0 +1,60 @@
+import unittest
+
+from lsst.ts.ofc.LruCache import LruCache
+
+
+class TestLruCache(unittest.TestCase):
+    """Test the LruCache class."""
+
+    def setUp(self):
+
+        self.lruCache = LruCache(maxSize=2)
+
+    def testGetAndPut(self):
+
+        self.assertEqual(self.lruCache.get("a"), None)
+        self.assertEqual(self.lruCache.get("a", default=-1), -1)
+
+        self.lruCache.put("a", 1)
+        self.assertEqual(self.lruCache.get("a"), 1)
+        self.assertIn("a", self.lruCache)
+        self.assertEqual(len(self.lruCache), 1)
+
+    def testRemoveLeastRecentlyUsed(self):
+
+        self.lruCache.put("a", 1)
+        self.lruCache.put("b", 2)
+
+        # Use "a" to let "b" be the least recently used one
+        self.lruCache.get("a")
+        self.lruCache.put("c", 3)
+
+        self.assertEqual(len(self.lruCache), 2)
+        self.assertIn("a", self.lruCache)
+        self.assertNotIn("b", self.lruCache)
+        self.assertIn("c", self.lruCache)
+
+    def testSetMaxSize(self):
+
+        self.lruCache.put("a", 1)
+        self.lruCache.put("b", 2)
+
+        self.lruCache.setMaxSize(1)
+        self.assertEqual(self.lruCache.getMaxSize(), 1)
+        self.assertEqual(len(self.lruCache), 1)
+        self.assertIn("b", self.lruCache)
+
+        self.assertRaises(ValueError, self.lruCache.setMaxSize, 0)
+
+    def testClear(self):
+
+        self.lruCache.put("a", 1)
+        self.lruCache.clear()
+
+        self.assertEqual(len(self.lruCache), 0)
+
+
+if __name__ == "__main__":
+
+    # Run the unit test
+    unittest.main()
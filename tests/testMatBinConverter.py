@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import unittest
+
+from lsst.ts.ofc.MatBinConverter import MatBinConverter
+from lsst.ts.ofc.ParamReader import ParamReader
+from lsst.ts.ofc.Utility import getModulePath, getBinFilePath
+
+
+class TestMatBinConverter(unittest.TestCase):
+    """Test the MatBinConverter class."""
+
+    def setUp(self):
+
+        self.tmpDir = tempfile.mkdtemp()
+
+        configDir = os.path.join(getModulePath(), "configData", "lsst")
+        for fileName in ("y2.txt", "senM_35_19_50.txt", "imgQualWgt.txt",
+                         "sensorNameToFieldIdx.txt"):
+            shutil.copy(os.path.join(configDir, fileName), self.tmpDir)
+
+        self.converter = MatBinConverter()
+
+    def tearDown(self):
+
+        shutil.rmtree(self.tmpDir)
+
+    def testConvertFile(self):
+
+        filePath = os.path.join(self.tmpDir, "y2.txt")
+        binFilePath = self.converter.convertFile(filePath)
+
+        self.assertEqual(binFilePath, getBinFilePath(filePath))
+        self.assertTrue(os.path.exists(binFilePath))
+
+        manifest = self.converter.readManifest(os.path.dirname(binFilePath))
+        self.assertEqual(manifest["files"]["y2.txt"]["shape"], [35, 19])
+
+    def testConvertDir(self):
+
+        binFilePaths = self.converter.convertDir(self.tmpDir)
+
+        # The setting file is not a matrix
+        self.assertEqual(len(binFilePaths), 3)
+        self.assertEqual(self.converter.verifyDir(self.tmpDir), [])
+
+    def testGetMatContentFromBinFile(self):
+
+        for fileName, usecols in (("senM_35_19_50.txt", None),
+                                  ("imgQualWgt.txt", 1),
+                                  ("imgQualWgt.txt", (0, 1)),
+                                  ("y2.txt", np.arange(3, 10))):
+            filePath = os.path.join(self.tmpDir, fileName)
+            matInTxt = np.loadtxt(filePath, usecols=usecols)
+
+            self.converter.convertFile(filePath)
+            matInBin = ParamReader(filePath=filePath).getMatContent(
+                usecols=usecols)
+
+            self.assertEqual(matInBin.shape, matInTxt.shape)
+            self.assertEqual(np.sum(np.abs(matInBin - matInTxt)), 0)
+
+    def testStaleBinFile(self):
+
+        filePath = os.path.join(self.tmpDir, "y2.txt")
+        binFilePath = self.converter.convertFile(filePath)
+
+        # Make the binary file older than the edited text file
+        with open(filePath, "a") as file:
+            file.write(" ".join(["1"] * 19) + "\n")
+        binMtime = os.path.getmtime(binFilePath)
+        os.utime(filePath, (binMtime + 10, binMtime + 10))
+
+        mat = ParamReader(filePath=filePath).getMatContent()
+        self.assertEqual(mat.shape, (36, 19))
+        self.assertEqual(self.converter.verifyDir(self.tmpDir), ["y2.txt"])
+
+
+if __name__ == "__main__":
+
+    # Run the unit test
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import numpy as np
+import unittest
+
+from lsst.ts.wep.Utility import FilterType
+
+from lsst.ts.ofc.Utility import InstName, getModulePath
+from lsst.ts.ofc.DataShare import DataShare
+from lsst.ts.ofc.OptStateEstiDataDecorator import OptStateEstiDataDecorator
+from lsst.ts.ofc.OptCtrlDataDecorator import OptCtrlDataDecorator
+from lsst.ts.ofc.OfcDataSnapshot import OfcDataSnapshot
+from lsst.ts.ofc.OptStateEsti import OptStateEsti
+from lsst.ts.ofc.OptCtrl import OptCtrl
+from lsst.ts.ofc.ZTAAC import ZTAAC
+
+
+class TestOfcDataSnapshot(unittest.TestCase):
+    """Test the OfcDataSnapshot class."""
+
+    def setUp(self):
+
+        self.mixedData = self._getMixedData()
+        self.snapshot = OfcDataSnapshot(self.mixedData)
+
+    def _getMixedData(self):
+
+        dataShare = DataShare()
+        configDir = os.path.join(getModulePath(), "configData")
+        dataShare.config(configDir, instName=InstName.LSST)
+
+        optStateEstiData = OptStateEstiDataDecorator(dataShare)
+        optStateEstiData.configOptStateEstiData()
+
+        mixedData = OptCtrlDataDecorator(optStateEstiData)
+        mixedData.configOptCtrlData(configFileName="optiPSSN_x00.ctrl")
+
+        return mixedData
+
+    def testBoundFunctions(self):
+
+        self.assertNotIn("getSenM", OfcDataSnapshot.__dict__)
+        self.assertIn("getSenM", self.snapshot.__dict__)
+        self.assertIn("getIntrinsicZk", self.snapshot.__dict__)
+        self.assertIn("getAuthority", self.snapshot.__dict__)
+
+        self.assertEqual(self.snapshot.getZn3Idx().tolist(),
+                         self.mixedData.getZn3Idx().tolist())
+        self.assertIs(self.snapshot.getSenM(), self.snapshot.getSenM())
+        self.assertEqual(self.snapshot.getXref(), self.mixedData.getXref())
+        self.assertEqual(self.snapshot.xRef, self.mixedData.xRef)
+        self.assertIs(self.snapshot.getDecoratedObj(), self.mixedData)
+
+    def testPrecomputedArrayIsReadOnly(self):
+
+        zn3Idx = self.snapshot.getZn3Idx()
+        self.assertFalse(zn3Idx.flags.writeable)
+        self.assertTrue(self.mixedData.getZn3Idx().flags.writeable)
+
+    def testMutatorRefreshesSnapshot(self):
+
+        senM = self.snapshot.getSenM()
+
+        zn3Idx = np.arange(3, 9)
+        dofIdx = np.arange(1, 40, 3)
+        self.snapshot.setZkAndDofIdxArrays(zn3Idx, dofIdx)
+
+        self.assertEqual(self.mixedData.getZn3Idx().tolist(),
+                         zn3Idx.tolist())
+        self.assertEqual(self.snapshot.getDofIdx().tolist(),
+                         dofIdx.tolist())
+        self.assertEqual(self.snapshot.getSenM().shape, (35, 6, 13))
+        self.assertIsNot(self.snapshot.getSenM(), senM)
+
+    def testFrozen(self):
+
+        self.assertRaises(AttributeError, setattr, self.snapshot, "xRef",
+                          "x0")
+
+    def testEstiUkWithGain(self):
+
+        ukOfStack = self._estiUkWithGain(self._getMixedData())
+        ukOfSnapshot = self._estiUkWithGain(self.snapshot)
+
+        self.assertEqual(np.sum(np.abs(ukOfSnapshot - ukOfStack)), 0)
+
+    def _estiUkWithGain(self, data):
+
+        ztaac = ZTAAC(OptStateEsti(), OptCtrl(), data)
+        ztaac.config(filterType=FilterType.REF, defaultGain=0.7,
+                     fwhmThresholdInArcsec=0.2)
+        ztaac.setState0FromFile(state0InDofFileName="state0inDof.txt")
+        ztaac.setStateToState0()
+        ztaac.setGain(0.9)
+
+        wfFilePath = os.path.join(getModulePath(), "tests", "testData",
+                                  "lsst_wfs_error_iter0.z4c")
+        sensorNameList = ["R44_S00", "R04_S20", "R00_S22", "R40_S02"]
+        wfErr = ztaac.getWfFromFile(wfFilePath, sensorNameList)
+
+        return ztaac.estiUkWithGain(wfErr, sensorNameList)
+
+
+if __name__ == "__main__":
+
+    # Run the unit test
+    unittest.main()
@@ -78,6 +78,127 @@ class TestOptCtrl(unittest.TestCase):
         self.assertAlmostEqual(uk[1], -1.349544022857101)
         self.assertAlmostEqual(uk[2], 2.6511005518054187)
 
+    def testCalcQmat(self):
+
+        ccMat = self.optCtrl._calcCCmat(self.mixedData, self.filterType)
+        senM = self.mixedData.getSenM()
+        qWgt = self.mixedData.getQwgt()
+        qMat = self.optCtrl._calcQmat(ccMat, senM, qWgt)
+
+        ans = 0
+        for aMat, wgt in zip(senM, qWgt):
+            ans += wgt * aMat.T.dot(ccMat).dot(aMat)
+
+        self.assertTrue(np.allclose(qMat, ans, rtol=1e-10, atol=1e-12))
+
+    def testCalcQx(self):
+
+        ccMat = self.optCtrl._calcCCmat(self.mixedData, self.filterType)
+        qx = self.optCtrl._calcQx(self.mixedData, ccMat, self.optSt)
+
+        senM = self.mixedData.getSenM()
+        qWgt = self.mixedData.getQwgt()
+        y2c = self.mixedData.getY2Corr(np.arange(len(qWgt)))
+        optSt = self.optSt.reshape(-1, 1)
+
+        ans = 0
+        for aMat, wgt, y2k in zip(senM, qWgt, y2c):
+            y2k = y2k.reshape(-1, 1)
+            ans += wgt * aMat.T.dot(ccMat).dot(aMat.dot(optSt) + y2k)
+
+        self.assertEqual(qx.shape, ans.shape)
+        self.assertTrue(np.allclose(qx, ans, rtol=1e-10, atol=1e-12))
+
+    def testGetCompiledCtrl(self):
+
+        compiledCtrl = self.optCtrl.getCompiledCtrl(self.mixedData,
+                                                    self.filterType)
+        numOfDof = len(self.mixedData.getDofIdx())
+        self.assertEqual(compiledCtrl.getMatF().shape, (numOfDof, numOfDof))
+        self.assertEqual(compiledCtrl.qMat.shape, (numOfDof, numOfDof))
+        self.assertEqual(compiledCtrl.aTccMat.shape,
+                         (self.mixedData.getNumOfFieldInQwgt(), numOfDof,
+                          len(self.mixedData.getZn3Idx())))
+        self.assertEqual(compiledCtrl.rho, 0.001)
+
+        self.assertIs(self.optCtrl.getCompiledCtrl(self.mixedData,
+                                                   self.filterType),
+                      compiledCtrl)
+        self.assertIsNot(self.optCtrl.getCompiledCtrl(self.mixedData,
+                                                      FilterType.G),
+                         compiledCtrl)
+
+        self.mixedData.xRef = "0"
+        self.assertIs(self.optCtrl.getCompiledCtrl(self.mixedData,
+                                                   self.filterType),
+                      compiledCtrl)
+
+        self.optCtrl.clearCompiledCtrlCache()
+        self.assertIsNot(self.optCtrl.getCompiledCtrl(self.mixedData,
+                                                      self.filterType),
+                         compiledCtrl)
+
+    def testEstiUkWithoutGainOfRho(self):
+
+        rhos = [0.0005, 0.001, 0.01]
+        for xRef in ("x0", "0", "x00"):
+            self.mixedData.xRef = xRef
+
+            uk = self.optCtrl.estiUkWithoutGainOfRho(
+                self.mixedData, self.filterType, self.optSt, rhos)
+            self.assertEqual(uk.shape,
+                             (len(rhos), len(self.mixedData.getDofIdx())))
+
+            for rho, ukOfRho in zip(rhos, uk):
+                self.mixedData.setPenality({"Motion": rho})
+                ans = self.optCtrl.estiUkWithoutGain(
+                    self.mixedData, self.filterType, self.optSt)
+                self.assertLess(np.max(np.abs(ukOfRho - ans)),
+                                1e-6 * np.max(np.abs(ans)))
+
+            self.mixedData.setPenality({"Motion": 0.001})
+
+        self.mixedData.xRef = None
+        self.assertRaises(ValueError, self.optCtrl.estiUkWithoutGainOfRho,
+                          self.mixedData, self.filterType, self.optSt, rhos)
+
+    def testCalcGqPssn(self):
+
+        pssn = self.optCtrl.calcGqPssn(self.mixedData, self.filterType,
+                                       self.optSt)
+        self.assertLess(pssn, 1)
+
+        optSt = np.array([self.optSt, 2 * self.optSt, self.optSt])
+        pssnBatch = self.optCtrl.calcGqPssn(self.mixedData, self.filterType,
+                                            optSt)
+        self.assertEqual(pssnBatch.shape, (3,))
+        self.assertAlmostEqual(pssnBatch[0], pssn)
+        self.assertAlmostEqual(pssnBatch[2], pssn)
+        self.assertNotAlmostEqual(pssnBatch[1], pssn)
+
+    def testGetRhoFreeCtrl(self):
+
+        rhoFreeCtrl = self.optCtrl.getRhoFreeCtrl(self.mixedData,
+                                                  self.filterType)
+        compiledCtrl = self.optCtrl.getCompiledCtrl(self.mixedData,
+                                                    self.filterType)
+        self.assertIs(compiledCtrl.qMat, rhoFreeCtrl.qMat)
+
+        # The compiled control of new rho reuses the rho free matrices
+        self.mixedData.setPenality({"Motion": 0.01})
+        compiledCtrlOfRho = self.optCtrl.getCompiledCtrl(self.mixedData,
+                                                         self.filterType)
+        self.assertIsNot(compiledCtrlOfRho, compiledCtrl)
+        self.assertIs(compiledCtrlOfRho.qMat, rhoFreeCtrl.qMat)
+        self.assertIs(self.optCtrl.getRhoFreeCtrl(self.mixedData,
+                                                  self.filterType),
+                      rhoFreeCtrl)
+
+        self.optCtrl.clearCompiledCtrlCache()
+        self.assertIsNot(self.optCtrl.getRhoFreeCtrl(self.mixedData,
+                                                     self.filterType),
+                         rhoFreeCtrl)
+
     def testEstiUkWithoutGainAndXref(self):
 
         self.mixedData.xRef = None
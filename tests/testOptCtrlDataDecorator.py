@@ -1,4 +1,6 @@
 import os
+import shutil
+import tempfile
 import numpy as np
 import unittest
 
@@ -29,6 +31,79 @@ class TestOptCtrlDataDecorator(unittest.TestCase):
         self.assertAlmostEqual(authority[31], 45.96449329039931)
         self.assertAlmostEqual(authority[32], 103.4589756080062)
 
+    def testGetActuatorForce(self):
+
+        penality = self.optCtrlData.getPenality()
+        authority = self.optCtrlData.getAuthority()
+
+        m1m3ActForce = self.optCtrlData.getM1M3ActuatorForce()
+        self.assertEqual(m1m3ActForce.shape, (156, 20))
+        self.assertFalse(m1m3ActForce.flags.writeable)
+        self.assertIs(self.optCtrlData.getM1M3ActuatorForce(), m1m3ActForce)
+        self.assertLess(np.max(np.abs(
+            penality["M1M3Act"] * np.std(m1m3ActForce, axis=0) -
+            authority[10:30])), 1e-10)
+
+        m2ActForce = self.optCtrlData.getM2ActuatorForce()
+        self.assertEqual(m2ActForce.shape[1], 20)
+        self.assertLess(np.max(np.abs(
+            penality["M2Act"] * np.std(m2ActForce, axis=0) -
+            authority[30:50])), 1e-10)
+
+    def testCachedAuthority(self):
+
+        tmpDir = tempfile.mkdtemp()
+        try:
+            configDir = os.path.join(tmpDir, "configData")
+            shutil.copytree(self.optCtrlData.getConfigDir(), configDir,
+                            ignore=shutil.ignore_patterns("binData"))
+
+            dataShare = DataShare()
+            dataShare.config(configDir, instName=InstName.LSST)
+            optCtrlData = OptCtrlDataDecorator(dataShare)
+            optCtrlData.configOptCtrlData()
+
+            authority = optCtrlData.getAuthority()
+            self.assertLess(np.max(np.abs(
+                authority - self.optCtrlData.getAuthority())), 1e-10)
+
+            forceFilePath = os.path.join(configDir, "M1M3",
+                                         "M1M3_1um_156_force.txt")
+            authorityFilePath = optCtrlData._getAuthorityFilePath(
+                forceFilePath)
+            self.assertTrue(os.path.exists(authorityFilePath))
+
+            # The cached authority is used without reading the forces
+            cachedAuthority = optCtrlData._readCachedAuthority(
+                authorityFilePath)
+            self.assertEqual(len(cachedAuthority), 1)
+            key = list(cachedAuthority.keys())[0]
+            cachedAuthority[key] = [1.0] * 20
+            optCtrlData._writeCachedAuthority(authorityFilePath,
+                                              cachedAuthority)
+
+            optCtrlData.configOptCtrlData()
+            penality = optCtrlData.getPenality()
+            self.assertEqual(optCtrlData.getAuthority()[10:30].tolist(),
+                             [penality["M1M3Act"]] * 20)
+
+            # The other number of bending mode has its own entry
+            optCtrlData.configOptCtrlData(numOfBendingMode=10)
+            self.assertEqual(len(optCtrlData.getAuthority()), 30)
+            self.assertEqual(
+                len(optCtrlData._readCachedAuthority(authorityFilePath)), 2)
+
+            # The changed force file is read again
+            with open(forceFilePath, "a") as file:
+                file.write("\n")
+
+            optCtrlData.configOptCtrlData()
+            self.assertLess(np.max(np.abs(
+                optCtrlData.getAuthority() - authority)), 1e-10)
+
+        finally:
+            shutil.rmtree(tmpDir)
+
     def testGetQwgt(self):
 
         qWgt = self.optCtrlData.getQwgt()
@@ -36,6 +111,45 @@ class TestOptCtrlDataDecorator(unittest.TestCase):
         self.assertAlmostEqual(np.sum(qWgt), 1)
         self.assertAlmostEqual(qWgt[1], 0.01974265)
 
+        self.assertFalse(qWgt.flags.writeable)
+        self.assertIs(self.optCtrlData.getQwgt(), qWgt)
+
+    def testReload(self):
+
+        tmpDir = tempfile.mkdtemp()
+        try:
+            configDir = os.path.join(tmpDir, "configData")
+            shutil.copytree(self.optCtrlData.getConfigDir(), configDir)
+
+            dataShare = DataShare()
+            dataShare.config(configDir, instName=InstName.LSST)
+            optCtrlData = OptCtrlDataDecorator(dataShare)
+            optCtrlData.configOptCtrlData()
+
+            zn3Idx = np.arange(3, 9)
+            dofIdx = np.arange(1, 40, 3)
+            optCtrlData.setZkAndDofIdxArrays(zn3Idx, dofIdx)
+
+            # Drop the last field of the image quality weighting ratio
+            filePath = os.path.join(configDir, "lsst", "imgQualWgt.txt")
+            with open(filePath, "r") as file:
+                lines = file.readlines()
+            with open(filePath, "w") as file:
+                file.writelines(lines[:-1])
+
+            self.assertEqual(optCtrlData.getNumOfFieldInQwgt(), 31)
+            optCtrlData.reload()
+            self.assertEqual(optCtrlData.getNumOfFieldInQwgt(), 30)
+            self.assertAlmostEqual(np.sum(optCtrlData.getQwgt()), 1)
+
+            self.assertEqual(optCtrlData.getZn3Idx().tolist(),
+                             zn3Idx.tolist())
+            self.assertEqual(optCtrlData.getDofIdx().tolist(),
+                             dofIdx.tolist())
+
+        finally:
+            shutil.rmtree(tmpDir)
+
     def testGetQwgtOfComcam(self):
 
         dataShare = DataShare()
@@ -78,6 +192,25 @@ class TestOptCtrlDataDecorator(unittest.TestCase):
         self.assertEqual(penality["M2Act"], 5.9)
         self.assertEqual(penality["Motion"], 0.001)
 
+    def testSetPenality(self):
+
+        authority = self.optCtrlData.getAuthority()
+
+        self.optCtrlData.setPenality({"M1M3Act": 11.8, "Motion": 0.01})
+
+        penality = self.optCtrlData.getPenality()
+        self.assertEqual(penality["M1M3Act"], 11.8)
+        self.assertEqual(penality["M2Act"], 5.9)
+        self.assertEqual(penality["Motion"], 0.01)
+
+        newAuthority = self.optCtrlData.getAuthority()
+        self.assertEqual(newAuthority[:10].tolist(), authority[:10].tolist())
+        self.assertAlmostEqual(newAuthority[11], 2 * authority[11])
+        self.assertAlmostEqual(newAuthority[31], authority[31])
+
+        self.assertRaises(ValueError, self.optCtrlData.setPenality,
+                          {"M3Act": 1})
+
     def testGetXref(self):
 
         xRef = self.optCtrlData.getXref()
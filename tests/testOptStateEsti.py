@@ -44,6 +44,107 @@ class TestOptStateEsti(unittest.TestCase):
         self.assertAlmostEqual(optState[1], 0.0303436526)
         self.assertAlmostEqual(optState[2], -0.0360475823)
 
+    def testEstiOptStateBatch(self):
+
+        wfErr = np.array([self.wfErr, 2 * self.wfErr, -self.wfErr])
+        optState = self.optStateEsti.estiOptStateBatch(
+            self.optStateEstiData, FilterType.REF, wfErr, self.fieldIdx)
+        self.assertEqual(optState.shape,
+                         (3, len(self.optStateEstiData.getDofIdx())))
+
+        for optStateOfVisit, wfErrOfVisit in zip(optState, wfErr):
+            ans = self.optStateEsti.estiOptState(
+                self.optStateEstiData, FilterType.REF, wfErrOfVisit,
+                self.fieldIdx)
+            self.assertLess(np.max(np.abs(optStateOfVisit - ans)), 1e-8)
+
+    def testEstiOptStateBatchWithSamples(self):
+
+        noise = np.random.RandomState(seed=1).normal(
+            scale=0.01, size=(2, 500) + self.wfErr.shape)
+        wfErr = self.wfErr + noise
+
+        optState, cov = self.optStateEsti.estiOptStateBatch(
+            self.optStateEstiData, FilterType.REF, wfErr, self.fieldIdx,
+            returnCov=True)
+
+        numOfDof = len(self.optStateEstiData.getDofIdx())
+        self.assertEqual(optState.shape, (2, 500, numOfDof))
+        self.assertEqual(cov.shape, (numOfDof, numOfDof))
+
+        ans = self.optStateEsti.estiOptState(
+            self.optStateEstiData, FilterType.REF, wfErr[1, 3],
+            self.fieldIdx)
+        self.assertLess(np.max(np.abs(optState[1, 3] - ans)), 1e-8)
+
+        # The covariance follows pinv(A) * cov(noise) * pinv(A).T
+        pinvA = self.optStateEsti.getPinvA(self.optStateEstiData,
+                                           self.fieldIdx)
+        covAns = 0.01**2 * pinvA.dot(pinvA.T)
+        self.assertLess(np.max(np.abs(np.diag(cov) / np.diag(covAns) - 1)),
+                        0.3)
+
+    def testEstiOptStateBatchWithCovOfOneVisit(self):
+
+        self.assertRaises(ValueError, self.optStateEsti.estiOptStateBatch,
+                          self.optStateEstiData, FilterType.REF,
+                          self.wfErr[np.newaxis, :], self.fieldIdx,
+                          returnCov=True)
+
+    def testGetPinvA(self):
+
+        pinvA = self.optStateEsti.getPinvA(self.optStateEstiData,
+                                           self.fieldIdx)
+        dofIdx = self.optStateEstiData.getDofIdx()
+        zn3Idx = self.optStateEstiData.getZn3Idx()
+        self.assertEqual(pinvA.shape,
+                         (len(dofIdx), len(self.fieldIdx) * len(zn3Idx)))
+        self.assertIs(self.optStateEsti.getPinvA(self.optStateEstiData,
+                                                 self.fieldIdx), pinvA)
+
+        fieldIdx = self.fieldIdx[:3]
+        self.assertIsNot(self.optStateEsti.getPinvA(self.optStateEstiData,
+                                                    fieldIdx), pinvA)
+
+        self.optStateEsti.clearPinvAcache()
+        self.assertIsNot(self.optStateEsti.getPinvA(self.optStateEstiData,
+                                                    self.fieldIdx), pinvA)
+
+    def testPrecomputePinvA(self):
+
+        numOfPinvA = self.optStateEsti.precomputePinvA(self.optStateEstiData,
+                                                       self.fieldIdx)
+
+        # Only the subsets of 3 and 4 fields have enough equations
+        self.assertEqual(numOfPinvA, 5)
+
+        self.optStateEsti._getPinvA = None
+        for fieldIdx in (self.fieldIdx, self.fieldIdx[1:],
+                         np.delete(self.fieldIdx, 2)):
+            pinvA = self.optStateEsti.getPinvA(self.optStateEstiData,
+                                               fieldIdx)
+            self.assertEqual(pinvA.shape[1], 3 * 19 if len(fieldIdx) == 3
+                             else 4 * 19)
+
+    def testPrecomputePinvAwithMaxNumOfDrop(self):
+
+        numOfPinvA = self.optStateEsti.precomputePinvA(
+            self.optStateEstiData, self.fieldIdx, maxNumOfDrop=0)
+        self.assertEqual(numOfPinvA, 1)
+
+    def testPrecomputePinvAwithManyFields(self):
+
+        fieldIdx = np.arange(31)
+        self.assertRaises(ValueError, self.optStateEsti.precomputePinvA,
+                          self.optStateEstiData, fieldIdx, maxNumOfDrop=None)
+
+        # The subsets without enough equations are not counted in the cache
+        numOfPinvA = self.optStateEsti.precomputePinvA(
+            self.optStateEstiData, self.fieldIdx, maxNumOfDrop=None)
+        self.assertEqual(numOfPinvA, 5)
+        self.assertEqual(self.optStateEsti._pinvAcache.getMaxSize(),
+                         5 + self.optStateEsti.NUM_OF_PINV_A)
+
     def testEstiOptStateWithDifferentZkIdxAndDofIdx(self):
 
         zn3Idx = np.arange(5)
@@ -74,6 +74,12 @@ class TestOptStateEstiDataDecorator(unittest.TestCase):
                                                            fieldIdx)
         self.assertEqual(len(intrinsicZk), 0)
 
+    def testConfigWithoutIntrinsicZkFile(self):
+
+        self.assertRaises(FileNotFoundError,
+                          self.optStateEstiData.configOptStateEstiData,
+                          intrincZkFileName="intrinsic_noSuchFile")
+
     def testGetIntrinsicZkWithIncompleteIdx(self):
 
         zn3Idx = np.arange(3, 9)
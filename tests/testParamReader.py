@@ -37,6 +37,13 @@ class TestParamReader(unittest.TestCase):
         self.assertRaises(ValueError, self.paramReader.getSetting,
                           "notThisSetting")
 
+    def testGetSettingWithExactMatch(self):
+
+        # The prefix of parameter name should not match
+        self.assertRaises(ValueError, self.paramReader.getSetting, "znm")
+        self.assertRaises(ValueError, self.paramReader.getSetting, "icom",
+                          arrayParamList=["icom"])
+
     def testGetContent(self):
 
         content = self.paramReader.getTxtContent()
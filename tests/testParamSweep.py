@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import unittest
+
+from lsst.ts.ofc.ParamSweep import ParamSweep, RESULT_COLUMNS
+from lsst.ts.ofc.ReplayDriver import getWorkerZTAAC
+from lsst.ts.ofc.Utility import getModulePath
+
+
+class TestParamSweep(unittest.TestCase):
+    """Test the ParamSweep class."""
+
+    def setUp(self):
+
+        iterDataDir = os.path.join(getModulePath(), "tests", "testData",
+                                   "iteration")
+        self.paramSweep = ParamSweep(numOfWorker=0)
+        self.visit = self.paramSweep.readVisit(iterDataDir, 0)
+
+        self.grid = {"m1m3ActPenality": [1, 5],
+                     "motionPenality": [0.001, 0.01, 0.1],
+                     "defaultGain": [0.5, 0.7],
+                     "fwhmThresholdInArcsec": [0.2, 100]}
+
+    def testRun(self):
+
+        results = self.paramSweep.run(self.visit, self.grid)
+
+        numOfRow = 2 * 3 * 2 * 2
+        for name in RESULT_COLUMNS:
+            self.assertEqual(results[name].shape, (numOfRow,))
+        self.assertEqual(results["uk"].shape, (numOfRow, 50))
+
+        self.assertEqual(results["m1m3ActPenality"][:12].tolist(), [1] * 12)
+        self.assertEqual(results["motionPenality"][:4].tolist(),
+                         [0.001] * 4)
+        self.assertEqual(results["fwhmThresholdInArcsec"][:2].tolist(),
+                         [0.2, 100])
+
+        # The image quality of first visit is bad
+        self.assertEqual(results["gain"][:4].tolist(), [1, 0.5, 1, 0.7])
+
+        self.assertTrue(np.all(results["pssnAfter"] >
+                               results["pssnBefore"]))
+        self.assertAlmostEqual(results["ukNorm"][1],
+                               0.5 * results["ukNorm"][0])
+
+    def testRunWithZtaac(self):
+
+        results = self.paramSweep.run(
+            self.visit, {"motionPenality": [0.01],
+                         "defaultGain": [0.5],
+                         "fwhmThresholdInArcsec": [100]})
+
+        ztaac = getWorkerZTAAC()[0]
+        penalityOrig = ztaac.dataShare.getPenality()
+        try:
+            ztaac.dataShare.setPenality({"Motion": 0.01})
+            ztaac.setGain(0.5)
+            sensorNameList = ztaac.mapSensorIdToName(
+                self.visit["sensorIdList"])[0]
+            uk = ztaac.estiUkWithGain(self.visit["wfErr"], sensorNameList)
+
+        finally:
+            ztaac.dataShare.setPenality(penalityOrig)
+
+        self.assertLess(np.max(np.abs(results["uk"][0] - uk)),
+                        1e-6 * np.max(np.abs(uk)))
+
+        # The penality does not leak to the next visit
+        self.assertEqual(getWorkerZTAAC()[0].dataShare.getPenality(),
+                         penalityOrig)
+
+    def testRunWithUnknownKey(self):
+
+        self.assertRaises(ValueError, self.paramSweep.run, self.visit,
+                          {"motion": [0.01]})
+
+    def testRunInWorkers(self):
+
+        grid = dict(self.grid, m2ActPenality=[1, 5])
+        results = self.paramSweep.run(self.visit, grid)
+        resultsInWorkers = ParamSweep(numOfWorker=2).run(self.visit, grid)
+
+        for name in RESULT_COLUMNS + ("uk",):
+            self.assertLess(np.max(np.abs(resultsInWorkers[name] -
+                                          results[name])), 1e-10)
+
+    def testWriteResults(self):
+
+        results = self.paramSweep.run(self.visit, self.grid)
+
+        tmpDir = tempfile.mkdtemp()
+        try:
+            filePath = os.path.join(tmpDir, "sweep.csv")
+            self.paramSweep.writeResults(filePath, results)
+
+            with open(filePath, "r") as file:
+                header = file.readline().strip()
+            self.assertEqual(header, ",".join(RESULT_COLUMNS))
+
+            table = np.loadtxt(filePath, delimiter=",", skiprows=1)
+            self.assertEqual(table.shape, (24, len(RESULT_COLUMNS)))
+
+        finally:
+            shutil.rmtree(tmpDir)
+
+
+if __name__ == "__main__":
+
+    # Run the unit test
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import unittest
+
+from lsst.ts.ofc.ReplayDriver import ReplayDriver, runJob
+from lsst.ts.ofc.IterDataReader import IterDataReader
+from lsst.ts.ofc.Utility import getModulePath
+
+
+class TestReplayDriver(unittest.TestCase):
+    """Test the ReplayDriver class."""
+
+    def setUp(self):
+
+        self.iterDataDir = os.path.join(getModulePath(), "tests", "testData",
+                                        "iteration")
+        self.job = {"iterDataDir": self.iterDataDir, "stop": 5}
+
+    def testRunJob(self):
+
+        result = runJob(self.job)
+        self.assertEqual(result["uk"].shape, (5, 50))
+        self.assertEqual(result["dof"].shape, (5, 50))
+        self.assertEqual(len(result["gain"]), 5)
+
+        # The DOF is applied in the next iteration
+        iterDataReader = IterDataReader(self.iterDataDir)
+        for iterNum, dof in enumerate(result["dof"]):
+            dofAns = iterDataReader.getDof(iterNum + 1)
+            self.assertLess(np.sum(np.abs(dof - dofAns)), 0.002)
+
+    def testRunJobWithOverrides(self):
+
+        result = runJob(self.job)
+
+        job = dict(self.job, gain=0.5, penality={"Motion": 1e-2})
+        resultWithOverrides = runJob(job)
+        self.assertEqual(resultWithOverrides["gain"].tolist(), [0.5] * 5)
+        self.assertGreater(
+            np.sum(np.abs(resultWithOverrides["uk"] - result["uk"])), 0)
+
+        # The overrides do not leak to the next job
+        resultAgain = runJob(self.job)
+        self.assertEqual(np.sum(np.abs(resultAgain["uk"] - result["uk"])), 0)
+
+    def testRunInWorkers(self):
+
+        jobs = [self.job, dict(self.job, gain=0.5)]
+
+        resultsInProcess = ReplayDriver(numOfWorker=0).run(jobs)
+        resultsInWorkers = ReplayDriver(numOfWorker=2).run(jobs)
+
+        for result, resultInProcess in zip(resultsInWorkers,
+                                           resultsInProcess):
+            self.assertLess(np.max(np.abs(result["dof"] -
+                                          resultInProcess["dof"])), 1e-10)
+
+    def testWriteResults(self):
+
+        jobs = [dict(self.job, stop=2)]
+        driver = ReplayDriver(numOfWorker=0)
+        results = driver.run(jobs)
+
+        tmpDir = tempfile.mkdtemp()
+        try:
+            filePath = os.path.join(tmpDir, "result.npz")
+            driver.writeResults(filePath, jobs, results)
+
+            with np.load(filePath) as data:
+                self.assertEqual(data["job0_uk"].shape, (2, 50))
+                self.assertIn("iterDataDir", str(data["jobs"]))
+
+        finally:
+            shutil.rmtree(tmpDir)
+
+
+if __name__ == "__main__":
+
+    # Run the unit test
+    unittest.main()
@@ -0,0 +1,61 @@
+import numpy as np
+import unittest
+
+from lsst.ts.ofc.RhoFreeCtrl import RhoFreeCtrl
+
+
+class TestRhoFreeCtrl(unittest.TestCase):
+    """Test the RhoFreeCtrl class."""
+
+    def setUp(self):
+
+        matH = np.diag([1.0, 4.0, 0.25])
+        qMat = np.array([[2.0, 1.0, 0.0], [1.0, 3.0, 0.5], [0.0, 0.5, 1.0]])
+        aTccMat = np.ones((3, 3, 4))
+        qy2 = np.array([1.0, -1.0, 0.5])
+
+        self.rhoFreeCtrl = RhoFreeCtrl(matH, qMat, aTccMat, qy2)
+
+    def testCalcQx(self):
+
+        qx = self.rhoFreeCtrl.calcQx([1, 2, 0])
+
+        self.assertEqual(qx.shape, (3, 1))
+        self.assertEqual(np.sum(np.abs(qx.ravel() - [5, 6, 1.5])), 0)
+
+    def testGetEigen(self):
+
+        eigVal, eigVec = self.rhoFreeCtrl.getEigen()
+
+        sqrtH = np.sqrt(self.rhoFreeCtrl.matH)
+        qMat = sqrtH.dot(eigVec).dot(np.diag(eigVal)).dot(eigVec.T).dot(sqrtH)
+        self.assertLess(np.max(np.abs(qMat - self.rhoFreeCtrl.qMat)), 1e-12)
+
+        self.assertIs(self.rhoFreeCtrl.getEigen()[0], eigVal)
+
+    def testSolve(self):
+
+        rhos = [0.1, 0.5, 2.0]
+        qx = self.rhoFreeCtrl.calcQx(np.array([[1, 2, 0], [0, -1, 3]]).T)
+        stateDiff = np.array([[0.5, 0, -1], [1, 1, 1]]).T
+
+        sol = self.rhoFreeCtrl.solve(qx, rhos, stateDiff=stateDiff)
+        self.assertEqual(sol.shape, (3, 3, 2))
+
+        for rho, solOfRho in zip(rhos, sol):
+            matH = self.rhoFreeCtrl.matH
+            ans = np.linalg.solve(rho**2 * matH + self.rhoFreeCtrl.qMat,
+                                  qx + rho**2 * matH.dot(stateDiff))
+            self.assertLess(np.max(np.abs(solOfRho - ans)), 1e-10)
+
+    def testReadOnly(self):
+
+        for mat in (self.rhoFreeCtrl.matH, self.rhoFreeCtrl.qMat,
+                    self.rhoFreeCtrl.aTccMat, self.rhoFreeCtrl.qy2):
+            self.assertFalse(mat.flags.writeable)
+
+
+if __name__ == "__main__":
+
+    # Run the unit test
+    unittest.main()
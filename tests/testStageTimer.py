@@ -0,0 +1,99 @@
+import numpy as np
+import unittest
+
+from lsst.ts.ofc.StageTimer import StageTimer
+
+
+class TestStageTimer(unittest.TestCase):
+    """Test the StageTimer class."""
+
+    def setUp(self):
+
+        self.stageTimer = StageTimer()
+
+    def testMeasureWhenDisabled(self):
+
+        self.assertFalse(self.stageTimer.isEnabled())
+
+        with self.stageTimer.measure("estimate"):
+            pass
+
+        self.assertEqual(self.stageTimer.getStats(), dict())
+        self.assertIs(self.stageTimer.measure("estimate"),
+                      self.stageTimer.measure("control"))
+
+    def testMeasure(self):
+
+        self.stageTimer.enable()
+        for ii in range(3):
+            with self.stageTimer.measure("estimate"):
+                pass
+
+        stats = self.stageTimer.getStats()
+        stat = stats["estimate"]
+        self.assertEqual(stat["count"], 3)
+        self.assertEqual(np.sum(stat["hist"]), 3)
+        self.assertGreaterEqual(stat["maxTimeInSec"], stat["meanTimeInSec"])
+        self.assertEqual(stat["totalAllocBlocks"], 0)
+
+        self.assertEqual(len(stat["hist"]),
+                         len(self.stageTimer.getBinEdgesInSec()) + 1)
+
+    def testMeasureWithException(self):
+
+        self.stageTimer.enable()
+        try:
+            with self.stageTimer.measure("control"):
+                raise ValueError
+        except ValueError:
+            pass
+
+        self.assertEqual(self.stageTimer.getStats()["control"]["count"], 1)
+
+    def testEnableWithCallback(self):
+
+        records = []
+        self.stageTimer.enable(
+            callback=lambda *args: records.append(args), traceAlloc=True)
+
+        with self.stageTimer.measure("rotate"):
+            data = [np.zeros(3) for ii in range(10)]
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0][0], "rotate")
+        self.assertGreater(records[0][2], 0)
+        self.assertEqual(len(data), 10)
+
+    def testRecord(self):
+
+        self.stageTimer.record("aggregate", 1.5e-6)
+        self.stageTimer.record("aggregate", 100.0)
+
+        stat = self.stageTimer.getStats()["aggregate"]
+        self.assertEqual(stat["count"], 2)
+        self.assertEqual(stat["maxTimeInSec"], 100.0)
+        self.assertEqual(stat["hist"][1], 1)
+        self.assertEqual(stat["hist"][-1], 1)
+
+    def testGetStatsIsCopy(self):
+
+        self.stageTimer.record("aggregate", 1e-3)
+
+        stats = self.stageTimer.getStats()
+        stats["aggregate"]["hist"][:] = 0
+
+        stat = self.stageTimer.getStats()["aggregate"]
+        self.assertEqual(np.sum(stat["hist"]), 1)
+
+    def testReset(self):
+
+        self.stageTimer.record("aggregate", 1e-3)
+        self.stageTimer.reset()
+
+        self.assertEqual(self.stageTimer.getStats(), dict())
+
+
+if __name__ == "__main__":
+
+    # Run the unit test
+    unittest.main()
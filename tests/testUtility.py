@@ -1,7 +1,8 @@
 import os
 import unittest
 
-from lsst.ts.ofc.Utility import getDirFiles, getMatchFilePath, getModulePath
+from lsst.ts.ofc.Utility import getDirFiles, getMatchFilePath, getModulePath, \
+    getBinFilePath, calcFileChecksum
 
 
 class TestUtility(unittest.TestCase):
@@ -28,6 +29,21 @@ class TestUtility(unittest.TestCase):
         self.assertRaises(FileNotFoundError, getMatchFilePath, reMatchStr,
                           filePaths)
 
+    def testGetBinFilePath(self):
+
+        filePath = os.path.join(self.configDir, "lsst", "y2.txt")
+        binFilePath = getBinFilePath(filePath)
+        self.assertEqual(binFilePath,
+                         os.path.join(self.configDir, "lsst", "binData",
+                                      "y2.txt.npy"))
+
+    def testCalcFileChecksum(self):
+
+        filePath = os.path.join(self.configDir, "lsst_pert_iter1.txt")
+        checksum = calcFileChecksum(filePath)
+        self.assertEqual(len(checksum), 64)
+        self.assertEqual(calcFileChecksum(filePath), checksum)
+
 
 if __name__ == "__main__":
 
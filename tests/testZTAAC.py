@@ -12,6 +12,7 @@ from lsst.ts.ofc.OptStateEsti import OptStateEsti
 from lsst.ts.ofc.OptCtrl import OptCtrl
 from lsst.ts.ofc.CamRot import CamRot
 from lsst.ts.ofc.ZTAAC import ZTAAC
+from lsst.ts.ofc.IterDataReader import IterDataReader
 
 
 class TestZTAAC(unittest.TestCase):
@@ -42,6 +43,66 @@ class TestZTAAC(unittest.TestCase):
         self.assertEqual(self.ztaac.defaultGain, 0.7)
         self.assertEqual(self.ztaac.fwhmThresholdInArcsec, 0.2)
 
+    def testReloadConfig(self):
+
+        compiledCtrl = self.ztaac.optCtrl.getCompiledCtrl(
+            self.ztaac.dataShare, self.ztaac.getFilter())
+        qWgt = self.ztaac.dataShare.getQwgt()
+
+        self.ztaac.reloadConfig()
+
+        self.assertIsNot(self.ztaac.optCtrl.getCompiledCtrl(
+            self.ztaac.dataShare, self.ztaac.getFilter()), compiledCtrl)
+        self.assertIsNot(self.ztaac.dataShare.getQwgt(), qWgt)
+        self.assertEqual(self.ztaac.dataShare.getQwgt().tolist(),
+                         qWgt.tolist())
+
+    def testStageTimer(self):
+
+        stageTimer = self.ztaac.getStageTimer()
+        self.assertFalse(stageTimer.isEnabled())
+
+        stageTimer.enable()
+
+        self._setStateAndState0FromFile()
+        wfErr, sensorNameList = self._getWfErrAndSensorNameListFromLsstFile()
+        uk = self.ztaac.estiUkWithGain(wfErr, sensorNameList)
+
+        camRot = CamRot()
+        rotUk = self.ztaac.rotUk(camRot, uk)
+        self.ztaac.aggState(rotUk)
+
+        stats = stageTimer.getStats()
+        for stageName in ("estimate", "control", "rotate", "aggregate"):
+            self.assertEqual(stats[stageName]["count"], 1)
+
+        stageTimer.disable()
+        self.ztaac.estiUkWithGain(wfErr, sensorNameList)
+        self.assertEqual(stageTimer.getStats()["estimate"]["count"], 1)
+
+    def testPrecomputePinvA(self):
+
+        self._setStateAndState0FromFile()
+        wfErr, sensorNameList = self._getWfErrAndSensorNameListFromLsstFile()
+        ukAns = self.ztaac.estiUkWithGain(wfErr[1:], sensorNameList[1:])
+
+        self.ztaac.reloadConfig()
+        numOfPinvA = self.ztaac.precomputePinvA(sensorNameList)
+        self.assertEqual(numOfPinvA, 5)
+
+        # The pseudo-inverse is not calculated for the degraded visit
+        self.ztaac.optStateEsti._getPinvA = None
+        uk = self.ztaac.estiUkWithGain(wfErr[1:], sensorNameList[1:])
+        self.assertLess(np.max(np.abs(uk - ukAns)), 1e-10)
+
+        # The pseudo-inverses are precomputed again for the new DOF
+        del self.ztaac.optStateEsti._getPinvA
+        self.ztaac.setZkAndDofInGroups(m2Bend=np.zeros(20, dtype=int))
+
+        self.ztaac.optStateEsti._getPinvA = None
+        uk = self.ztaac.estiUkWithGain(wfErr[1:], sensorNameList[1:])
+        self.assertEqual(len(uk), 30)
+
     def testMapSensorIdToName(self):
 
         sensorIdList = [1, 2, 3, 4]
@@ -211,6 +272,109 @@ class TestZTAAC(unittest.TestCase):
         delta = np.sum(np.abs(uk - ukAns))
         self.assertLess(delta, 0.0012)
 
+    def testEstiUkWithGainBatch(self):
+
+        self._setStateAndState0FromFile()
+
+        wfErr, sensorNameList = self._getWfErrOfIterations(5)
+        filterTypes = [FilterType.REF, FilterType.G, FilterType.REF,
+                       FilterType.Y, FilterType.G]
+        gains = [0.7, 1, 0.7, 0.5, 0.9]
+        rotAngsInDeg = [0, 10, -20, 30, 45]
+
+        ukBatch = self.ztaac.estiUkWithGainBatch(
+            wfErr, sensorNameList, filterTypes=filterTypes, gains=gains,
+            rotAngsInDeg=rotAngsInDeg)
+        self.assertEqual(ukBatch.shape, (5, 50))
+
+        # The state is not changed by the batch
+        state = self.ztaac.optCtrl.getState(np.arange(50))
+        self.assertEqual(np.sum(np.abs(state - self.ztaac.getState0())), 0)
+
+        ukLoop = self._estiUkByLoop(wfErr, sensorNameList, filterTypes,
+                                    gains, rotAngsInDeg)
+        self.assertLess(np.max(np.abs(ukBatch - ukLoop)), 1e-8)
+
+    def testEstiUkWithGainBatchOfRuns(self):
+
+        self._setStateAndState0FromFile()
+
+        wfErr, sensorNameList = self._getWfErrOfIterations(3)
+        wfErrOfRuns = np.array([wfErr, wfErr[::-1]])
+
+        ukOfRuns = self.ztaac.estiUkWithGainBatch(
+            wfErrOfRuns, sensorNameList, rotAngsInDeg=[0, 15, 30])
+        self.assertEqual(ukOfRuns.shape, (2, 3, 50))
+
+        for ukOfRun, wfErrOfRun in zip(ukOfRuns, wfErrOfRuns):
+            uk = self.ztaac.estiUkWithGainBatch(
+                wfErrOfRun, sensorNameList, rotAngsInDeg=[0, 15, 30])
+            self.assertLess(np.max(np.abs(ukOfRun - uk)), 1e-10)
+
+    def testEstiUkWithGainBatchOfRefX0(self):
+
+        self.ztaac.dataShare.xRef = "x0"
+        self._setStateAndState0FromFile()
+
+        wfErr, sensorNameList = self._getWfErrOfIterations(3)
+        gains = [0.7, 0.8, 0.9]
+        ukBatch = self.ztaac.estiUkWithGainBatch(wfErr, sensorNameList,
+                                                 gains=gains)
+
+        for uk, wfErrOfVisit, gain in zip(ukBatch, wfErr, gains):
+            self.ztaac.setGain(gain)
+            ukAns = self.ztaac.estiUkWithGain(wfErrOfVisit, sensorNameList)
+            self.assertLess(np.max(np.abs(uk - ukAns)), 1e-10)
+
+    def testEstiUkWithGainBatchWithWrongLength(self):
+
+        wfErr, sensorNameList = self._getWfErrOfIterations(3)
+
+        for xRef in ("x0", "x00"):
+            self.ztaac.dataShare.xRef = xRef
+            self.assertRaises(ValueError, self.ztaac.estiUkWithGainBatch,
+                              wfErr, sensorNameList,
+                              filterTypes=[FilterType.REF])
+            self.assertRaises(ValueError, self.ztaac.estiUkWithGainBatch,
+                              wfErr, sensorNameList, gains=[0.7])
+            self.assertRaises(ValueError, self.ztaac.estiUkWithGainBatch,
+                              wfErr, sensorNameList,
+                              rotAngsInDeg=[0, 10, 20, 30])
+
+    def _getWfErrOfIterations(self, numOfIter):
+
+        iterDataDir = os.path.join(getModulePath(), "tests", "testData",
+                                   "iteration")
+        iterDataReader = IterDataReader(iterDataDir)
+
+        sensorIdList = iterDataReader.getWfsSensorIdList()
+        sensorNameList = self.ztaac.mapSensorIdToName(sensorIdList)[0]
+
+        wfErr = np.array([iterDataReader.getWfsErr(iterNum)
+                          for iterNum in range(numOfIter)])
+
+        return wfErr, sensorNameList
+
+    def _estiUkByLoop(self, wfErr, sensorNameList, filterTypes, gains,
+                      rotAngsInDeg):
+
+        camRot = CamRot()
+
+        ukLoop = []
+        for wfErrOfVisit, filterType, gain, rotAngInDeg in zip(
+                wfErr, filterTypes, gains, rotAngsInDeg):
+            self.ztaac.setFilter(filterType)
+            self.ztaac.setGain(gain)
+            camRot.setRotAng(rotAngInDeg)
+
+            uk = self.ztaac.estiUkWithGain(wfErrOfVisit, sensorNameList)
+            rotUk = self.ztaac.rotUk(camRot, uk)
+            self.ztaac.aggState(rotUk)
+
+            ukLoop.append(rotUk)
+
+        return np.array(ukLoop)
+
     def _setStateAndState0FromFile(self):
 
         self.ztaac.setState0FromFile(state0InDofFileName="state0inDof.txt")